@@ -0,0 +1,212 @@
+"""
+Adaptive Cache TTLs
+Derives refresh intervals from how fast pool data actually changes between
+fetches, so quiet pools and groups are refetched less often than busy ones
+"""
+
+import logging
+import math
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+
+from snapshot_delta import DELTA_FIELDS
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveTTL:
+    """
+    Change rate -> TTL policy
+
+    A change rate is the largest relative move of any DELTA_FIELDS value per
+    second, smoothed across fetches (EWMA). The TTL is how long it takes that
+    rate to accumulate `tolerance` relative change, clamped to
+    [min_seconds, max_seconds]; a rate of 0 (nothing moved) gets max_seconds.
+    """
+
+    def __init__(self, min_seconds: float, max_seconds: float, tolerance: float, smoothing: float = 0.5):
+        self.min_seconds = min_seconds
+        self.max_seconds = max(max_seconds, min_seconds)
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+
+    def update_rate(self, previous_rate, change, elapsed_seconds: float):
+        """
+        Fold one observed relative change into the smoothed rate
+
+        Works on floats and arrays; a NaN (or None) previous rate means no
+        history yet, so the observed rate is taken as-is.
+        """
+        rate = np.asarray(change, dtype=np.float64) / max(elapsed_seconds, 1e-9)
+        if previous_rate is None:
+            return rate if rate.ndim else float(rate)
+        previous_rate = np.asarray(previous_rate, dtype=np.float64)
+        smoothed = np.where(
+            np.isnan(previous_rate),
+            rate,
+            self.smoothing * rate + (1 - self.smoothing) * previous_rate
+        )
+        return smoothed if smoothed.ndim else float(smoothed)
+
+    def ttl(self, rate):
+        """TTL in seconds for a change rate (float or array)"""
+        rate = np.asarray(rate, dtype=np.float64)
+        ttl = np.full(rate.shape, float(self.max_seconds))
+        np.divide(self.tolerance, rate, out=ttl, where=rate > 0)
+        ttl = np.clip(ttl, self.min_seconds, self.max_seconds)
+        return ttl if ttl.ndim else float(ttl)
+
+
+def relative_change(old: np.ndarray, new: np.ndarray) -> np.ndarray:
+    """|new - old| relative to the larger magnitude (0 where both are 0)"""
+    scale = np.maximum(np.abs(old), np.abs(new))
+    change = np.zeros(len(new), dtype=np.float64)
+    np.divide(np.abs(new - old), scale, out=change, where=scale > 0)
+    return change
+
+
+def records_change(old_records: List, new_records: List) -> Optional[float]:
+    """
+    Largest relative DELTA_FIELDS change of any pool present in both record
+    lists (matched by address); None if they share no pool
+    """
+    old_by_address = {record.address: record for record in old_records}
+    pairs = [
+        (old_by_address[record.address], record)
+        for record in new_records
+        if record.address in old_by_address
+    ]
+    if not pairs:
+        return None
+
+    largest = 0.0
+    for name in DELTA_FIELDS:
+        old = np.fromiter((getattr(o, name) for o, _ in pairs), dtype=np.float64, count=len(pairs))
+        new = np.fromiter((getattr(n, name) for _, n in pairs), dtype=np.float64, count=len(pairs))
+        largest = max(largest, float(relative_change(old, new).max()))
+    return largest
+
+
+def ttl_distribution(ttls, min_seconds: float, max_seconds: float, buckets: int = 5) -> dict:
+    """
+    Summary of a set of TTLs for stats endpoints
+
+    Returns:
+        dict: count, min/p10/p50/p90/max and counts per geometric bucket
+            between min_seconds and max_seconds ('lo-hi' seconds labels)
+    """
+    ttls = np.asarray(ttls, dtype=np.float64)
+    if not len(ttls):
+        return {'count': 0}
+
+    edges = np.unique(np.round(np.geomspace(min_seconds, max(max_seconds, min_seconds + 1), buckets + 1)))
+    counts, _ = np.histogram(np.clip(ttls, edges[0], edges[-1]), bins=edges)
+    p10, p50, p90 = np.percentile(ttls, [10, 50, 90])
+    return {
+        'count': int(len(ttls)),
+        'min': round(float(ttls.min()), 1),
+        'p10': round(float(p10), 1),
+        'p50': round(float(p50), 1),
+        'p90': round(float(p90), 1),
+        'max': round(float(ttls.max()), 1),
+        'buckets': {
+            f'{int(lo)}-{int(hi)}': int(count)
+            for lo, hi, count in zip(edges[:-1], edges[1:], counts)
+        }
+    }
+
+
+class PoolChangeTracker:
+    """
+    Per-pool change rates across consecutive snapshots
+
+    observe() is called with every accepted (or 304-renewed) snapshot. Rates
+    are row-aligned with the last observed snapshot; pools seen for the first
+    time have no rate (NaN) until their next observation.
+
+    Only `fields` count as change (default DELTA_FIELDS); callers pass the
+    columns whose movement users actually see.
+
+    snapshot_ttl() turns the per-pool TTLs into one TTL for the whole
+    /pair/all snapshot: the `percentile`-th lowest TTL among pools with at
+    least `min_liquidity`, i.e. the interval after which that share of the
+    pools that matter has moved by more than the tolerance.
+    """
+
+    def __init__(self, policy: AdaptiveTTL, percentile: float, min_liquidity: float,
+                 fields: tuple = DELTA_FIELDS):
+        self.policy = policy
+        self.percentile = percentile
+        self.min_liquidity = min_liquidity
+        self.fields = fields
+        self._snapshot = None
+        self._observed_at = None
+        self._rates = None
+
+    def observe(self, snapshot, observed_at: datetime):
+        """Record the change from the previously observed snapshot"""
+        previous = self._snapshot
+        if previous is None or self._observed_at is None:
+            self._snapshot = snapshot
+            self._observed_at = observed_at
+            self._rates = np.full(snapshot.size, np.nan)
+            return
+
+        elapsed = (observed_at - self._observed_at).total_seconds()
+        if elapsed <= 0:
+            return
+
+        if snapshot is previous:
+            # Renewed without changes (304)
+            self._rates = self.policy.update_rate(self._rates, np.zeros(snapshot.size), elapsed)
+        else:
+            previous_rows = previous.row_index
+            matches = np.fromiter(
+                (previous_rows.get(address, -1) for address in snapshot.strings['address']),
+                dtype=np.int64,
+                count=snapshot.size
+            )
+            common = matches >= 0
+            current_idx = np.flatnonzero(common)
+            previous_idx = matches[common]
+
+            change = np.zeros(len(current_idx), dtype=np.float64)
+            for name in self.fields:
+                change = np.maximum(change, relative_change(
+                    previous.columns[name][previous_idx],
+                    snapshot.columns[name][current_idx]
+                ))
+
+            rates = np.full(snapshot.size, np.nan)
+            rates[current_idx] = self.policy.update_rate(self._rates[previous_idx], change, elapsed)
+            self._rates = rates
+
+        self._snapshot = snapshot
+        self._observed_at = observed_at
+
+    def pool_ttls(self) -> np.ndarray:
+        """TTL per pool of the last observed snapshot that has a rate (liquidity-filtered)"""
+        if self._rates is None:
+            return np.empty(0)
+        known = ~np.isnan(self._rates) & (self._snapshot.columns['liquidity'] >= self.min_liquidity)
+        return self.policy.ttl(self._rates[known])
+
+    def snapshot_ttl(self) -> Optional[int]:
+        """Whole-snapshot TTL in seconds (None until a rate is known)"""
+        ttls = self.pool_ttls()
+        if not len(ttls):
+            return None
+        return int(math.floor(np.percentile(ttls, self.percentile)))
+
+    def get_stats(self) -> dict:
+        """TTL distribution of the tracked pools"""
+        return {
+            'min_ttl_seconds': self.policy.min_seconds,
+            'max_ttl_seconds': self.policy.max_seconds,
+            'tolerance': self.policy.tolerance,
+            'percentile': self.percentile,
+            'fields': list(self.fields),
+            'pool_ttls': ttl_distribution(self.pool_ttls(), self.policy.min_seconds, self.policy.max_seconds)
+        }
@@ -1,15 +1,26 @@
-from flask import Flask, jsonify, request
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
 import requests
+import base64
+import hashlib
+import json
 import logging
 import os
-import gc
 import random
 import string
+import struct
 import threading
+import time
+import numpy as np
 from datetime import datetime, timedelta
-from pool_cache import get_cached_pools, pool_cache
+from pool_cache import get_cached_pools, get_cached_snapshot, pool_cache
 from grouped_pool_cache import get_grouped_cached_pools, grouped_pool_cache
+from pool_metrics import QUOTE_SOL, QUOTE_TOKENS
+from pool_record import WINDOWS, safe_float
+from pool_snapshot import SORT_KEYS, PoolSnapshot
+from position_history import fetch_position_histories
+from response_cache import ResponseCache
+from snapshot_broadcast import SnapshotBroadcaster
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -69,156 +80,165 @@ def get_pools_from_cache(force_refresh=False, limit=None):
         limit: Max number of groups to load (only for GroupedPoolCache)
 
     Returns:
-        List of pool data
+        List of PoolRecord
     """
     if USE_GROUPED_CACHE:
         return get_grouped_cached_pools(force_refresh=force_refresh, limit=limit)
     else:
         return get_cached_pools(force_refresh=force_refresh)
+
+def get_snapshot_from_cache(force_refresh=False, limit=None):
+    """
+    Wrapper function to get a columnar PoolSnapshot from the configured cache
+
+    PoolDataCache builds the snapshot once per refresh. GroupedPoolCache
+    aggregates per-group lists on every call, so the snapshot is built here.
+
+    Args:
+        force_refresh: Force refresh of cache
+        limit: Max number of groups to load (only for GroupedPoolCache)
+
+    Returns:
+        PoolSnapshot
+    """
+    if USE_GROUPED_CACHE:
+        return PoolSnapshot.from_pools(get_grouped_cached_pools(force_refresh=force_refresh, limit=limit))
+    else:
+        return get_cached_snapshot(force_refresh=force_refresh)
+
+
+# Encoded /api/pairs bodies keyed by query + snapshot generation, flushed on
+# every new snapshot (PoolDataCache only - grouped snapshots are rebuilt per call)
+pairs_response_cache = ResponseCache(max_bytes=int(os.getenv('PAIRS_RESPONSE_CACHE_MB', 16)) * 1024 * 1024)
+pool_cache.add_snapshot_listener(pairs_response_cache.flush)
+
+# /api/pairs/stream subscribers are woken on every new snapshot generation.
+# Each open stream holds one gunicorn thread, hence the cap and the lifetime
+# (EventSource reconnects by itself and resumes from Last-Event-ID). The cap
+# leaves PAIRS_STREAM_RESERVED_THREADS of the worker's threads to regular
+# requests; GUNICORN_THREADS must match --threads in railway.json/Procfile
+GUNICORN_THREADS = int(os.getenv('GUNICORN_THREADS', 12))
+PAIRS_STREAM_RESERVED_THREADS = int(os.getenv('PAIRS_STREAM_RESERVED_THREADS', 4))
+PAIRS_STREAM_MAX_CLIENTS = int(os.getenv(
+    'PAIRS_STREAM_MAX_CLIENTS', max(GUNICORN_THREADS - PAIRS_STREAM_RESERVED_THREADS, 0)
+))
+pairs_broadcaster = SnapshotBroadcaster(max_subscribers=PAIRS_STREAM_MAX_CLIENTS)
+pool_cache.add_snapshot_listener(pairs_broadcaster.publish)
+PAIRS_STREAM_KEEPALIVE_SECONDS = 15
+PAIRS_STREAM_MAX_SECONDS = int(os.getenv('PAIRS_STREAM_MAX_SECONDS', 300))
+
+# Upper bound on addresses per POST /api/pools/batch request
+MAX_BATCH_POOLS = int(os.getenv('MAX_BATCH_POOLS', 300))
+
 CORS(app, resources={r"/*": {"origins": ["https://www.imded.fun", "https://imded.fun", "http://localhost:3000", "http://localhost:5000"]}})
 
-def process_pairs_data(data, page=1, limit=50, search_term=None, min_liquidity=0, min_volume_24h=0, sort_by='fees_24h'):
-    try:
-        # Clear memory
-        gc.collect()
-
-        logger.info(f"Processing {len(data)} pairs with filters: page={page}, limit={limit}, search={search_term}, min_liquidity={min_liquidity}, min_volume_24h={min_volume_24h}")
-
-        # Apply search filter first (most efficient)
-        filtered_data = data
-        if search_term:
-            search_term = search_term.upper()
-            filtered_data = [
-                pair for pair in filtered_data
-                if search_term in str(pair.get('name', '')).upper()
-            ]
-            logger.info(f"After search filter: {len(filtered_data)} pairs")
-
-        # Apply liquidity filter
-        if min_liquidity > 0:
-            def safe_float(value, default=0.0):
-                """Safely convert value to float, handling empty strings and None"""
-                if value is None or value == '':
-                    return default
-                try:
-                    return float(value)
-                except (ValueError, TypeError):
-                    return default
+def format_pair_row(snapshot, i):
+    """Build one /api/pairs row from a snapshot row (values come pre-parsed)"""
+    cols = snapshot.columns
+    return {
+        'address': snapshot.strings['address'][i],
+        'pairName': snapshot.strings['name'][i],
+        'price': float(cols['current_price'][i]),
+        'fees24h': float(cols['fees_24h'][i]),
+        'fees30min': float(cols['fees_min_30'][i]),
+        'volume30min': float(cols['volume_min_30'][i]),
+        'volume24h': float(cols['volume_hour_24'][i]),
+        'apr': float(cols['apr'][i]),
+        'totalLiquidity': float(cols['liquidity'][i]),
+        'binStep': int(cols['bin_step'][i]),
+        'baseFee': float(cols['base_fee_percentage'][i]),
+        'is_blacklisted': bool(snapshot.flags['is_blacklisted'][i]),
+        'mint_x': snapshot.strings['mint_x'][i],
+        'mint_y': snapshot.strings['mint_y'][i]
+    }
+
+def snapshot_etag(generation, *query):
+    """
+    ETag for a response built from one snapshot generation for one query
 
-            filtered_data = [
-                pair for pair in filtered_data
-                if safe_float(pair.get('liquidity', 0)) >= min_liquidity
-            ]
-            logger.info(f"After liquidity filter: {len(filtered_data)} pairs")
-
-        # Apply 24h volume filter
-        if min_volume_24h > 0:
-            def safe_float(value, default=0.0):
-                """Safely convert value to float, handling empty strings and None"""
-                if value is None or value == '':
-                    return default
-                try:
-                    return float(value)
-                except (ValueError, TypeError):
-                    return default
+    The body is a pure function of both, so the tag can be checked before
+    any of it is built.
+    """
+    digest = hashlib.sha1(repr(query).encode()).hexdigest()[:16]
+    return f'g{generation}-{digest}'
+
+def add_cache_validators(response, etag):
+    """Set the ETag and a Cache-Control max-age of the snapshot's remaining soft TTL"""
+    response.set_etag(etag)
+    response.cache_control.max_age = pool_cache.seconds_until_stale()
+    return response
+
+def not_modified_response(etag):
+    """304 response if the client's If-None-Match already has `etag` (None otherwise)"""
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    return add_cache_validators(app.response_class(status=304), etag)
+
+def encode_pairs_cursor(generation, sort_by, position, search_term, min_liquidity, min_volume_24h):
+    """
+    Opaque /api/pairs cursor: snapshot generation, sort key, sort position of
+    the last row returned and the query filters
+    """
+    payload = json.dumps(
+        [generation, sort_by, int(position), search_term, min_liquidity, min_volume_24h],
+        separators=(',', ':')
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def decode_pairs_cursor(cursor):
+    """
+    Decode a cursor from encode_pairs_cursor()
+
+    Returns:
+        tuple: (generation, sort_by, position, search_term, min_liquidity, min_volume_24h)
+
+    Raises:
+        ValueError: Malformed cursor
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        generation, sort_by, position, search_term, min_liquidity, min_volume_24h = payload
+        if sort_by not in SORT_KEYS or not isinstance(search_term, str):
+            raise ValueError
+        return int(generation), sort_by, int(position), search_term, float(min_liquidity), float(min_volume_24h)
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+
+def next_pairs_cursor(snapshot, rows, sort_by, search_term, min_liquidity, min_volume_24h):
+    """Cursor continuing after the last of `rows`"""
+    position = snapshot.sort_rank(sort_by)[rows[-1]]
+    return encode_pairs_cursor(snapshot.generation, sort_by, position, search_term, min_liquidity, min_volume_24h)
+
+def process_pairs_data(snapshot, page=1, limit=50, search_term=None, min_liquidity=0, min_volume_24h=0, sort_by='fees_24h'):
+    try:
+        logger.info(f"Processing {len(snapshot)} pairs with filters: page={page}, limit={limit}, search={search_term}, min_liquidity={min_liquidity}, min_volume_24h={min_volume_24h}")
+
+        # Walk the snapshot's precomputed sort order (fee_rate_30min only
+        # counts pools with TVL >= $1000) and apply search, liquidity and
+        # 24h volume filters lazily until the page is full
+        page_idx, total_pairs = snapshot.page_indices(
+            sort_by,
+            page,
+            limit,
+            search_term=search_term,
+            min_liquidity=min_liquidity,
+            min_volume_24h=min_volume_24h
+        )
 
-            filtered_data = [
-                pair for pair in filtered_data
-                if safe_float(pair.get('volume', {}).get('hour_24', 0)) >= min_volume_24h
-            ]
-            logger.info(f"After 24h volume filter: {len(filtered_data)} pairs")
-        
-        # Sort data
-        def safe_float(value, default=0.0):
-            """Safely convert value to float, handling empty strings and None"""
-            if value is None or value == '':
-                return default
-            try:
-                return float(value)
-            except (ValueError, TypeError):
-                return default
-        
-        # Calculate fee rate for sorting (30min fees / TVL)
-        # Use minimum TVL threshold to avoid unrealistic fee rates from low liquidity pools
-        def calculate_fee_rate(pair):
-            fees_obj = pair.get('fees', {})
-            fees_30min = safe_float(fees_obj.get('min_30', 0))
-            tvl = safe_float(pair.get('liquidity', 0))
-            # Only calculate fee rate for pools with TVL >= $1000
-            # This avoids showing unrealistic percentages from tiny liquidity pools
-            return (fees_30min / tvl * 100) if tvl >= 1000 else 0
-
-        sort_key = {
-            'fee_rate_30min': calculate_fee_rate,
-            'fees_24h': lambda x: safe_float(x.get('fees_24h', 0)),
-            'liquidity': lambda x: safe_float(x.get('liquidity', 0)),
-            'name': lambda x: str(x.get('name', ''))
-        }.get(sort_by, calculate_fee_rate)  # Default to fee_rate_30min
-        
-        sorted_data = sorted(filtered_data, key=sort_key, reverse=True)
-        
         # Calculate pagination
-        total_pairs = len(sorted_data)
         start_idx = (page - 1) * limit
         end_idx = start_idx + limit
-        
-        # Get the page slice
-        page_data = sorted_data[start_idx:end_idx]
-        logger.info(f"Page {page}: showing {len(page_data)} pairs (total: {total_pairs})")
-        
-        # Process only the page data
-        def safe_float(value, default=0.0):
-            """Safely convert value to float, handling empty strings and None"""
-            if value is None or value == '':
-                return default
-            try:
-                return float(value)
-            except (ValueError, TypeError):
-                return default
-
-        def safe_int(value, default=0):
-            """Safely convert value to int, handling empty strings and None"""
-            if value is None or value == '':
-                return default
-            try:
-                return int(float(value))  # Convert to float first to handle "1.0" strings
-            except (ValueError, TypeError):
-                return default
+        logger.info(f"Page {page}: showing {len(page_idx)} pairs (total: {total_pairs})")
 
+        # Process only the page data (values come pre-parsed from the snapshot)
         processed_pairs = []
-        for pair in page_data:
+        for i in page_idx:
             try:
-                # Extract volume and fees
-                volume_obj = pair.get('volume', {})
-                fees_obj = pair.get('fees', {})
-                volume_30min = safe_float(volume_obj.get('min_30', 0))
-                volume_24h = safe_float(volume_obj.get('hour_24', 0))
-                fees_30min = safe_float(fees_obj.get('min_30', 0))
-
-                processed_pair = {
-                    'address': pair.get('address', ''),
-                    'pairName': pair.get('name', ''),
-                    'price': safe_float(pair.get('current_price', 0)),
-                    'fees24h': safe_float(pair.get('fees_24h', 0)),
-                    'fees30min': fees_30min,
-                    'volume30min': volume_30min,
-                    'volume24h': volume_24h,
-                    'apr': safe_float(pair.get('apr', 0)),
-                    'totalLiquidity': safe_float(pair.get('liquidity', 0)),
-                    'binStep': safe_int(pair.get('bin_step', 0)),
-                    'baseFee': safe_float(pair.get('base_fee_percentage', 0)),
-                    'is_blacklisted': bool(pair.get('is_blacklisted', False)),
-                    'mint_x': pair.get('mint_x', ''),
-                    'mint_y': pair.get('mint_y', '')
-                }
-                processed_pairs.append(processed_pair)
+                processed_pairs.append(format_pair_row(snapshot, i))
             except Exception as e:
                 logger.error(f"Error processing pair: {e}")
                 continue
-        
-        # Clear memory
-        gc.collect()
-        
+
         return {
             'data': processed_pairs,
             'pagination': {
@@ -252,6 +272,10 @@ def get_pairs():
 
         sort_by = request.args.get('sort_by', 'fees_24h')
 
+        cursor = request.args.get('cursor', '').strip()
+        if cursor:
+            return get_pairs_after_cursor(cursor, limit)
+
         # Check if user wants to force refresh (bypass cache)
         force_refresh = request.args.get('force_refresh', 'false').lower() == 'true'
 
@@ -262,21 +286,58 @@ def get_pairs():
             logger.info("Force refresh requested - bypassing cache...")
         else:
             logger.info("Fetching pool data from cache...")
-        data = get_pools_from_cache(force_refresh=force_refresh, limit=50)
-        logger.info(f"Received {len(data)} pairs {'(fresh from API)' if force_refresh else '(from cache)'}")
-        
+        snapshot = get_snapshot_from_cache(force_refresh=force_refresh, limit=50)
+        logger.info(f"Received {len(snapshot)} pairs {'(fresh from API)' if force_refresh else '(from cache)'}")
+
+        # Repeat query on the same snapshot - answer 304 if the client has
+        # it already, else serve the encoded body as-is
+        cache_key = None
+        etag = None
+        if sort_by not in SORT_KEYS:
+            sort_by = SORT_KEYS[0]  # unknown keys use the default order
+        if not USE_GROUPED_CACHE:
+            cache_key = (
+                snapshot.generation,
+                page,
+                limit,
+                search_term.upper(),  # search is case-insensitive
+                min_liquidity,
+                min_volume_24h,
+                sort_by
+            )
+            etag = snapshot_etag(snapshot.generation, 'pairs', *cache_key[1:])
+            not_modified = not_modified_response(etag)
+            if not_modified is not None:
+                logger.info(f"Not modified: page {page} (generation {snapshot.generation})")
+                return not_modified
+
+            body = pairs_response_cache.get(cache_key)
+            if body is not None:
+                logger.info(f"Response cache HIT for page {page} (generation {snapshot.generation})")
+                return add_cache_validators(app.response_class(body, mimetype='application/json'), etag)
+
         # Process data with pagination and filtering
-        result = process_pairs_data(data, page, limit, search_term, min_liquidity, min_volume_24h, sort_by)
+        result = process_pairs_data(snapshot, page, limit, search_term, min_liquidity, min_volume_24h, sort_by)
         logger.info(f"Successfully processed page {page} with {len(result['data'])} pairs")
-        
-        # Clear memory
-        del data
-        gc.collect()
-        
-        return jsonify({
+
+        # Cursor for the following page, pinned to this snapshot generation
+        # (grouped snapshots are rebuilt per call, so there is nothing to pin)
+        if not USE_GROUPED_CACHE:
+            next_cursor = None
+            if result['pagination']['has_next'] and result['data']:
+                last_row = snapshot.find(result['data'][-1]['address'])
+                next_cursor = next_pairs_cursor(snapshot, [last_row], sort_by, search_term, min_liquidity, min_volume_24h)
+            result['pagination']['next_cursor'] = next_cursor
+
+        response = jsonify({
             'status': 'success',
+            'generation': snapshot.generation,
             **result
         })
+        if cache_key is not None:
+            pairs_response_cache.put(cache_key, response.get_data())
+            add_cache_validators(response, etag)
+        return response
     except Exception as e:
         logger.error(f"Error: {str(e)}")
         return jsonify({
@@ -284,6 +345,263 @@ def get_pairs():
             'message': str(e)
         }), 500
 
+def get_pairs_after_cursor(cursor, limit):
+    """
+    Keyset page of /api/pairs (the `cursor` query parameter)
+
+    The cursor pins the snapshot generation, sort key and filters of the
+    first page, so later pages come from the same snapshot even if the cache
+    refreshed in between - no duplicates or skipped pools - and each page
+    starts at the previous page's last sort position instead of re-walking
+    the order from the top.
+    """
+    if USE_GROUPED_CACHE:
+        return jsonify({
+            'status': 'error',
+            'message': 'Cursor pagination is only available with PoolDataCache (USE_GROUPED_CACHE=false)'
+        }), 400
+
+    try:
+        generation, sort_by, position, search_term, min_liquidity, min_volume_24h = decode_pairs_cursor(cursor)
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+
+    # Keep the current snapshot loaded/refreshed as for any other read
+    get_snapshot_from_cache()
+    snapshot = pool_cache.get_snapshot_at(generation)
+    if snapshot is None:
+        logger.info(f"Cursor for generation {generation} expired (current {pool_cache.generation})")
+        return jsonify({
+            'status': 'error',
+            'message': 'Cursor expired - reload the first page',
+            'generation': pool_cache.generation
+        }), 410
+
+    etag = snapshot_etag(generation, 'cursor', cursor, limit)
+    not_modified = not_modified_response(etag)
+    if not_modified is not None:
+        return not_modified
+
+    cache_key = (generation, 'cursor', cursor, limit)
+    body = pairs_response_cache.get(cache_key)
+    if body is not None:
+        logger.info(f"Response cache HIT for cursor page (generation {generation})")
+        return add_cache_validators(app.response_class(body, mimetype='application/json'), etag)
+
+    # One extra row tells whether another page follows
+    rows = snapshot.page_after(
+        sort_by,
+        position,
+        limit + 1,
+        search_term=search_term,
+        min_liquidity=min_liquidity,
+        min_volume_24h=min_volume_24h
+    )
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+
+    response = jsonify({
+        'status': 'success',
+        'generation': generation,
+        'data': [format_pair_row(snapshot, i) for i in rows],
+        'pagination': {
+            'limit': limit,
+            'total': snapshot.count(search_term, min_liquidity, min_volume_24h),
+            'has_next': has_next,
+            'next_cursor': next_pairs_cursor(
+                snapshot, rows, sort_by, search_term, min_liquidity, min_volume_24h
+            ) if has_next else None
+        }
+    })
+    pairs_response_cache.put(cache_key, response.get_data())
+    return add_cache_validators(response, etag)
+
+def read_pair_filters():
+    """search, min_liquidity and min_volume_24h query parameters (as in /api/pairs)"""
+    search_term = request.args.get('search', '').strip()
+    min_liquidity_param = request.args.get('min_liquidity', '').strip()
+    min_liquidity = float(min_liquidity_param) if min_liquidity_param else 0.0
+    min_volume_24h_param = request.args.get('min_volume_24h', '').strip()
+    min_volume_24h = float(min_volume_24h_param) if min_volume_24h_param else 0.0
+    return search_term, min_liquidity, min_volume_24h
+
+def pair_changes_payload(snapshot, since, upserted, removed, search_term, min_liquidity, min_volume_24h):
+    """
+    Change-feed body for one client filter (shared by /api/pairs/changes and
+    /api/pairs/stream)
+
+    Only the upserted rows are filtered; those that no longer match the
+    filter are reported as removed.
+
+    Args:
+        upserted, removed: Address sets from pool_cache.get_changes(since)
+            (None = history too short, the client must resync)
+    """
+    if upserted is None:
+        return {
+            'generation': snapshot.generation,
+            'since': since,
+            'resync': True
+        }
+
+    changed_pairs = []
+    removed = set(removed)
+    if upserted:
+        rows = np.fromiter((snapshot.row_index[address] for address in upserted), dtype=np.int64, count=len(upserted))
+        matching = set(snapshot.filter_rows(
+            rows,
+            search_term=search_term,
+            min_liquidity=min_liquidity,
+            min_volume_24h=min_volume_24h
+        ).tolist())
+        for address, i in zip(upserted, rows.tolist()):
+            if i in matching:
+                changed_pairs.append(format_pair_row(snapshot, i))
+            else:
+                removed.add(address)
+
+    return {
+        'generation': snapshot.generation,
+        'since': since,
+        'resync': False,
+        'changed': changed_pairs,
+        'removed': sorted(removed)
+    }
+
+@app.route('/api/pairs/changes', methods=['GET'])
+def get_pair_changes():
+    """
+    Pairs added/changed or removed since a snapshot generation
+
+    Query params:
+        since: Generation from a previous /api/pairs or /api/pairs/changes response
+        search, min_liquidity, min_volume_24h: Same filters as /api/pairs -
+            changed pools that no longer match are reported as removed
+
+    If the server no longer has the deltas back to `since` (or restarted),
+    the response has resync=true and the client should reload /api/pairs.
+    """
+    try:
+        if USE_GROUPED_CACHE:
+            return jsonify({
+                'status': 'error',
+                'message': 'Change feed is only available with PoolDataCache (USE_GROUPED_CACHE=false)'
+            }), 400
+
+        since_param = request.args.get('since', '').strip()
+        if not since_param.isdigit():
+            return jsonify({
+                'status': 'error',
+                'message': 'since must be a snapshot generation (non-negative integer)'
+            }), 400
+        since = int(since_param)
+
+        search_term, min_liquidity, min_volume_24h = read_pair_filters()
+
+        snapshot, upserted, removed = pool_cache.get_changes(since)
+
+        etag = snapshot_etag(snapshot.generation, 'changes', since, search_term, min_liquidity, min_volume_24h)
+        not_modified = not_modified_response(etag)
+        if not_modified is not None:
+            return not_modified
+
+        changes = pair_changes_payload(snapshot, since, upserted, removed, search_term, min_liquidity, min_volume_24h)
+        if changes['resync']:
+            logger.info(f"Changes since generation {since} unavailable (current {snapshot.generation}) - client must resync")
+        else:
+            logger.info(f"Changes {since} → {snapshot.generation}: {len(changes['changed'])} changed, {len(changes['removed'])} removed")
+
+        return add_cache_validators(jsonify({
+            'status': 'success',
+            **changes
+        }), etag)
+    except Exception as e:
+        logger.error(f"Error fetching pair changes: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/pairs/stream', methods=['GET'])
+def stream_pair_changes():
+    """
+    Server-Sent Events stream of pair changes
+
+    Query params:
+        since: Generation to start from (default: the current one, with no
+            initial message); the Last-Event-ID header takes precedence, so
+            an EventSource reconnect resumes where it left off
+        search, min_liquidity, min_volume_24h: Same filters as /api/pairs
+
+    Sends one `changes` event per new snapshot generation with the same body
+    as /api/pairs/changes (event id = generation), and a comment line as
+    keep-alive. The stream ends after PAIRS_STREAM_MAX_SECONDS; returns 503
+    when PAIRS_STREAM_MAX_CLIENTS streams are already open.
+    """
+    if USE_GROUPED_CACHE:
+        return jsonify({
+            'status': 'error',
+            'message': 'Change stream is only available with PoolDataCache (USE_GROUPED_CACHE=false)'
+        }), 400
+
+    since_param = (request.headers.get('Last-Event-ID') or request.args.get('since', '')).strip()
+    if since_param and not since_param.isdigit():
+        return jsonify({
+            'status': 'error',
+            'message': 'since must be a snapshot generation (non-negative integer)'
+        }), 400
+
+    try:
+        search_term, min_liquidity, min_volume_24h = read_pair_filters()
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+
+    generation = int(since_param) if since_param else get_snapshot_from_cache().generation
+
+    if not pairs_broadcaster.subscribe():
+        response = jsonify({
+            'status': 'error',
+            'message': 'Too many open streams - poll /api/pairs/changes instead'
+        })
+        response.status_code = 503
+        response.headers['Retry-After'] = str(PAIRS_STREAM_MAX_SECONDS)
+        return response
+
+    logger.info(f"Pair stream opened at generation {generation} (search='{search_term}', min_liquidity={min_liquidity}, min_volume_24h={min_volume_24h})")
+
+    def generate():
+        last_sent = generation
+        deadline = time.monotonic() + PAIRS_STREAM_MAX_SECONDS
+        try:
+            while time.monotonic() < deadline:
+                if pool_cache.generation != last_sent:
+                    snapshot, upserted, removed = pool_cache.get_changes(last_sent)
+                    changes = pair_changes_payload(
+                        snapshot, last_sent, upserted, removed, search_term, min_liquidity, min_volume_24h
+                    )
+                    last_sent = snapshot.generation
+                    pairs_broadcaster.message_sent()
+                    yield f"id: {last_sent}\nevent: changes\ndata: {json.dumps(changes, separators=(',', ':'))}\n\n"
+                    continue
+
+                timeout = min(PAIRS_STREAM_KEEPALIVE_SECONDS, max(deadline - time.monotonic(), 0))
+                if not pairs_broadcaster.wait(last_sent, timeout=timeout):
+                    yield ': keep-alive\n\n'
+        finally:
+            pairs_broadcaster.unsubscribe()
+            logger.info(f"Pair stream closed at generation {last_sent}")
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # Don't let a reverse proxy buffer events
+    })
+
 @app.route('/api/pool/<pool_address>', methods=['GET'])
 def get_pool_details(pool_address):
     """
@@ -292,27 +610,37 @@ def get_pool_details(pool_address):
     try:
         logger.info(f"Fetching pool details for: {pool_address}")
 
-        # Fetch all pools from cache
-        pools = get_pools_from_cache()
-
-        # Find the specific pool
-        pool = next((p for p in pools if p.get('address') == pool_address), None)
+        # Find the specific pool through the snapshot's address index
+        snapshot = get_snapshot_from_cache()
+        row = snapshot.find(pool_address)
 
-        if not pool:
+        if row is None:
             return jsonify({
                 'status': 'error',
                 'message': 'Pool not found'
             }), 404
 
+        etag = None
+        if not USE_GROUPED_CACHE:
+            etag = snapshot_etag(snapshot.generation, 'pool', pool_address)
+            not_modified = not_modified_response(etag)
+            if not_modified is not None:
+                return not_modified
+
+        pool = snapshot.record(row)
+
         # For now, return basic pool data
         # Timeframes would need to be fetched from transaction history API
-        return jsonify({
+        response = jsonify({
             'status': 'success',
             'data': {
-                'pool': pool,
+                'pool': pool.to_dict(),
                 'timeframes': None  # Can be enhanced later with transaction data
             }
         })
+        if etag is not None:
+            add_cache_validators(response, etag)
+        return response
     except Exception as e:
         logger.error(f"Error fetching pool details: {str(e)}")
         return jsonify({
@@ -320,6 +648,123 @@ def get_pool_details(pool_address):
             'message': str(e)
         }), 500
 
+@app.route('/api/pool/<pool_address>/history', methods=['GET'])
+def get_pool_history(pool_address):
+    """
+    Recent metric history of one pool, one point per snapshot refresh
+
+    Recorded in memory from the /pair/all data the cache already downloads
+    (see pool_history.py) - no extra upstream calls. Liquidity and volume
+    match /api/pool exactly; price and fees are stored as float32 (about 7
+    significant digits).
+
+    Query params:
+        limit: Only the most recent N points (default: all that are kept)
+    """
+    try:
+        if USE_GROUPED_CACHE or pool_cache.history is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'Pool history is only available with PoolDataCache and POOL_HISTORY_DEPTH > 0'
+            }), 400
+
+        limit_param = request.args.get('limit', '').strip()
+        if limit_param and not limit_param.isdigit():
+            return jsonify({
+                'status': 'error',
+                'message': 'limit must be a non-negative integer'
+            }), 400
+        limit = int(limit_param) if limit_param else None
+
+        snapshot = get_snapshot_from_cache()
+        etag = snapshot_etag(snapshot.generation, 'history', pool_address, limit)
+        not_modified = not_modified_response(etag)
+        if not_modified is not None:
+            return not_modified
+
+        history = pool_cache.history.get(pool_address, limit=limit)
+        if history is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'No history for this pool'
+            }), 404
+
+        return add_cache_validators(jsonify({
+            'status': 'success',
+            'data': {
+                'address': pool_address,
+                'depth': pool_cache.history.depth,
+                'points': len(history['timestamps']),
+                'timestamps': history['timestamps'],
+                'generations': history['generations'],
+                'current_price': history['current_price'],
+                'liquidity': history['liquidity'],
+                'fees': {window: history[f'fees_{window}'] for window in WINDOWS},
+                'volume': {window: history[f'volume_{window}'] for window in WINDOWS}
+            }
+        }), etag)
+    except Exception as e:
+        logger.error(f"Error fetching pool history: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@app.route('/api/pools/batch', methods=['POST'])
+def get_pools_batch():
+    """
+    Get details for several pools in one request
+
+    Body: {"addresses": ["<pool address>", ...]} (at most MAX_BATCH_POOLS).
+    Records come from the snapshot's address index, in request order
+    (duplicates collapsed); addresses not in the snapshot are listed in
+    `missing`.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        addresses = data.get('addresses')
+
+        if not isinstance(addresses, list) or not all(isinstance(address, str) for address in addresses):
+            return jsonify({
+                'status': 'error',
+                'message': 'addresses must be a list of pool addresses'
+            }), 400
+
+        addresses = list(dict.fromkeys(addresses))
+        if len(addresses) > MAX_BATCH_POOLS:
+            return jsonify({
+                'status': 'error',
+                'message': f'Too many addresses ({len(addresses)}), maximum is {MAX_BATCH_POOLS}'
+            }), 400
+
+        snapshot = get_snapshot_from_cache()
+
+        pools = []
+        missing = []
+        for address in addresses:
+            row = snapshot.find(address)
+            if row is None:
+                missing.append(address)
+            else:
+                pools.append(snapshot.record(row).to_dict())
+
+        logger.info(f"Batch pool lookup: {len(pools)} found, {len(missing)} missing")
+
+        return jsonify({
+            'status': 'success',
+            'generation': snapshot.generation,
+            'data': {
+                'pools': pools,
+                'missing': missing
+            }
+        })
+    except Exception as e:
+        logger.error(f"Error fetching pool batch: {str(e)}")
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     return jsonify({'status': 'healthy'})
@@ -353,34 +798,23 @@ def get_wallet_positions():
 
         # Fetch all pools from cache
         logger.info("Fetching pools from cache...")
-        all_pools = get_pools_from_cache(limit=100)
-        logger.info(f"Loaded {len(all_pools)} pools from cache")
-
-        # Common quote token addresses
-        QUOTE_TOKENS = {
-            'SOL': 'So11111111111111111111111111111111111111112',
-            'USDC': 'EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v'
-        }
-
-        # Filter pools based on whitelist and quote preferences
-        candidate_pools = []
-        for pool in all_pools:
-            mint_x = pool.get('mint_x', '')
-            mint_y = pool.get('mint_y', '')
+        snapshot = get_snapshot_from_cache(limit=100)
+        logger.info(f"Loaded {len(snapshot)} pools from cache")
 
-            # Check if pool contains a whitelisted token
-            has_whitelisted_token = mint_x in whitelist or mint_y in whitelist
-            if not has_whitelisted_token:
-                continue
-
-            # Check if pool has preferred quote token
-            has_sol_quote = (mint_x == QUOTE_TOKENS['SOL'] or mint_y == QUOTE_TOKENS['SOL']) and quote_preferences.get('sol', False)
-            has_usdc_quote = (mint_x == QUOTE_TOKENS['USDC'] or mint_y == QUOTE_TOKENS['USDC']) and quote_preferences.get('usdc', False)
+        # Candidate pools contain a whitelisted token and a preferred quote
+        # token - both looked up in the snapshot's mint index
+        quote_mints = []
+        if quote_preferences.get('sol', False):
+            quote_mints.append(QUOTE_TOKENS['SOL'])
+        if quote_preferences.get('usdc', False):
+            quote_mints.append(QUOTE_TOKENS['USDC'])
 
-            if has_sol_quote or has_usdc_quote:
-                candidate_pools.append(pool)
+        candidate_rows = (
+            set(snapshot.rows_for_mints(whitelist).tolist())
+            & set(snapshot.rows_for_mints(quote_mints).tolist())
+        )
 
-        logger.info(f"Found {len(candidate_pools)} candidate pools matching whitelist and quote preferences")
+        logger.info(f"Found {len(candidate_rows)} candidate pools matching whitelist and quote preferences")
 
         # Now fetch ALL positions for this wallet in ONE RPC call (like the SDK does)
         # Then match them against candidate pools
@@ -389,14 +823,6 @@ def get_wallet_positions():
 
         import base58
 
-        def safe_float(value, default=0.0):
-            if value is None or value == '':
-                return default
-            try:
-                return float(value)
-            except (ValueError, TypeError):
-                return default
-
         # Query ALL positions for this wallet in one call (SDK approach)
         logger.info("Fetching all user positions...")
         rpc_payload = {
@@ -443,8 +869,6 @@ def get_wallet_positions():
                         continue
 
                     # Decode base64 data
-                    import base64
-                    import struct
                     data_bytes = base64.b64decode(account_data[0])
 
                     # Extract pool address at offset 8 (32 bytes)
@@ -497,25 +921,26 @@ def get_wallet_positions():
         logger.info(f"User has positions in {len(user_positions_map)} pools")
 
         # Get SOL price from SOL-USDC pool in Meteora data
-        def get_sol_price_from_pools(pools):
+        def get_sol_price_from_pools(snapshot):
             """Extract SOL price from SOL-USDC pool"""
-            SOL_MINT = 'So11111111111111111111111111111111111111112'
-            USDC_MINT = 'EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v'
+            SOL_MINT = QUOTE_TOKENS['SOL']
+            USDC_MINT = QUOTE_TOKENS['USDC']
 
-            for pool in pools:
-                mint_x = pool.get('mint_x', '')
-                mint_y = pool.get('mint_y', '')
+            for row in snapshot.rows_for_mints([SOL_MINT, USDC_MINT], both=True):
+                pool = snapshot.record(row)
+                mint_x = pool.mint_x
+                mint_y = pool.mint_y
 
                 # Find SOL-USDC pool
                 if (mint_x == SOL_MINT and mint_y == USDC_MINT):
                     # SOL is X, USDC is Y, so pool_price = USDC per SOL = SOL price
-                    price = safe_float(pool.get('current_price', 0))
+                    price = pool.current_price
                     if price > 0:
                         logger.info(f"Found SOL price from SOL-USDC pool: ${price:.2f}")
                         return price
                 elif (mint_x == USDC_MINT and mint_y == SOL_MINT):
                     # USDC is X, SOL is Y, so pool_price = SOL per USDC, need to invert
-                    price = safe_float(pool.get('current_price', 0))
+                    price = pool.current_price
                     if price > 0:
                         sol_price = 1.0 / price
                         logger.info(f"Found SOL price from USDC-SOL pool: ${sol_price:.2f}")
@@ -524,16 +949,26 @@ def get_wallet_positions():
             logger.warning("Could not find SOL-USDC pool, using fallback price $150")
             return 150.0  # Fallback
 
-        sol_price_usd = get_sol_price_from_pools(all_pools)
+        sol_price_usd = get_sol_price_from_pools(snapshot)
+
+        # Deposit and withdrawal history of every position in a candidate
+        # pool, fetched concurrently under one deadline (a missing list
+        # marks the position's history incomplete)
+        histories = fetch_position_histories([
+            position_account.get('position_account')
+            for pool_address, position_accounts in user_positions_map.items()
+            if snapshot.find(pool_address) in candidate_rows
+            for position_account in position_accounts
+        ])
 
         # Now match user's pools with candidate pools
         positions = []
-        candidate_pool_map = {pool['address']: pool for pool in candidate_pools}
 
         for pool_address, position_accounts in user_positions_map.items():
-            if pool_address in candidate_pool_map:
-                pool = candidate_pool_map[pool_address]
-                logger.info(f"Matched position: {pool.get('name', '')} ({len(position_accounts)} position(s))")
+            row = snapshot.find(pool_address)
+            if row in candidate_rows:
+                pool = snapshot.record(row)
+                logger.info(f"Matched position: {pool.name} ({len(position_accounts)} position(s))")
 
                 # Fetch detailed position data from Meteora API for each position
                 total_token_x = 0
@@ -542,45 +977,29 @@ def get_wallet_positions():
                 total_fee_x = sum(p.get('fee_pending_x', 0) for p in position_accounts)
                 total_fee_y = sum(p.get('fee_pending_y', 0) for p in position_accounts)
 
-                # Fetch deposit and withdrawal history for each position to calculate current balance
+                # Current balance from the deposit and withdrawal history of each position
+                history_complete = True
                 for position_account in position_accounts:
-                    position_address = position_account.get('position_account')
-                    try:
-                        # Fetch deposits
-                        deposits_response = requests.get(
-                            f"https://dlmm-api.meteora.ag/position/{position_address}/deposits",
-                            timeout=5
-                        )
-                        # Fetch withdrawals
-                        withdraws_response = requests.get(
-                            f"https://dlmm-api.meteora.ag/position/{position_address}/withdraws",
-                            timeout=5
-                        )
-
-                        if deposits_response.status_code == 200:
-                            deposits = deposits_response.json()
-                            for deposit in deposits:
-                                total_token_x += deposit.get('token_x_amount', 0)
-                                total_token_y += deposit.get('token_y_amount', 0)
-
-                        if withdraws_response.status_code == 200:
-                            withdraws = withdraws_response.json()
-                            for withdraw in withdraws:
-                                total_token_x -= withdraw.get('token_x_amount', 0)
-                                total_token_y -= withdraw.get('token_y_amount', 0)
-
-                    except Exception as e:
-                        logger.error(f"  Error fetching position history: {e}")
+                    history = histories[position_account.get('position_account')]
+                    history_complete = history_complete and history['complete']
+
+                    for deposit in history['deposits'] or []:
+                        total_token_x += deposit.get('token_x_amount', 0)
+                        total_token_y += deposit.get('token_y_amount', 0)
+
+                    for withdraw in history['withdraws'] or []:
+                        total_token_x -= withdraw.get('token_x_amount', 0)
+                        total_token_y -= withdraw.get('token_y_amount', 0)
 
                 # Get token info and derive prices from pool data
-                mint_x = pool.get('mint_x', '')
-                mint_y = pool.get('mint_y', '')
-                pool_price = safe_float(pool.get('current_price', 0))  # Y per X (e.g., USDC per JUP)
+                mint_x = pool.mint_x
+                mint_y = pool.mint_y
+                pool_price = pool.current_price  # Y per X (e.g., USDC per JUP)
 
                 # Derive token USD prices from pool price
                 # Common quote tokens we can use as USD anchors
-                USDC_MINT = 'EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v'
-                SOL_MINT = 'So11111111111111111111111111111111111111112'
+                USDC_MINT = QUOTE_TOKENS['USDC']
+                SOL_MINT = QUOTE_TOKENS['SOL']
 
                 # Default prices
                 price_x = 0
@@ -630,25 +1049,23 @@ def get_wallet_positions():
                 estimated_position_value = value_from_x + value_from_y
 
                 # Convert to strings to avoid JSON serialization issues with huge numbers
-                # Calculate 30-minute fee rate for this pool
-                fees_obj = pool.get('fees', {})
-                volume_obj = pool.get('volume', {})
-                fees_30min = safe_float(fees_obj.get('min_30', 0))
-                volume_30min = safe_float(volume_obj.get('min_30', 0))
-                pool_liquidity = safe_float(pool.get('liquidity', 0))
-                fee_rate_30min = (fees_30min / pool_liquidity * 100) if pool_liquidity > 0 else 0
+                # 30-minute fee rate comes precomputed with the snapshot
+                fees_30min = pool.fees_min_30
+                volume_30min = pool.volume_min_30
+                pool_liquidity = pool.liquidity
+                fee_rate_30min = snapshot.value('fee_rate_30min', row)
 
                 position_data = {
                     'address': pool_address,
-                    'pairName': pool.get('name', ''),
+                    'pairName': pool.name,
                     # Pool-level data (for reference)
                     'pool_liquidity': pool_liquidity,
                     'pool_feeRate30min': fee_rate_30min,
                     'pool_fees30min': fees_30min,
                     'pool_volume30min': volume_30min,
-                    'pool_current_price': safe_float(pool.get('current_price', 0)),
-                    'binStep': pool.get('bin_step', 0),
-                    'baseFee': safe_float(pool.get('base_fee_percentage', 0)),
+                    'pool_current_price': pool.current_price,
+                    'binStep': pool.bin_step,
+                    'baseFee': pool.base_fee_percentage,
                     # Position-specific data
                     'liquidity_shares': str(total_liquidity_shares),
                     'pending_fee_x': str(total_fee_x),
@@ -660,6 +1077,9 @@ def get_wallet_positions():
                     'has_liquidity': total_liquidity_shares > 0,
                     'has_pending_fees': total_fee_x > 0 or total_fee_y > 0,
                     'position_count': len(position_accounts),
+                    # False if some history could not be fetched in time
+                    # (token amounts and value are then incomplete)
+                    'history_complete': history_complete,
                     'status': 'Active' if total_liquidity_shares > 0 else 'Empty',
                     'mint_x': mint_x,
                     'mint_y': mint_y,
@@ -681,7 +1101,8 @@ def get_wallet_positions():
         return jsonify({
             'status': 'success',
             'positions': positions,
-            'total_positions': len(positions)
+            'total_positions': len(positions),
+            'partial': not all(position['history_complete'] for position in positions)
         })
     except Exception as e:
         logger.error(f"Error fetching positions: {str(e)}")
@@ -718,15 +1139,9 @@ def analyze_opportunities():
 
         logger.info(f"Analyzing opportunities for {len(whitelist)} tokens")
 
-        # Fetch all pools from cache
-        all_pools = get_pools_from_cache(limit=200)
-        logger.info(f"Loaded {len(all_pools)} pools from cache for opportunities")
-
-        # Common quote token addresses
-        QUOTE_TOKENS = {
-            'SOL': 'So11111111111111111111111111111111111111112',
-            'USDC': 'EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v'
-        }
+        # Fetch columnar pool snapshot from cache
+        snapshot = get_snapshot_from_cache(limit=200)
+        logger.info(f"Loaded {len(snapshot)} pools from cache for opportunities")
 
         # Build allowed tokens set: whitelist + selected quote tokens
         allowed_tokens = set(whitelist)
@@ -738,67 +1153,50 @@ def analyze_opportunities():
         logger.info(f"Allowed tokens for opportunities: {len(allowed_tokens)} tokens")
         logger.info(f"Minimum 30min fees filter: ${min_fees_30min}")
 
-        # Filter pools: BOTH tokens must be in allowed set
-        opportunities = []
-        for pool in all_pools:
-            mint_x = pool.get('mint_x', '')
-            mint_y = pool.get('mint_y', '')
-
-            # Both tokens must be in the allowed set (whitelist + quote tokens)
-            if mint_x not in allowed_tokens or mint_y not in allowed_tokens:
-                continue
-
-            # At least one must be from whitelist (to avoid showing only SOL-USDC when you don't have positions)
-            has_whitelisted_token = mint_x in whitelist or mint_y in whitelist
-            if not has_whitelisted_token:
-                # Allow quote-only pairs (like SOL-USDC) only if you have both quotes selected
-                is_quote_pair = (mint_x in QUOTE_TOKENS.values() and mint_y in QUOTE_TOKENS.values())
-                if not is_quote_pair:
-                    continue
-
-            # Determine quote token
-            quote_token = 'SOL' if (mint_x == QUOTE_TOKENS['SOL'] or mint_y == QUOTE_TOKENS['SOL']) else 'USDC'
+        # Both tokens must be in the allowed set (whitelist + quote tokens),
+        # resolved through the snapshot's mint index
+        rows = snapshot.rows_for_mints(allowed_tokens, both=True)
+
+        # At least one must be from whitelist (to avoid showing only SOL-USDC when you don't have positions)
+        # Quote-only pairs (like SOL-USDC) are allowed only if you have both quotes selected
+        rows = rows[np.isin(rows, np.union1d(
+            snapshot.rows_for_mints(whitelist),
+            snapshot.rows_for_mints(QUOTE_TOKENS.values(), both=True)
+        ))]
+
+        # Skip pools with very low liquidity, volume ($20 in 30min = ~$1K daily),
+        # or fees below minimum threshold
+        rows = snapshot.filter_rows(
+            rows,
+            min_liquidity=1000,
+            min_volume_30min=20,
+            min_fees_30min=safe_float(min_fees_30min)
+        )
 
-            # Calculate opportunity score (weighted combination of metrics)
-            def safe_float(value, default=0.0):
-                if value is None or value == '':
-                    return default
-                try:
-                    return float(value)
-                except (ValueError, TypeError):
-                    return default
-
-            # Get 30-minute data
-            fees_obj = pool.get('fees', {})
-            volume_obj = pool.get('volume', {})
-            fees_30min = safe_float(fees_obj.get('min_30', 0))
-            volume_30min = safe_float(volume_obj.get('min_30', 0))
-            liquidity = safe_float(pool.get('liquidity', 0))
-
-            # Calculate 30-minute fee rate (percentage)
-            fee_rate_30min = (fees_30min / liquidity * 100) if liquidity > 0 else 0
-
-            # Skip pools with very low liquidity, volume, or fees
-            if liquidity < 1000 or volume_30min < 20:  # $20 in 30min = ~$1K daily
-                continue
+        # 30-minute fee rate (percentage) and quote class come precomputed
+        # with the snapshot
+        fee_rates = snapshot.derived['fee_rate_30min'][rows]
+        quote_classes = snapshot.derived['quote_class'][rows]
+        cols = snapshot.columns
 
-            # Skip pools with fees below minimum threshold
-            if fees_30min < min_fees_30min:
-                continue
+        opportunities = []
+        for i, fee_rate_30min, quote_class in zip(rows, fee_rates.tolist(), quote_classes.tolist()):
+            mint_x = snapshot.strings['mint_x'][i]
+            mint_y = snapshot.strings['mint_y'][i]
 
             # Calculate score based on fee rate (higher is better)
             score = fee_rate_30min
 
             opportunity = {
-                'address': pool.get('address', ''),
-                'pairName': pool.get('name', ''),
-                'quoteToken': quote_token,
+                'address': snapshot.strings['address'][i],
+                'pairName': snapshot.strings['name'][i],
+                'quoteToken': 'SOL' if quote_class == QUOTE_SOL else 'USDC',
                 'feeRate30min': fee_rate_30min,
-                'fees30min': fees_30min,
-                'volume30min': volume_30min,
-                'liquidity': liquidity,
-                'binStep': pool.get('bin_step', 0),
-                'baseFee': safe_float(pool.get('base_fee_percentage', 0)),
+                'fees30min': float(cols['fees_min_30'][i]),
+                'volume30min': float(cols['volume_min_30'][i]),
+                'liquidity': float(cols['liquidity'][i]),
+                'binStep': int(cols['bin_step'][i]),
+                'baseFee': float(cols['base_fee_percentage'][i]),
                 'score': score,
                 'mint_x': mint_x,
                 'mint_y': mint_y
@@ -1225,11 +1623,16 @@ def get_cache_stats():
             stats = pool_cache.get_stats()
             cache_type = 'PoolDataCache'
 
-        return jsonify({
+        response = jsonify({
             'status': 'success',
             'cache_type': cache_type,
-            'cache': stats
+            'cache': stats,
+            'pairs_response_cache': pairs_response_cache.get_stats(),
+            'pairs_stream': pairs_broadcaster.get_stats()
         })
+        # Counters and cache age move on every read - always revalidate
+        response.cache_control.no_cache = True
+        return response
     except Exception as e:
         logger.error(f"Error getting cache stats: {str(e)}")
         return jsonify({
@@ -1671,7 +2074,6 @@ def get_wallet_balance():
         if response.value:
             for account in response.value:
                 # Parse token account data
-                import base64
                 data = base64.b64decode(account.account.data)
                 # Token amount is at offset 64, 8 bytes (little-endian)
                 if len(data) >= 72:
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Cache Mode Benchmark
+Drives PoolDataCache, GroupedPoolCache and get_snapshot_from_cache against
+the fake Meteora API through cold, warm and forced-refresh scenarios and
+reports wall time, p50/p99 per call, upstream requests/bytes and peak RSS
+
+Each mode calls what the app serves from: PoolDataCache.get_snapshot() and
+get_snapshot_from_cache() (the /api/pairs path), and GroupedPoolCache's
+record list, which app-grouped then turns into a snapshot per call.
+
+Each mode runs in its own process (fresh caches, honest RSS); the fake API
+runs in another so its work doesn't skew the timings.
+
+Usage (from backend/):
+    python benchmarks/cache_modes.py
+    python benchmarks/cache_modes.py --pools 120000 --latency-ms 150 --etags
+    python benchmarks/cache_modes.py --modes pool,grouped --limit 200 --json results.json
+
+Cache settings come from the environment as usual. Unless set, the runner
+disables the on-disk snapshot, shared mode, background refresh, prefetching
+and the minimum fetch interval (see BENCHMARK_ENV) so every scenario
+measures the fetch path it names. The app-* modes import app.py, which loads
+backend/.env - unset DATABASE_URL there to keep database features out of it.
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, BENCHMARK_DIR)
+
+from fake_meteora_api import add_arguments  # noqa: E402
+
+MODES = {
+    'pool': 'PoolDataCache.get_snapshot (/pair/all)',
+    'grouped': 'GroupedPoolCache.get_pools (/pair/groups)',
+    'app-pool': 'get_snapshot_from_cache, USE_GROUPED_CACHE=false',
+    'app-grouped': 'get_snapshot_from_cache, USE_GROUPED_CACHE=true'
+}
+
+# Defaults for the worker processes (only where the environment has no value)
+BENCHMARK_ENV = {
+    'POOL_CACHE_SNAPSHOT_PATH': '',
+    'POOL_CACHE_SHARED_DIR': '',
+    'POOL_CACHE_BACKGROUND_REFRESH': 'false',
+    'POOL_CACHE_MIN_FETCH_INTERVAL': '0',
+    'GROUPED_CACHE_PREFETCH': 'false',
+    'GROUPED_CACHE_MIN_FETCH_INTERVAL': '0'
+}
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def _upstream_stats(api: str) -> dict:
+    with urllib.request.urlopen(f'{api}/__stats', timeout=10) as response:
+        return json.load(response)
+
+
+def _cache_call(mode: str, limit: int):
+    """Callable(force_refresh) -> snapshot or pool list for a mode (imports the backend)"""
+    sys.path.insert(0, BACKEND_DIR)
+    if mode == 'pool':
+        from pool_cache import pool_cache
+        return lambda force: pool_cache.get_snapshot(force_refresh=force)
+    if mode == 'grouped':
+        from grouped_pool_cache import grouped_pool_cache
+        return lambda force: grouped_pool_cache.get_pools(force_refresh=force, limit=limit)
+
+    import app
+    return lambda force: app.get_snapshot_from_cache(force_refresh=force, limit=limit)
+
+
+def run_worker(mode: str, api: str, warm_calls: int, forced_calls: int, limit: int, verbose: bool) -> dict:
+    """Run the three scenarios for one mode in this process"""
+    import logging
+
+    call = _cache_call(mode, limit)
+    if not verbose:
+        logging.disable(logging.INFO)
+    import_rss = _peak_rss_mb()
+
+    scenarios = []
+    for scenario, calls, force in (
+        ('cold', 1, False),
+        ('warm', warm_calls, False),
+        ('forced', forced_calls, True)
+    ):
+        before = _upstream_stats(api)
+        latencies = []
+        pools = []
+        start = time.perf_counter()
+        for _ in range(calls):
+            call_start = time.perf_counter()
+            pools = call(force)
+            latencies.append(time.perf_counter() - call_start)
+        wall = time.perf_counter() - start
+        after = _upstream_stats(api)
+
+        latencies_ms = np.array(latencies) * 1000
+        scenarios.append({
+            'scenario': scenario,
+            'calls': calls,
+            'wall_seconds': round(wall, 3),
+            'p50_ms': round(float(np.percentile(latencies_ms, 50)), 3) if calls else None,
+            'p99_ms': round(float(np.percentile(latencies_ms, 99)), 3) if calls else None,
+            'upstream_requests': after['requests'] - before['requests'],
+            'upstream_not_modified': after['not_modified'] - before['not_modified'],
+            'upstream_by_endpoint': {
+                endpoint: count - before['by_endpoint'].get(endpoint, 0)
+                for endpoint, count in after['by_endpoint'].items()
+                if count != before['by_endpoint'].get(endpoint, 0)
+            },
+            'upstream_mb': round((after['bytes_sent'] - before['bytes_sent']) / 1024 / 1024, 2),
+            'peak_rss_mb': round(_peak_rss_mb(), 1),
+            'pools': len(pools)
+        })
+
+    return {'mode': mode, 'description': MODES[mode], 'import_rss_mb': round(import_rss, 1), 'scenarios': scenarios}
+
+
+def _start_fake_api(args):
+    """Start the fake API in a subprocess; returns (process, base URL)"""
+    command = [
+        sys.executable, os.path.join(BENCHMARK_DIR, 'fake_meteora_api.py'), '--port', '0',
+        '--pools', str(args.pools), '--seed', str(args.seed),
+        '--latency-ms', str(args.latency_ms), '--bandwidth-mbps', str(args.bandwidth_mbps),
+        '--churn', str(args.churn), '--churn-interval', str(args.churn_interval)
+    ]
+    if args.pools_file:
+        command += ['--pools-file', args.pools_file]
+    if args.etags:
+        command.append('--etags')
+
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith('LISTENING '):
+        process.kill()
+        raise RuntimeError('Fake Meteora API failed to start')
+    return process, f'http://127.0.0.1:{int(line.split()[1])}'
+
+
+def _run_mode(mode: str, api: str, args) -> dict:
+    """Run one mode in a fresh worker process"""
+    env = dict(os.environ)
+    for key, value in BENCHMARK_ENV.items():
+        env.setdefault(key, value)
+    env['METEORA_API_BASE'] = api
+    if mode.startswith('app-'):
+        env['USE_GROUPED_CACHE'] = 'true' if mode == 'app-grouped' else 'false'
+
+    command = [
+        sys.executable, os.path.abspath(__file__), '--worker', mode, '--api', api,
+        '--warm-calls', str(args.warm_calls), '--forced-calls', str(args.forced_calls),
+        '--limit', str(args.limit)
+    ]
+    if args.verbose:
+        command.append('--verbose')
+
+    result = subprocess.run(
+        command, cwd=BACKEND_DIR, env=env, stdout=subprocess.PIPE,
+        stderr=None if args.verbose else subprocess.PIPE, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{mode} worker failed:\n{result.stderr or ''}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def print_report(upstream: dict, args, results: list):
+    """Human-readable results table"""
+    print(f"\n📊 Cache mode benchmark - {upstream['pools']} pools, {upstream['groups']} groups, "
+          f"{args.latency_ms:g} ms latency{', ETags' if args.etags else ''}, group limit {args.limit}\n")
+    header = (f"{'mode':<12} {'scenario':<8} {'calls':>6} {'wall s':>8} {'p50 ms':>9} {'p99 ms':>9} "
+              f"{'upstream':>9} {'304':>5} {'MB in':>8} {'RSS MB':>8} {'pools':>7}")
+    print(header)
+    print('-' * len(header))
+    for result in results:
+        for row in result['scenarios']:
+            print(f"{result['mode']:<12} {row['scenario']:<8} {row['calls']:>6} {row['wall_seconds']:>8.3f} "
+                  f"{row['p50_ms'] or 0:>9.3f} {row['p99_ms'] or 0:>9.3f} {row['upstream_requests']:>9} "
+                  f"{row['upstream_not_modified']:>5} {row['upstream_mb']:>8.2f} {row['peak_rss_mb']:>8.1f} "
+                  f"{row['pools']:>7}")
+    print("\nupstream = requests seen by the fake API, RSS MB = worker peak RSS so far "
+          "(after imports: " + ', '.join(f"{r['mode']} {r['import_rss_mb']}" for r in results) + ")")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    add_arguments(parser)
+    parser.add_argument('--modes', default=','.join(MODES), help=f"Comma-separated ({', '.join(MODES)})")
+    parser.add_argument('--warm-calls', type=int, default=200, help='Calls in the warm scenario')
+    parser.add_argument('--forced-calls', type=int, default=5, help='Calls in the forced-refresh scenario')
+    parser.add_argument('--limit', type=int, default=100, help='Group limit (grouped and app modes)')
+    parser.add_argument('--api', help='Use an already running (fake) API instead of starting one')
+    parser.add_argument('--json', help='Also write the results to this file')
+    parser.add_argument('--verbose', action='store_true', help='Show backend logs')
+    parser.add_argument('--worker', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_worker(args.worker, args.api, args.warm_calls, args.forced_calls, args.limit, args.verbose)
+        print(json.dumps(result))
+        return
+
+    modes = [mode.strip() for mode in args.modes.split(',') if mode.strip()]
+    unknown = [mode for mode in modes if mode not in MODES]
+    if unknown:
+        parser.error(f"Unknown modes: {', '.join(unknown)}")
+
+    process = None
+    api = args.api
+    if api is None:
+        process, api = _start_fake_api(args)
+    try:
+        results = []
+        for mode in modes:
+            print(f"⏱️  {mode}: {MODES[mode]}", file=sys.stderr, flush=True)
+            results.append(_run_mode(mode, api, args))
+        upstream = _upstream_stats(api)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    print_report(upstream, args, results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'upstream': upstream, 'arguments': vars(args), 'results': results}, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
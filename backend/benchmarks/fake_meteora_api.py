@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Fake Meteora DLMM API
+Local stand-in for /pair/all, /pair/groups and /pair/groups/<id> serving
+synthetic or recorded pools with configurable size and latency, so cache
+modes can be benchmarked without touching (or being limited by) the real API
+
+Point the backend at it with METEORA_API_BASE=http://127.0.0.1:<port>.
+
+Usage:
+    python benchmarks/fake_meteora_api.py --pools 20000 --latency-ms 50
+    python benchmarks/fake_meteora_api.py --pools-file pair_all.json --etags
+
+A recorded payload is a saved /pair/all response, e.g.
+    curl -o pair_all.json https://dlmm-api.meteora.ag/pair/all
+
+GET /__stats returns the request counters (not counted itself).
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import parse_qs, urlparse
+
+WINDOWS = ('min_30', 'hour_1', 'hour_2', 'hour_4', 'hour_12', 'hour_24')
+SOL_MINT = 'So11111111111111111111111111111111111111112'
+USDC_MINT = 'EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v'
+
+
+def _fake_key(prefix: str, i: int) -> str:
+    """Deterministic 44-character stand-in for a base58 account key"""
+    return (prefix + hashlib.sha256(f'{prefix}{i}'.encode()).hexdigest())[:44]
+
+
+def _randomize_activity(pool: dict, rng: random.Random):
+    """Fill the fee/volume windows from the pool's liquidity"""
+    liquidity = float(pool['liquidity'])
+    daily_volume = liquidity * rng.lognormvariate(0, 1.5)
+    fee_rate = float(pool['base_fee_percentage']) / 100
+    hours = {'min_30': 0.5, 'hour_1': 1, 'hour_2': 2, 'hour_4': 4, 'hour_12': 12, 'hour_24': 24}
+    pool['volume'] = {w: daily_volume * hours[w] / 24 * rng.uniform(0.5, 1.5) for w in WINDOWS}
+    pool['fees'] = {w: pool['volume'][w] * fee_rate for w in WINDOWS}
+    pool['fee_tvl_ratio'] = {
+        w: (pool['fees'][w] / liquidity * 100 if liquidity > 0 else 0) for w in WINDOWS
+    }
+    pool['fees_24h'] = pool['fees']['hour_24']
+    pool['today_fees'] = pool['fees']['hour_12']
+    pool['trade_volume_24h'] = pool['volume']['hour_24']
+    pool['apr'] = pool['fee_tvl_ratio']['hour_24'] * 365
+    pool['apy'] = pool['apr'] * 1.1
+
+
+def synthetic_pools(count: int, seed: int = 1) -> List[dict]:
+    """
+    /pair/all-shaped pools with a realistic spread
+
+    Most pools are dust (the real API has ~95% under $100 TVL), a heavy
+    tail holds the liquidity, half the pools quote SOL and a quarter USDC,
+    and a few are hidden or blacklisted.
+    """
+    rng = random.Random(seed)
+    token_count = max(count // 8, 10)
+    pools = []
+    for i in range(count):
+        token = i % token_count
+        mint_x = _fake_key('Mint', token)
+        quote = rng.random()
+        if quote < 0.5:
+            mint_y, quote_name = SOL_MINT, 'SOL'
+        elif quote < 0.75:
+            mint_y, quote_name = USDC_MINT, 'USDC'
+        else:
+            other = rng.randrange(token_count)
+            mint_y, quote_name = _fake_key('Mint', other), f'TK{other}'
+
+        pool = {
+            'address': _fake_key('Pool', i),
+            'name': f'TK{token}-{quote_name}',
+            'mint_x': mint_x,
+            'mint_y': mint_y,
+            'reserve_x': _fake_key('ResX', i),
+            'reserve_y': _fake_key('ResY', i),
+            'reserve_x_amount': rng.randrange(10 ** 12),
+            'reserve_y_amount': rng.randrange(10 ** 12),
+            'bin_step': rng.choice([1, 5, 10, 20, 25, 50, 80, 100, 200]),
+            'base_fee_percentage': rng.choice(['0.01', '0.05', '0.1', '0.25', '1', '2']),
+            'max_fee_percentage': '10',
+            'protocol_fee_percentage': '5',
+            'liquidity': str(rng.lognormvariate(3.5, 3)),
+            'reward_mint_x': '11111111111111111111111111111111',
+            'reward_mint_y': '11111111111111111111111111111111',
+            'cumulative_trade_volume': str(rng.uniform(0, 10 ** 8)),
+            'cumulative_fee_volume': str(rng.uniform(0, 10 ** 6)),
+            'current_price': rng.lognormvariate(0, 4),
+            'farm_apr': 0,
+            'farm_apy': 0,
+            'hide': rng.random() < 0.03,
+            'is_blacklisted': rng.random() < 0.01,
+            'tags': [],
+            'launchpad': None,
+            'is_verified': rng.random() < 0.2
+        }
+        _randomize_activity(pool, rng)
+        pools.append(pool)
+    return pools
+
+
+def load_recorded_pools(path: str) -> List[dict]:
+    """Pools from a saved /pair/all response (a list, or a {data: [...]} body)"""
+    with open(path) as f:
+        payload = json.load(f)
+    if isinstance(payload, dict):
+        payload = payload.get('data', [])
+    return payload
+
+
+def _group_pools(pools: List[dict]) -> dict:
+    """lexical_order_mints -> pools, like /pair/groups"""
+    groups = {}
+    for pool in pools:
+        key = '-'.join(sorted((pool['mint_x'], pool['mint_y'])))
+        groups.setdefault(key, []).append(pool)
+    return groups
+
+
+def _float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class FakeMeteoraAPI:
+    """
+    Threaded HTTP server answering like the Meteora DLMM API
+
+    - Every request sleeps `latency_ms`; bodies additionally take
+      len / `bandwidth_mbps` to "transfer" (0 = unlimited).
+    - `etags` adds ETags and answers matching If-None-Match with 304.
+    - `churn` re-randomizes that fraction of the pools' fees/volumes every
+      `churn_interval` seconds (so ETags change and caches see movement).
+    """
+
+    def __init__(self, pools: List[dict], latency_ms: float = 50, bandwidth_mbps: float = 0,
+                 etags: bool = False, churn: float = 0, churn_interval: float = 60, seed: int = 1):
+        self.latency = latency_ms / 1000
+        self.bandwidth = bandwidth_mbps * 1024 * 1024 / 8
+        self.etags = etags
+        self.churn = churn
+        self.churn_interval = churn_interval
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._version = 0
+        self._server = None
+
+        self.stats = {'requests': 0, 'not_modified': 0, 'bytes_sent': 0, 'by_endpoint': {}}
+        self._set_pools(pools)
+
+    def _set_pools(self, pools: List[dict]):
+        """Rebuild the pre-rendered payloads"""
+        self.pools = pools
+        self.groups = _group_pools(pools)
+        self.group_list = sorted(
+            (
+                {
+                    'name': members[0].get('name', key),
+                    'lexical_order_mints': key,
+                    'total_tvl': sum(_float(p.get('liquidity')) for p in members),
+                    'total_volume': sum(_float(p.get('trade_volume_24h')) for p in members),
+                    'pairs': [p['address'] for p in members]
+                }
+                for key, members in self.groups.items()
+            ),
+            key=lambda g: g['total_tvl'],
+            reverse=True
+        )
+        self.all_body = json.dumps(pools).encode()
+        self.all_body_gzip = gzip.compress(self.all_body, 1)
+        self.all_etag = f'"{hashlib.md5(self.all_body).hexdigest()}"'
+
+    def _maybe_churn(self):
+        """Apply pending churn steps (called per request)"""
+        if not self.churn:
+            return
+        version = int((time.monotonic() - self._started) // self.churn_interval)
+        if version == self._version:
+            return
+        with self._lock:
+            if version == self._version:
+                return
+            changed = self._rng.sample(self.pools, int(len(self.pools) * self.churn))
+            for pool in changed:
+                _randomize_activity(pool, self._rng)
+            self._set_pools(self.pools)
+            self._version = version
+
+    def _count(self, endpoint: str, status: int, sent: int):
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats['bytes_sent'] += sent
+            if status == 304:
+                self.stats['not_modified'] += 1
+            self.stats['by_endpoint'][endpoint] = self.stats['by_endpoint'].get(endpoint, 0) + 1
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            return {
+                **self.stats,
+                'by_endpoint': dict(self.stats['by_endpoint']),
+                'pools': len(self.pools),
+                'groups': len(self.group_list),
+                'version': self._version
+            }
+
+    def _handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, endpoint: str, body: bytes, etag: Optional[str] = None, gzipped: Optional[bytes] = None):
+                time.sleep(api.latency)
+                if api.etags and etag is None:
+                    etag = f'"{hashlib.md5(body).hexdigest()}"'
+                if api.etags and self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    api._count(endpoint, 304, 0)
+                    self.end_headers()
+                    return
+
+                compress = 'gzip' in (self.headers.get('Accept-Encoding') or '')
+                if compress:
+                    body = gzipped if gzipped is not None else gzip.compress(body, 1)
+                if api.bandwidth:
+                    time.sleep(len(body) / api.bandwidth)
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                if api.etags:
+                    self.send_header('ETag', etag)
+                if compress:
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(body)))
+                # Counted before sending so a client never sees stale stats
+                api._count(endpoint, 200, len(body))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _page(self, endpoint: str, items: List[dict], query: dict):
+                page = max(int(query.get('page', ['1'])[0]), 1)
+                page_size = max(int(query.get('page_size', ['100'])[0]), 1)
+                pages = max((len(items) + page_size - 1) // page_size, 1)
+                body = json.dumps({
+                    'data': items[(page - 1) * page_size:page * page_size],
+                    'pages': pages,
+                    'current_page': page,
+                    'total': len(items)
+                }).encode()
+                self._send(endpoint, body)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+
+                if url.path == '/__stats':
+                    body = json.dumps(api.get_stats()).encode()
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+
+                api._maybe_churn()
+                if url.path == '/pair/all':
+                    self._send('/pair/all', api.all_body, api.all_etag, api.all_body_gzip)
+                elif url.path == '/pair/groups':
+                    self._page('/pair/groups', api.group_list, query)
+                elif url.path.startswith('/pair/groups/'):
+                    group_id = url.path[len('/pair/groups/'):]
+                    self._page('/pair/groups/<id>', api.groups.get(group_id, []), query)
+                else:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+
+        return Handler
+
+    def start(self, host: str = '127.0.0.1', port: int = 0) -> int:
+        """Serve in a background thread; returns the bound port"""
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server.server_address[1]
+
+    def serve_forever(self, host: str = '127.0.0.1', port: int = 0, on_ready=None):
+        """Serve in the calling thread; on_ready(port) runs once bound"""
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        if on_ready:
+            on_ready(self._server.server_address[1])
+        self._server.serve_forever()
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Fake API options (shared with the benchmark runner)"""
+    parser.add_argument('--pools', type=int, default=20000, help='Synthetic pool count (default 20000)')
+    parser.add_argument('--pools-file', help='Recorded /pair/all response to serve instead of synthetic pools')
+    parser.add_argument('--seed', type=int, default=1, help='Synthetic data seed')
+    parser.add_argument('--latency-ms', type=float, default=50, help='Added latency per request (default 50)')
+    parser.add_argument('--bandwidth-mbps', type=float, default=0, help='Simulated link speed (0 = unlimited)')
+    parser.add_argument('--etags', action='store_true', help='Send ETags and answer 304 when unchanged')
+    parser.add_argument('--churn', type=float, default=0, help='Fraction of pools changed per churn interval')
+    parser.add_argument('--churn-interval', type=float, default=60, help='Seconds between churn steps')
+
+
+def build_api(args) -> FakeMeteoraAPI:
+    pools = load_recorded_pools(args.pools_file) if args.pools_file else synthetic_pools(args.pools, args.seed)
+    return FakeMeteoraAPI(
+        pools,
+        latency_ms=args.latency_ms,
+        bandwidth_mbps=args.bandwidth_mbps,
+        etags=args.etags,
+        churn=args.churn,
+        churn_interval=args.churn_interval,
+        seed=args.seed
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    add_arguments(parser)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765, help='0 = any free port')
+    args = parser.parse_args()
+
+    api = build_api(args)
+
+    def ready(port):
+        # First stdout line is machine-readable (the benchmark runner waits for it)
+        print(f'LISTENING {port}', flush=True)
+        print(f"🚀 Fake Meteora API on http://{args.host}:{port} - "
+              f"{len(api.pools)} pools, {len(api.group_list)} groups, "
+              f"{len(api.all_body) / 1024 / 1024:.1f} MB /pair/all", file=sys.stderr, flush=True)
+
+    try:
+        api.serve_forever(args.host, args.port, on_ready=ready)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
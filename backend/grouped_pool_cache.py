@@ -4,13 +4,41 @@ Uses /pair/groups API with two-level caching for better scalability
 """
 
 import logging
+import os
 import requests
+import sys
 import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import List, Optional, Tuple
+from adaptive_ttl import AdaptiveTTL, records_change, ttl_distribution
+from meteora_http import METEORA_API_BASE, fetch_pages
+from pool_record import PoolRecord
+from refresh_coordinator import RefreshCoordinator
 
 logger = logging.getLogger(__name__)
 
+# Refresh coordinator key for the group list (group pools use their URL path)
+GROUPS_KEY = 'pair/groups'
+
+# Minimum seconds between sweeps for expired group entries
+EXPIRY_SWEEP_INTERVAL = 30
+
+# Longest the prefetcher sleeps between checks for groups coming due
+PREFETCH_MAX_SLEEP = 60
+
+
+def _page_count(validators, timings: dict) -> int:
+    """Pages a fetch_pages() call covered (without validators it made one request per page)"""
+    return len(validators) if validators else timings['requests']
+
+
+def _group_key(group_id: str) -> str:
+    """Refresh coordinator key for one group's pools"""
+    return f'{GROUPS_KEY}/{group_id}'
+
 
 class GroupedPoolCache:
     """
@@ -23,8 +51,35 @@ class GroupedPoolCache:
 
     Level 2: Pools cache (5-min TTL per group)
     - Lazy-loads pools for each group
+    - With `GROUPED_CACHE_ADAPTIVE_TTL` on, each group's TTL follows how
+      much its pools changed between fetches (adaptive_ttl.py), between
+      `GROUPED_CACHE_MIN_TTL` and `GROUPED_CACHE_MAX_TTL`
     - Filters individual pools
     - Only fetches groups that are actually requested
+    - LRU within `GROUPED_CACHE_MAX_GROUPS` entries and `GROUPED_CACHE_MAX_MB`
+      (estimated record memory); groups not refreshed for
+      `GROUPED_CACHE_RETENTION_SECONDS` are evicted, so residency follows
+      the working set instead of every group ever requested
+    - With prefetch enabled, a background thread refreshes the top
+      `GROUPED_CACHE_PREFETCH_TOP` groups by TVL and the groups requested in
+      the last `GROUPED_CACHE_PREFETCH_RECENT_SECONDS` shortly before their
+      TTL runs out, within `GROUPED_CACHE_PREFETCH_BUDGET` upstream requests
+      per minute - so common requests are served fully from cache
+
+    Both levels fetch through the shared pooled session (meteora_http.py)
+    and keep per-page ETag/Last-Modified validators: when every page answers
+    304 the cached data is kept and only its TTL is renewed.
+
+    Fetches go through a RefreshCoordinator keyed by upstream path:
+    concurrent refreshes of the groups list or of one group share a single
+    request, and a key is fetched at most every
+    `GROUPED_CACHE_MIN_FETCH_INTERVAL` seconds, even when forced.
+
+    Groups missing from (or stale in) the pools cache are loaded
+    concurrently, at most `GROUPED_CACHE_FETCH_WORKERS` at a time, and the
+    pages after the first of any paginated response are fetched in
+    parallel on `GROUPED_CACHE_PAGE_WORKERS` shared workers - a cold load of
+    the top groups costs about one group fetch instead of one per group.
     """
 
     _instance = None
@@ -43,11 +98,28 @@ class GroupedPoolCache:
         # Level 1: Groups cache
         self.groups_data = None
         self.groups_last_fetch = None
+        self.groups_validators = None  # Per-page validators for /pair/groups
+        self.groups_pages = None  # Pages /pair/groups took last time (prefetch budget estimate)
         self.groups_cache_duration = 3600  # 1 hour
 
-        # Level 2: Pools cache (dict of group_id -> pool data)
-        self.pools_cache: Dict[str, dict] = {}  # {lexical_order_mints: {data, last_fetch}}
-        self.pools_cache_duration = 300  # 5 minutes
+        # Level 2: Pools cache (LRU of group_id -> pool data)
+        self.pools_cache: 'OrderedDict[str, dict]' = OrderedDict()  # {lexical_order_mints: {data, last_fetch, validators, bytes}}
+        self.pools_cache_duration = 300  # 5 minutes (initial TTL of a group when adaptive)
+        self.group_ttl_policy = None
+        if os.getenv('GROUPED_CACHE_ADAPTIVE_TTL', 'true').lower() == 'true':
+            self.group_ttl_policy = AdaptiveTTL(
+                min_seconds=int(os.getenv('GROUPED_CACHE_MIN_TTL', 60)),
+                max_seconds=int(os.getenv('GROUPED_CACHE_MAX_TTL', 900)),
+                tolerance=float(os.getenv('GROUPED_CACHE_TTL_TOLERANCE', 0.05))
+            )
+        # Expired entries are kept a while longer (at least twice their TTL)
+        # for 304 revalidation and as a stale fallback, then evicted
+        self.pools_cache_retention = int(os.getenv('GROUPED_CACHE_RETENTION_SECONDS', 2 * self.pools_cache_duration))
+        self.pools_cache_max_groups = int(os.getenv('GROUPED_CACHE_MAX_GROUPS', 1000))
+        self.pools_cache_max_bytes = int(os.getenv('GROUPED_CACHE_MAX_MB', 64)) * 1024 * 1024
+        self.pools_cache_bytes = 0
+        self._pools_lock = threading.Lock()
+        self._last_expiry_sweep = None
 
         # Filtering configuration
         self.min_group_tvl = 10000  # Minimum total TVL for group ($10K)
@@ -55,9 +127,34 @@ class GroupedPoolCache:
         self.filter_hidden = True
         self.filter_blacklisted = True
 
-        # Threading locks
-        self.groups_fetch_lock = threading.Lock()
-        self.pools_fetch_locks: Dict[str, threading.Lock] = {}
+        # Single-flight fetches, at most one per key and interval (even forced)
+        self.refresh_coordinator = RefreshCoordinator(
+            min_interval_seconds=float(os.getenv('GROUPED_CACHE_MIN_FETCH_INTERVAL', 10))
+        )
+
+        # Bounded concurrency for upstream fetches (executors are created
+        # on first use, per process - threads do not survive a fork)
+        self.fetch_workers = max(int(os.getenv('GROUPED_CACHE_FETCH_WORKERS', 8)), 1)
+        self.page_workers = max(int(os.getenv('GROUPED_CACHE_PAGE_WORKERS', 4)), 1)
+        self._executors = None
+        self._executors_pid = None
+        self._executors_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+        # Background prefetch of popular groups (thread is started lazily
+        # per process, on the first get_pools() call)
+        self.prefetch_enabled = os.getenv('GROUPED_CACHE_PREFETCH', 'true').lower() == 'true'
+        self.prefetch_top_groups = int(os.getenv('GROUPED_CACHE_PREFETCH_TOP', 50))  # /api/pairs page (limit=50)
+        self.prefetch_recent_seconds = int(os.getenv('GROUPED_CACHE_PREFETCH_RECENT_SECONDS', 900))
+        self.prefetch_ahead_seconds = int(os.getenv('GROUPED_CACHE_PREFETCH_AHEAD', 30))
+        self.prefetch_budget_per_minute = int(os.getenv('GROUPED_CACHE_PREFETCH_BUDGET', 60))
+        self.prefetch_retry_seconds = 15  # Back-off after the groups list could not be loaded
+        self._recent_groups: 'OrderedDict[str, datetime]' = OrderedDict()  # group_id -> last requested
+        self._prefetch_requests = deque()  # [time.monotonic(), upstream requests] reserved/spent by the prefetcher
+        self._thread_requests = threading.local()  # Upstream requests made by the current thread
+        self._prefetcher_thread = None
+        self._prefetcher_pid = None
+        self._prefetch_event = threading.Event()
 
         # Statistics
         self.stats = {
@@ -70,7 +167,22 @@ class GroupedPoolCache:
             'total_pools_fetched': 0,
             'groups_loaded': 0,  # Number of groups with pools in cache
             'last_groups_fetch_duration': 0,
-            'last_pools_fetch_duration': 0
+            'last_pools_fetch_duration': 0,
+            'groups_not_modified': 0,
+            'pools_not_modified': 0,
+            'last_groups_transfer_duration': 0,
+            'last_groups_parse_duration': 0,
+            'last_pools_transfer_duration': 0,
+            'last_pools_parse_duration': 0,
+            'last_pools_load_groups': 0,  # Groups fetched by the last get_pools() call
+            'last_pools_load_duration': 0,  # Wall time of those (concurrent) fetches
+            'pools_cache_evictions': 0,  # LRU evictions (group count / byte budget)
+            'pools_cache_expirations': 0,  # Evicted after the retention window
+            'pools_cache_oversized': 0,  # Groups larger than the whole byte budget (not cached)
+            'upstream_requests': 0,  # HTTP requests made by completed fetches (all pages)
+            'prefetched_groups': 0,
+            'prefetch_failures': 0,
+            'prefetch_budget_waits': 0  # Times the prefetcher paused on the per-minute budget
         }
 
         logger.info(
@@ -78,7 +190,7 @@ class GroupedPoolCache:
             f"(min_group_tvl=${self.min_group_tvl}, min_pool_tvl=${self.min_pool_tvl})"
         )
 
-    def get_pools(self, force_refresh=False, limit=None) -> List[dict]:
+    def get_pools(self, force_refresh=False, limit=None) -> List[PoolRecord]:
         """
         Get aggregated pools from all active groups
 
@@ -87,8 +199,11 @@ class GroupedPoolCache:
             limit: Max number of groups to load pools from (for performance)
 
         Returns:
-            List of pool dictionaries
+            List of PoolRecord
         """
+        if self.prefetch_enabled:
+            self._ensure_prefetcher()
+
         # Step 1: Get filtered groups
         groups = self._get_groups(force_refresh=force_refresh)
 
@@ -99,11 +214,39 @@ class GroupedPoolCache:
         if limit:
             groups = groups[:limit]
 
-        # Step 3: Fetch pools for each group (lazy loading)
-        all_pools = []
+        # Step 3: Fetch pools for each group (lazy loading); groups that are
+        # not cached or stale load concurrently on the fetch workers
+        now = datetime.utcnow()
+        self._expire_group_pools(now)
+        if self.prefetch_enabled:
+            self._note_requested_groups(groups, now)
+        group_pools = []
+        to_load = []
         for group in groups:
             group_id = group['lexical_order_mints']
-            pools = self._get_group_pools(group_id, force_refresh=force_refresh)
+            pools = None if force_refresh else self._cached_group_pools(group_id, now)
+            group_pools.append(pools)
+            if pools is None:
+                to_load.append((len(group_pools) - 1, group_id))
+
+        if to_load:
+            load_start = time.perf_counter()
+            if len(to_load) == 1:
+                index, group_id = to_load[0]
+                group_pools[index] = self._get_group_pools(group_id, force_refresh=force_refresh)
+            else:
+                group_executor = self._get_executors()[0]
+                futures = [
+                    (index, group_executor.submit(self._get_group_pools, group_id, force_refresh))
+                    for index, group_id in to_load
+                ]
+                for index, future in futures:
+                    group_pools[index] = future.result()
+            self.stats['last_pools_load_groups'] = len(to_load)
+            self.stats['last_pools_load_duration'] = time.perf_counter() - load_start
+
+        all_pools = []
+        for pools in group_pools:
             if pools:
                 all_pools.extend(pools)
 
@@ -114,6 +257,21 @@ class GroupedPoolCache:
 
         return all_pools
 
+    def _get_executors(self) -> Tuple[ThreadPoolExecutor, ThreadPoolExecutor]:
+        """(group executor, page executor) for this process"""
+        pid = os.getpid()
+        if self._executors is not None and self._executors_pid == pid:
+            return self._executors
+
+        with self._executors_lock:
+            if self._executors is None or self._executors_pid != pid:
+                self._executors = (
+                    ThreadPoolExecutor(max_workers=self.fetch_workers, thread_name_prefix='group-fetch'),
+                    ThreadPoolExecutor(max_workers=self.page_workers, thread_name_prefix='group-page')
+                )
+                self._executors_pid = pid
+        return self._executors
+
     def _get_groups(self, force_refresh=False) -> List[dict]:
         """
         Get and filter token pair groups
@@ -130,8 +288,14 @@ class GroupedPoolCache:
             logger.info(f"Groups cache HIT (age: {cache_age}s, {len(self.groups_data)} groups)")
             return self.groups_data
 
-        # Fetch fresh groups
-        return self._fetch_fresh_groups(now)
+        # Fetch fresh groups (shared with concurrent callers)
+        self.stats['groups_cache_misses'] += 1
+        return self.refresh_coordinator.run(
+            GROUPS_KEY,
+            self._fetch_fresh_groups,
+            force=force_refresh,
+            cached=(lambda: self.groups_data) if self.groups_data is not None else None
+        )
 
     def _is_groups_cache_fresh(self, now) -> bool:
         """Check if groups cache is still fresh"""
@@ -141,84 +305,69 @@ class GroupedPoolCache:
         age_seconds = (now - self.groups_last_fetch).total_seconds()
         return age_seconds < self.groups_cache_duration
 
-    def _fetch_fresh_groups(self, now) -> List[dict]:
-        """Fetch and filter groups from /pair/groups API"""
-        with self.groups_fetch_lock:
-            # Double-check after acquiring lock
-            if self._is_groups_cache_fresh(now):
-                self.stats['groups_cache_hits'] += 1
+    def _fetch_fresh_groups(self) -> List[dict]:
+        """Fetch and filter groups from /pair/groups API (run by the refresh coordinator)"""
+        try:
+            logger.info("Groups cache MISS - Fetching from /pair/groups...")
+            fetch_start = datetime.utcnow()
+
+            # Fetch all groups with pagination (conditional if we have data)
+            all_groups, validators, timings = fetch_pages(
+                f'{METEORA_API_BASE}/pair/groups',
+                validators=self.groups_validators if self.groups_data is not None else None,
+                executor=self._get_executors()[1]
+            )
+            self.groups_validators = validators
+            self.groups_pages = _page_count(validators, timings)
+            self._count_requests(timings['requests'])
+            self.stats['last_groups_transfer_duration'] = timings['transfer']
+            self.stats['last_groups_parse_duration'] = timings['parse']
+
+            if all_groups is None:
+                self.groups_last_fetch = fetch_start
+                self.stats['groups_not_modified'] += 1
+                self.stats['last_groups_fetch_duration'] = (
+                    datetime.utcnow() - fetch_start
+                ).total_seconds()
+                logger.info(f"Groups not modified (304) - renewed {len(self.groups_data)} cached groups")
                 return self.groups_data
 
-            self.stats['groups_cache_misses'] += 1
-
-            try:
-                logger.info("Groups cache MISS - Fetching from /pair/groups...")
-                fetch_start = datetime.utcnow()
-
-                # Fetch all groups with pagination
-                all_groups = []
-                page = 1
-                page_size = 100
-
-                while True:
-                    response = requests.get(
-                        'https://dlmm-api.meteora.ag/pair/groups',
-                        params={'page': page, 'page_size': page_size},
-                        timeout=30
-                    )
-                    response.raise_for_status()
-
-                    data = response.json()
-                    groups = data.get('data', [])
+            logger.info(f"Fetched {timings['requests']} groups pages")
+            self.stats['total_groups_fetched'] = len(all_groups)
 
-                    if not groups:
-                        break
+            # Filter groups by minimum TVL
+            filtered_groups = self._filter_groups(all_groups)
 
-                    all_groups.extend(groups)
-
-                    # Check if we have more pages
-                    total_pages = data.get('pages', 1)
-                    if page >= total_pages:
-                        break
-
-                    page += 1
-                    logger.info(f"Fetched groups page {page}/{total_pages}...")
-
-                self.stats['total_groups_fetched'] = len(all_groups)
-
-                # Filter groups by minimum TVL
-                filtered_groups = self._filter_groups(all_groups)
+            # Sort by total TVL descending (most active first)
+            filtered_groups.sort(
+                key=lambda g: float(g.get('total_tvl', 0)),
+                reverse=True
+            )
 
-                # Sort by total TVL descending (most active first)
-                filtered_groups.sort(
-                    key=lambda g: float(g.get('total_tvl', 0)),
-                    reverse=True
-                )
+            self.groups_data = filtered_groups
+            self.groups_last_fetch = fetch_start
+            self.stats['total_groups_filtered'] = len(filtered_groups)
+            self.stats['last_groups_fetch_duration'] = (
+                datetime.utcnow() - fetch_start
+            ).total_seconds()
+
+            logger.info(
+                f"✅ Fetched and filtered groups: "
+                f"{self.stats['total_groups_fetched']} → {len(filtered_groups)} groups "
+                f"(took {self.stats['last_groups_fetch_duration']:.2f}s)"
+            )
 
-                self.groups_data = filtered_groups
-                self.groups_last_fetch = now
-                self.stats['total_groups_filtered'] = len(filtered_groups)
-                self.stats['last_groups_fetch_duration'] = (
-                    datetime.utcnow() - fetch_start
-                ).total_seconds()
+            return self.groups_data
 
-                logger.info(
-                    f"✅ Fetched and filtered groups: "
-                    f"{self.stats['total_groups_fetched']} → {len(filtered_groups)} groups "
-                    f"(took {self.stats['last_groups_fetch_duration']:.2f}s)"
-                )
+        except requests.RequestException as e:
+            logger.error(f"Failed to fetch groups: {e}")
 
+            # Return stale cache if available
+            if self.groups_data:
+                logger.warning("Returning stale groups cache")
                 return self.groups_data
 
-            except requests.RequestException as e:
-                logger.error(f"Failed to fetch groups: {e}")
-
-                # Return stale cache if available
-                if self.groups_data:
-                    logger.warning("Returning stale groups cache")
-                    return self.groups_data
-
-                raise
+            raise
 
     def _filter_groups(self, groups: List[dict]) -> List[dict]:
         """Filter groups by minimum total TVL"""
@@ -238,7 +387,7 @@ class GroupedPoolCache:
 
         return filtered
 
-    def _get_group_pools(self, group_id: str, force_refresh=False) -> List[dict]:
+    def _get_group_pools(self, group_id: str, force_refresh=False) -> List[PoolRecord]:
         """
         Get pools for a specific group (lazy loaded with caching)
 
@@ -247,105 +396,195 @@ class GroupedPoolCache:
             force_refresh: Force refresh of this group's pools
 
         Returns:
-            List of pool dictionaries for this group
+            List of PoolRecord for this group
         """
-        now = datetime.utcnow()
-
         # Check if pools are cached and fresh
-        if not force_refresh and group_id in self.pools_cache:
-            cache_entry = self.pools_cache[group_id]
-            age_seconds = (now - cache_entry['last_fetch']).total_seconds()
-
-            if age_seconds < self.pools_cache_duration:
-                self.stats['pools_cache_hits'] += 1
-                return cache_entry['data']
-
-        # Fetch fresh pools for this group
-        return self._fetch_group_pools(group_id, now)
-
-    def _fetch_group_pools(self, group_id: str, now) -> List[dict]:
-        """Fetch and filter pools for a specific group"""
-        # Get or create lock for this group
-        if group_id not in self.pools_fetch_locks:
-            self.pools_fetch_locks[group_id] = threading.Lock()
-
-        with self.pools_fetch_locks[group_id]:
-            # Double-check after acquiring lock
-            if group_id in self.pools_cache:
-                cache_entry = self.pools_cache[group_id]
-                age_seconds = (now - cache_entry['last_fetch']).total_seconds()
-
-                if age_seconds < self.pools_cache_duration:
-                    self.stats['pools_cache_hits'] += 1
-                    return cache_entry['data']
+        if not force_refresh:
+            pools = self._cached_group_pools(group_id, datetime.utcnow())
+            if pools is not None:
+                return pools
 
+        # Fetch fresh pools for this group (shared with concurrent callers)
+        with self._stats_lock:
             self.stats['pools_cache_misses'] += 1
+        cache_entry = self.pools_cache.get(group_id)
+        return self.refresh_coordinator.run(
+            _group_key(group_id),
+            lambda: self._fetch_group_pools(group_id),
+            force=force_refresh,
+            cached=(lambda: self.pools_cache.get(group_id, cache_entry)['data']) if cache_entry else None
+        )
 
-            try:
-                fetch_start = datetime.utcnow()
-
-                # Fetch all pools for this group with pagination
-                all_pools = []
-                page = 1
-                page_size = 100
-
-                while True:
-                    response = requests.get(
-                        f'https://dlmm-api.meteora.ag/pair/groups/{group_id}',
-                        params={'page': page, 'page_size': page_size},
-                        timeout=30
-                    )
-                    response.raise_for_status()
-
-                    data = response.json()
-                    pools = data.get('data', [])
-
-                    if not pools:
-                        break
-
-                    all_pools.extend(pools)
-
-                    # Check if we have more pages
-                    total_pages = data.get('pages', 1)
-                    if page >= total_pages:
-                        break
-
-                    page += 1
-
-                # Filter pools (hide, blacklisted, min TVL)
-                filtered_pools = self._filter_pools(all_pools)
+    def _adapt_group_ttl(self, cache_entry: dict, change: Optional[float], fetch_start: datetime,
+                         previous_fetch: Optional[datetime] = None):
+        """
+        Update a group's change rate and TTL from the change seen by a refetch
 
-                # Cache the result
-                self.pools_cache[group_id] = {
-                    'data': filtered_pools,
-                    'last_fetch': now
-                }
+        Args:
+            cache_entry: Entry to update (its last_fetch is the previous fetch
+                unless `previous_fetch` is given)
+            change: Largest relative change of the group's pools (0 for a 304,
+                None if no pool could be compared - rate is kept)
+            fetch_start: Start of the refetch
+        """
+        if self.group_ttl_policy is None or change is None:
+            return
+        elapsed = (fetch_start - (previous_fetch or cache_entry['last_fetch'])).total_seconds()
+        if elapsed <= 0:
+            return
+        cache_entry['change_rate'] = self.group_ttl_policy.update_rate(cache_entry['change_rate'], change, elapsed)
+        cache_entry['ttl'] = self.group_ttl_policy.ttl(cache_entry['change_rate'])
+
+    def _cached_group_pools(self, group_id: str, now: datetime) -> Optional[List[PoolRecord]]:
+        """Cached pools of a group if still fresh (counts a hit), else None"""
+        with self._pools_lock:
+            cache_entry = self.pools_cache.get(group_id)
+            if cache_entry is None:
+                return None
 
-                self.stats['total_pools_fetched'] += len(all_pools)
-                self.stats['groups_loaded'] = len(self.pools_cache)
+            age_seconds = (now - cache_entry['last_fetch']).total_seconds()
+            if age_seconds >= cache_entry['ttl']:
+                return None
+            self.pools_cache.move_to_end(group_id)
+
+        with self._stats_lock:
+            self.stats['pools_cache_hits'] += 1
+        return cache_entry['data']
+
+    def _store_group_pools(self, group_id: str, cache_entry: dict):
+        """Insert or renew a group entry, evicting least recently used groups over budget"""
+        evicted = []
+        with self._pools_lock:
+            previous = self.pools_cache.pop(group_id, None)
+            if previous is not None:
+                self.pools_cache_bytes -= previous['bytes']
+
+            if cache_entry['bytes'] > self.pools_cache_max_bytes:
+                self.stats['pools_cache_oversized'] += 1
+            else:
+                self.pools_cache[group_id] = cache_entry
+                self.pools_cache_bytes += cache_entry['bytes']
+
+            while self.pools_cache and (
+                len(self.pools_cache) > self.pools_cache_max_groups
+                or self.pools_cache_bytes > self.pools_cache_max_bytes
+            ):
+                evicted_id, evicted_entry = self.pools_cache.popitem(last=False)
+                self.pools_cache_bytes -= evicted_entry['bytes']
+                evicted.append(evicted_id)
+
+            self.stats['pools_cache_evictions'] += len(evicted)
+            self.stats['groups_loaded'] = len(self.pools_cache)
+
+        for evicted_id in evicted:
+            self.refresh_coordinator.forget(_group_key(evicted_id))
+
+    def _expire_group_pools(self, now: datetime):
+        """Evict groups not refreshed within the retention window (at most every EXPIRY_SWEEP_INTERVAL)"""
+        with self._pools_lock:
+            if (self._last_expiry_sweep is not None
+                    and (now - self._last_expiry_sweep).total_seconds() < EXPIRY_SWEEP_INTERVAL):
+                return
+            self._last_expiry_sweep = now
+
+            expired = [
+                group_id for group_id, cache_entry in self.pools_cache.items()
+                if (now - cache_entry['last_fetch']).total_seconds()
+                >= max(self.pools_cache_retention, 2 * cache_entry['ttl'])
+            ]
+            for group_id in expired:
+                self.pools_cache_bytes -= self.pools_cache.pop(group_id)['bytes']
+
+            self.stats['pools_cache_expirations'] += len(expired)
+            self.stats['groups_loaded'] = len(self.pools_cache)
+
+        for group_id in expired:
+            self.refresh_coordinator.forget(_group_key(group_id))
+        if expired:
+            logger.info(f"Evicted {len(expired)} expired groups from pools cache")
+
+    def _fetch_group_pools(self, group_id: str) -> List[PoolRecord]:
+        """Fetch and filter pools for a specific group (run by the refresh coordinator)"""
+        try:
+            fetch_start = datetime.utcnow()
+
+            # Fetch all pools for this group with pagination
+            # (conditional if the group is already cached)
+            cache_entry = self.pools_cache.get(group_id)
+            all_pools, validators, timings = fetch_pages(
+                f'{METEORA_API_BASE}/pair/groups/{group_id}',
+                validators=cache_entry.get('validators') if cache_entry else None,
+                executor=self._get_executors()[1]
+            )
+            self._count_requests(timings['requests'])
+            self.stats['last_pools_transfer_duration'] = timings['transfer']
+            self.stats['last_pools_parse_duration'] = timings['parse']
+
+            if all_pools is None:
+                self._adapt_group_ttl(cache_entry, 0.0, fetch_start)
+                cache_entry['last_fetch'] = fetch_start
+                cache_entry['validators'] = validators
+                cache_entry['pages'] = _page_count(validators, timings)
+                self._store_group_pools(group_id, cache_entry)
+                with self._stats_lock:
+                    self.stats['pools_not_modified'] += 1
                 self.stats['last_pools_fetch_duration'] = (
                     datetime.utcnow() - fetch_start
                 ).total_seconds()
+                return cache_entry['data']
 
-                logger.debug(
-                    f"Fetched group {group_id}: {len(all_pools)} → {len(filtered_pools)} pools "
-                    f"(took {self.stats['last_pools_fetch_duration']:.2f}s)"
+            # Filter pools (hide, blacklisted, min TVL)
+            filter_start = datetime.utcnow()
+            filtered_pools = self._filter_pools(all_pools)
+            self.stats['last_pools_parse_duration'] += (datetime.utcnow() - filter_start).total_seconds()
+
+            # Cache the result
+            new_entry = {
+                'data': filtered_pools,
+                'last_fetch': fetch_start,
+                'validators': validators,
+                'pages': _page_count(validators, timings),
+                'bytes': sys.getsizeof(filtered_pools) + sum(pool.nbytes() for pool in filtered_pools),
+                'ttl': self.pools_cache_duration,
+                'change_rate': None
+            }
+            if cache_entry is not None:
+                new_entry['ttl'] = cache_entry['ttl']
+                new_entry['change_rate'] = cache_entry['change_rate']
+                self._adapt_group_ttl(
+                    new_entry,
+                    records_change(cache_entry['data'], filtered_pools),
+                    fetch_start,
+                    previous_fetch=cache_entry['last_fetch']
                 )
+            self._store_group_pools(group_id, new_entry)
 
-                return filtered_pools
+            with self._stats_lock:
+                self.stats['total_pools_fetched'] += len(all_pools)
+            self.stats['last_pools_fetch_duration'] = (
+                datetime.utcnow() - fetch_start
+            ).total_seconds()
 
-            except requests.RequestException as e:
-                logger.error(f"Failed to fetch pools for group {group_id}: {e}")
+            logger.debug(
+                f"Fetched group {group_id}: {len(all_pools)} → {len(filtered_pools)} pools "
+                f"(took {self.stats['last_pools_fetch_duration']:.2f}s)"
+            )
+
+            return filtered_pools
 
-                # Return stale cache if available
-                if group_id in self.pools_cache:
-                    logger.warning(f"Returning stale cache for group {group_id}")
-                    return self.pools_cache[group_id]['data']
+        except requests.RequestException as e:
+            logger.error(f"Failed to fetch pools for group {group_id}: {e}")
 
-                return []
+            # Return stale cache if available
+            cache_entry = self.pools_cache.get(group_id)
+            if cache_entry is not None:
+                logger.warning(f"Returning stale cache for group {group_id}")
+                return cache_entry['data']
 
-    def _filter_pools(self, pools: List[dict]) -> List[dict]:
-        """Filter pools by hide, blacklist, and min TVL"""
+            return []
+
+    def _filter_pools(self, pools: List[dict]) -> List[PoolRecord]:
+        """Filter pools by hide, blacklist, and min TVL (survivors become PoolRecords)"""
         if not pools:
             return []
 
@@ -367,10 +606,182 @@ class GroupedPoolCache:
             except (ValueError, TypeError):
                 continue
 
-            filtered.append(pool)
+            filtered.append(PoolRecord.from_api(pool))
 
         return filtered
 
+    def _count_requests(self, count: int):
+        """Record upstream requests made by a fetch on this thread"""
+        with self._stats_lock:
+            self.stats['upstream_requests'] += count
+        self._thread_requests.count = self._requests_on_thread() + count
+
+    def _requests_on_thread(self) -> int:
+        """Upstream requests made so far by fetches run on this thread"""
+        return getattr(self._thread_requests, 'count', 0)
+
+    def _reserve_prefetch(self, pages: int) -> list:
+        """Take `pages` requests from the budget before a fetch starts"""
+        reservation = [time.monotonic(), pages]
+        self._prefetch_requests.append(reservation)
+        return reservation
+
+    def _settle_prefetch(self, reservation: list, requests_before: int):
+        """
+        Replace a reservation with the requests this thread actually made
+        since `requests_before` (at least one): unused pages are released,
+        a fetch that needed more pages than expected is charged in full
+        """
+        reservation[1] = max(self._requests_on_thread() - requests_before, 1)
+
+    def _note_requested_groups(self, groups: List[dict], now: datetime):
+        """Remember the groups a request asked for (prefetch candidates)"""
+        with self._pools_lock:
+            for group in groups:
+                group_id = group['lexical_order_mints']
+                self._recent_groups[group_id] = now
+                self._recent_groups.move_to_end(group_id)
+            while len(self._recent_groups) > self.pools_cache_max_groups:
+                self._recent_groups.popitem(last=False)
+
+    def _ensure_prefetcher(self):
+        """Start the background prefetch thread for this process if needed"""
+        pid = os.getpid()
+        if self._prefetcher_pid == pid and self._prefetcher_thread and self._prefetcher_thread.is_alive():
+            return
+
+        with self._executors_lock:
+            if self._prefetcher_pid == pid and self._prefetcher_thread and self._prefetcher_thread.is_alive():
+                return
+
+            self._prefetcher_thread = threading.Thread(
+                target=self._prefetch_loop,
+                name='grouped-cache-prefetcher',
+                daemon=True
+            )
+            self._prefetcher_pid = pid
+            self._prefetcher_thread.start()
+            logger.info(f"Group prefetcher started (pid {pid})")
+
+    def _prefetch_candidates(self, groups: List[dict], now: datetime) -> List[str]:
+        """
+        Groups to keep warm: top groups by TVL, then recently requested ones
+        (most recent first), capped at what the pools cache can hold
+        """
+        candidates = OrderedDict.fromkeys(
+            group['lexical_order_mints'] for group in groups[:self.prefetch_top_groups]
+        )
+        with self._pools_lock:
+            while self._recent_groups:
+                group_id, requested_at = next(iter(self._recent_groups.items()))
+                if (now - requested_at).total_seconds() < self.prefetch_recent_seconds:
+                    break
+                self._recent_groups.popitem(last=False)
+            recent = list(reversed(self._recent_groups))
+
+        for group_id in recent:
+            candidates.setdefault(group_id)
+        return list(candidates)[:self.pools_cache_max_groups]
+
+    def _prefetch_budget_left(self) -> int:
+        """Upstream requests the prefetcher may still make in the current minute"""
+        cutoff = time.monotonic() - 60
+        while self._prefetch_requests and self._prefetch_requests[0][0] <= cutoff:
+            self._prefetch_requests.popleft()
+        return self.prefetch_budget_per_minute - sum(count for _, count in self._prefetch_requests)
+
+    def _budget_needed(self, pages: int) -> int:
+        """Budget that must be left to start a fetch of `pages` (capped so huge resources still run)"""
+        return max(min(pages, self.prefetch_budget_per_minute), 1)
+
+    def _seconds_until_budget(self) -> float:
+        """Seconds until the oldest spent request leaves the one-minute window"""
+        if not self._prefetch_requests:
+            return 0
+        return max(self._prefetch_requests[0][0] + 60 - time.monotonic(), 0)
+
+    def _prefetch_group(self, group_id: str, pages: int) -> bool:
+        """Refresh one group ahead of its TTL (True if it was renewed)"""
+        cache_entry = self.pools_cache.get(group_id)
+        last_fetch = cache_entry['last_fetch'] if cache_entry else None
+        reservation = self._reserve_prefetch(pages)
+        requests_before = self._requests_on_thread()
+        try:
+            self.refresh_coordinator.run(
+                _group_key(group_id),
+                lambda: self._fetch_group_pools(group_id),
+                cached=(lambda: self.pools_cache.get(group_id, cache_entry)['data']) if cache_entry else None
+            )
+        except Exception as e:
+            logger.error(f"Prefetch of group {group_id} failed: {e}")
+
+        # Only requests made on this thread count (joining a request
+        # thread's fetch is charged as one, like a failed fetch)
+        self._settle_prefetch(reservation, requests_before)
+
+        cache_entry = self.pools_cache.get(group_id)
+        renewed = cache_entry is not None and cache_entry['last_fetch'] != last_fetch
+        with self._stats_lock:
+            self.stats['prefetched_groups' if renewed else 'prefetch_failures'] += 1
+        return renewed
+
+    def _prefetch_once(self) -> float:
+        """
+        Refresh every candidate group that is due, within the budget
+
+        Returns:
+            float: Seconds until the next group comes due (or budget frees up)
+        """
+        now = datetime.utcnow()
+        groups_pages = self.groups_pages or 1
+        if not self._is_groups_cache_fresh(now) and self._prefetch_budget_left() >= self._budget_needed(groups_pages):
+            reservation = self._reserve_prefetch(groups_pages)
+            requests_before = self._requests_on_thread()
+            try:
+                self._get_groups()
+            except Exception as e:
+                logger.error(f"Prefetch could not load the groups list: {e}")
+            self._settle_prefetch(reservation, requests_before)
+
+        groups = self.groups_data
+        if not groups:
+            return self.prefetch_retry_seconds
+        next_due = PREFETCH_MAX_SLEEP
+
+        for group_id in self._prefetch_candidates(groups, now):
+            cache_entry = self.pools_cache.get(group_id)
+            if cache_entry is not None:
+                refresh_at = max(cache_entry['ttl'] - self.prefetch_ahead_seconds, 1)
+                due_in = refresh_at - (datetime.utcnow() - cache_entry['last_fetch']).total_seconds()
+                if due_in > 0:
+                    next_due = min(next_due, due_in)
+                    continue
+
+            # Reserve the pages this group took last time (1 if never fetched)
+            pages = cache_entry.get('pages', 1) if cache_entry else 1
+            if self._prefetch_budget_left() < self._budget_needed(pages):
+                self.stats['prefetch_budget_waits'] += 1
+                return max(self._seconds_until_budget(), 1)
+
+            delay = self.refresh_coordinator.seconds_until_allowed(_group_key(group_id))
+            if delay > 0:
+                next_due = min(next_due, delay)
+                continue
+            self._prefetch_group(group_id, pages)
+
+        return max(next_due, 1)
+
+    def _prefetch_loop(self):
+        """Keep the candidate groups renewed ahead of their TTL"""
+        while True:
+            try:
+                wait_seconds = self._prefetch_once()
+            except Exception as e:
+                logger.error(f"Group prefetch failed: {e}")
+                wait_seconds = self.prefetch_retry_seconds
+            self._prefetch_event.wait(timeout=wait_seconds)
+            self._prefetch_event.clear()
+
     def get_stats(self) -> dict:
         """Get cache statistics"""
         total_groups_requests = (
@@ -391,10 +802,23 @@ class GroupedPoolCache:
 
         return {
             **self.stats,
+            **self.refresh_coordinator.get_stats(),
             'total_groups_requests': total_groups_requests,
             'groups_hit_rate_percent': round(groups_hit_rate, 2),
             'total_pools_requests': total_pools_requests,
             'pools_hit_rate_percent': round(pools_hit_rate, 2),
+            'pools_cache_bytes': self.pools_cache_bytes,
+            'pools_cache_max_bytes': self.pools_cache_max_bytes,
+            'pools_cache_max_groups': self.pools_cache_max_groups,
+            'pools_cache_retention_seconds': self.pools_cache_retention,
+            'adaptive_ttl': self._adaptive_ttl_stats(),
+            'prefetch_enabled': self.prefetch_enabled,
+            'prefetch_recent_groups': len(self._recent_groups),
+            'prefetch_budget_per_minute': self.prefetch_budget_per_minute,
+            'prefetch_requests_last_minute': sum(
+                count for at, count in list(self._prefetch_requests)
+                if at > time.monotonic() - 60
+            ),
             'groups_cache_fresh': self._is_groups_cache_fresh(datetime.utcnow()),
             'groups_cache_age_seconds': (
                 (datetime.utcnow() - self.groups_last_fetch).total_seconds()
@@ -402,6 +826,20 @@ class GroupedPoolCache:
             )
         }
 
+    def _adaptive_ttl_stats(self) -> Optional[dict]:
+        """Per-group TTL distribution (None when adaptive TTLs are off)"""
+        policy = self.group_ttl_policy
+        if policy is None:
+            return None
+        with self._pools_lock:
+            ttls = [cache_entry['ttl'] for cache_entry in self.pools_cache.values()]
+        return {
+            'min_ttl_seconds': policy.min_seconds,
+            'max_ttl_seconds': policy.max_seconds,
+            'tolerance': policy.tolerance,
+            'group_ttls': ttl_distribution(ttls, policy.min_seconds, policy.max_seconds)
+        }
+
     def invalidate_groups(self):
         """Manually invalidate groups cache"""
         logger.info("Groups cache invalidated")
@@ -410,12 +848,22 @@ class GroupedPoolCache:
 
     def invalidate_group_pools(self, group_id: str = None):
         """Manually invalidate pools cache for a group or all groups"""
+        with self._pools_lock:
+            if group_id:
+                removed = [group_id] if group_id in self.pools_cache else []
+            else:
+                removed = list(self.pools_cache)
+            for removed_id in removed:
+                self.pools_cache_bytes -= self.pools_cache.pop(removed_id)['bytes']
+            self.stats['groups_loaded'] = len(self.pools_cache)
+
+        for removed_id in removed:
+            self.refresh_coordinator.forget(_group_key(removed_id))
+
         if group_id:
-            if group_id in self.pools_cache:
-                del self.pools_cache[group_id]
+            if removed:
                 logger.info(f"Pools cache invalidated for group {group_id}")
         else:
-            self.pools_cache.clear()
             logger.info("All pools cache invalidated")
 
     def invalidate_all(self):
@@ -429,7 +877,7 @@ grouped_pool_cache = GroupedPoolCache()
 
 
 # Convenience function
-def get_grouped_cached_pools(force_refresh=False, limit=None) -> List[dict]:
+def get_grouped_cached_pools(force_refresh=False, limit=None) -> List[PoolRecord]:
     """
     Get pool data from grouped cache
 
@@ -438,6 +886,6 @@ def get_grouped_cached_pools(force_refresh=False, limit=None) -> List[dict]:
         limit: Max number of groups to load (for performance)
 
     Returns:
-        List of pool data
+        List of PoolRecord
     """
     return grouped_pool_cache.get_pools(force_refresh=force_refresh, limit=limit)
@@ -0,0 +1,185 @@
+"""
+Meteora HTTP Client
+Shared pooled session for upstream fetches: keeps TCP/TLS connections alive
+between refreshes, negotiates compressed bodies and sends conditional
+request validators (ETag / Last-Modified) so unchanged data costs a 304
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Executor
+from typing import List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+logger = logging.getLogger(__name__)
+
+# Overridable for local stand-ins (see benchmarks/fake_meteora_api.py)
+METEORA_API_BASE = os.getenv('METEORA_API_BASE', 'https://dlmm-api.meteora.ag').rstrip('/')
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Process-wide pooled session
+
+    Recreated after fork (e.g. gunicorn --preload) so workers never share
+    sockets with the parent.
+    """
+    global _session, _session_pid
+
+    pid = os.getpid()
+    if _session is not None and _session_pid == pid:
+        return _session
+
+    with _session_lock:
+        if _session is None or _session_pid != pid:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            # gzip/deflate (+ br/zstd when the decoders are installed)
+            session.headers.update(make_headers(accept_encoding=True))
+            _session = session
+            _session_pid = pid
+    return _session
+
+
+def conditional_headers(validators: Optional[dict]) -> dict:
+    """If-None-Match / If-Modified-Since headers for stored validators"""
+    headers = {}
+    if validators:
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+    return headers
+
+
+def response_validators(response) -> Optional[dict]:
+    """Validators to send on the next request (None if the server gave none)"""
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if not etag and not last_modified:
+        return None
+    return {'etag': etag, 'last_modified': last_modified}
+
+
+def fetch_pages(url: str, validators: Optional[List[dict]] = None, page_size: int = 100, timeout: int = 30,
+                executor: Optional[Executor] = None):
+    """
+    Fetch every page of a paginated Meteora endpoint ({data, pages} bodies)
+
+    The first page gives the page count (or the stored validators do, when
+    it answers 304); the rest are requested together, so with an executor a
+    multi-page fetch costs about two round trips instead of one per page.
+
+    With validators from the previous call, each page is requested
+    conditionally; if every page answers 304 the data is unchanged and no
+    body is transferred. If some pages changed while others answered 304,
+    the fetch restarts unconditionally (the 304 pages sent no body).
+
+    Args:
+        url: Endpoint URL
+        validators: Per-page validators returned by the previous call
+        page_size: Items per page
+        timeout: Per-request timeout in seconds
+        executor: Fetch the pages after the first one concurrently on this
+            executor (default: one after another on the calling thread)
+
+    Returns:
+        tuple: (items or None if unchanged, per-page validators,
+                {'transfer': seconds, 'parse': seconds, 'requests': count})
+        'transfer' is the summed duration of all requests, so with an
+        executor it can exceed the wall time.
+    """
+    session = get_session()
+    timings = {'transfer': 0.0, 'parse': 0.0, 'requests': 0}
+    conditional = bool(validators)
+
+    first, seconds = _get_page(session, url, 1, page_size, validators[0] if conditional else None, timeout)
+    timings['transfer'] += seconds
+    timings['requests'] += 1
+
+    if first.status_code == 304 and conditional:
+        total_pages = len(validators)
+        bodies = [None]
+    else:
+        first.raise_for_status()
+        conditional = False
+        parse_start = time.perf_counter()
+        body = first.json()
+        timings['parse'] += time.perf_counter() - parse_start
+        total_pages = body.get('pages', 1) if body.get('data') else 1
+        bodies = [body]
+
+    responses = [first]
+    for response, seconds in _get_pages(
+        session, url, range(2, total_pages + 1), page_size,
+        validators if conditional else None, timeout, executor
+    ):
+        timings['transfer'] += seconds
+        timings['requests'] += 1
+        responses.append(response)
+
+    if conditional:
+        if all(response.status_code == 304 for response in responses):
+            return None, validators[:total_pages], timings
+
+        # Some pages changed, but the unchanged ones sent no body
+        items, new_validators, retry_timings = fetch_pages(url, None, page_size, timeout, executor)
+        for name, value in retry_timings.items():
+            timings[name] += value
+        return items, new_validators, timings
+
+    items = []
+    new_validators = []
+    for page, response in enumerate(responses, start=1):
+        if page > 1:
+            response.raise_for_status()
+            parse_start = time.perf_counter()
+            bodies.append(response.json())
+            timings['parse'] += time.perf_counter() - parse_start
+
+        new_validators.append(response_validators(response))
+        page_items = bodies[-1].get('data', [])
+        if not page_items:
+            break
+        items.extend(page_items)
+
+    # Conditional requests only pay off if every page had validators
+    if not all(new_validators):
+        new_validators = None
+    return items, new_validators, timings
+
+
+def _get_page(session, url: str, page: int, page_size: int, page_validators: Optional[dict], timeout: int):
+    """Request one page; returns (response, seconds)"""
+    start = time.perf_counter()
+    response = session.get(
+        url,
+        params={'page': page, 'page_size': page_size},
+        headers=conditional_headers(page_validators),
+        timeout=timeout
+    )
+    return response, time.perf_counter() - start
+
+
+def _get_pages(session, url: str, pages, page_size: int, validators: Optional[List[dict]], timeout: int,
+               executor: Optional[Executor]) -> list:
+    """(response, seconds) per page, in page order - concurrently if an executor is given"""
+    requests_args = [
+        (session, url, page, page_size, validators[page - 1] if validators else None, timeout)
+        for page in pages
+    ]
+    if executor is None:
+        return [_get_page(*args) for args in requests_args]
+    futures = [executor.submit(_get_page, *args) for args in requests_args]
+    return [future.result() for future in futures]
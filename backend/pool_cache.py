@@ -4,18 +4,170 @@ Prevents redundant API calls to Meteora by caching pool data
 Critical for scalability with multiple concurrent users
 """
 
+import codecs
+import json
 import logging
+import os
+import re
 import requests
+import tempfile
 import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from meteora_http import METEORA_API_BASE, conditional_headers, get_session, response_validators
+from pool_history import PoolHistory
+from pool_record import PoolRecord
+from pool_snapshot import PoolSnapshot
+from adaptive_ttl import AdaptiveTTL, PoolChangeTracker
+from pool_metrics import FEE_RATE_MIN_TVL
+from refresh_coordinator import RefreshCoordinator
+from shared_snapshot import SharedSnapshotChannel
+from snapshot_delta import DeltaLog, compute_delta
+from snapshot_store import read_snapshot, write_snapshot
 
 logger = logging.getLogger(__name__)
 
+# Chunk size for streaming the /pair/all response body
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Refresh coordinator key for the /pair/all download
+PAIR_ALL_KEY = 'pair/all'
+
+# Columns whose movement drives the adaptive soft TTL: what the pair list
+# shows and ranks on a refresh (fees_min_30 feeds fee_rate_30min, the
+# trending rank, and the degen alerts)
+ADAPTIVE_TTL_FIELDS = ('current_price', 'liquidity', 'fees_min_30', 'fees_hour_24', 'volume_hour_24')
+
+_WHITESPACE = re.compile(r'\s*')
+
+
+def iter_json_array(chunks):
+    """
+    Incrementally decode a top-level JSON array from byte chunks
+
+    Yields one element at a time, so only the current chunk and the element
+    being decoded are held in memory - never the whole body or the whole
+    decoded list.
+
+    Args:
+        chunks: Iterable of bytes (e.g. response.iter_content())
+
+    Raises:
+        ValueError: Body is not a JSON array or ends before the closing bracket
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    pos = 0
+    started = False
+
+    for chunk in chunks:
+        buffer = buffer[pos:] + text_decoder.decode(chunk)
+        pos = 0
+
+        while True:
+            pos = _WHITESPACE.match(buffer, pos).end()
+            if pos >= len(buffer):
+                break
+
+            if not started:
+                if buffer[pos] != '[':
+                    raise ValueError("Expected a JSON array from /pair/all")
+                started = True
+                pos += 1
+                continue
+
+            char = buffer[pos]
+            if char == ',':
+                pos += 1
+                continue
+            if char == ']':
+                return
+
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Element continues in the next chunk
+                break
+
+            if end == len(buffer) and not isinstance(item, (dict, list)):
+                # A scalar at the buffer edge may be cut off (e.g. "12" of "123")
+                break
+
+            yield item
+            pos = end
+
+    raise ValueError("Truncated JSON array from /pair/all")
+
+
+def _timed_chunks(chunks, timings):
+    """Pass chunks through, adding time spent waiting on them to timings['transfer']"""
+    iterator = iter(chunks)
+    while True:
+        start = time.perf_counter()
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            timings['transfer'] += time.perf_counter() - start
+            return
+        timings['transfer'] += time.perf_counter() - start
+        yield chunk
+
 
 class PoolDataCache:
     """
     Singleton cache for Meteora pool data
     Fetches once and shares across all monitoring checks
+
+    Freshness is governed by a soft/hard TTL pair:
+    - age < soft TTL: snapshot is fresh and returned as-is
+    - soft TTL <= age < hard TTL: snapshot is returned immediately (stale hit)
+      and the background refresher is woken up to renew it
+    - age >= hard TTL (or no snapshot): the caller blocks on a fetch
+
+    With background refresh enabled, a daemon thread renews the snapshot
+    `refresh_ahead_seconds` before the soft TTL runs out, so readers normally
+    never wait on the /pair/all download.
+
+    Every accepted snapshot is also written to `snapshot_path`. On startup
+    that file is loaded and served as stale-but-usable until the first real
+    refresh completes, so a new process answers immediately and survives a
+    Meteora outage. Across deploys this only works if the path is on
+    persistent storage (e.g. a Railway volume) - the temp-dir default is
+    wiped with the container.
+
+    With `POOL_CACHE_SHARED_DIR` set, processes (e.g. gunicorn workers) share
+    one snapshot: whichever process holds the refresh lock fetches from
+    Meteora and publishes into the shared directory, all others map the
+    published file read-only and never call the upstream themselves. Each
+    accepted snapshot gets a new `generation` number.
+
+    Fetches go through the shared pooled session (meteora_http.py) with the
+    ETag/Last-Modified validators of the current snapshot; a 304 answer just
+    renews the current snapshot's TTL. All downloads (request threads,
+    forced refreshes and the refresher) go through one RefreshCoordinator:
+    concurrent callers share a single in-flight fetch and a new one starts
+    at most every `POOL_CACHE_MIN_FETCH_INTERVAL` seconds.
+
+    Every accepted snapshot is diffed against the one it replaces (see
+    snapshot_delta.py); get_changes() merges the recent deltas so clients
+    can catch up from an older generation without reloading everything.
+    Callbacks registered with add_snapshot_listener() run after every new
+    generation is swapped in; `history` (pool_history.py) is one of them and
+    keeps the last `POOL_HISTORY_DEPTH` values of each pool's metrics.
+
+    The last few snapshots stay reachable by generation (get_snapshot_at()),
+    so a paging cursor keeps reading the snapshot it started on across
+    refreshes.
+
+    With `POOL_CACHE_ADAPTIVE_TTL` on, the soft TTL follows how fast pools
+    actually change (adaptive_ttl.py): every fetch updates a per-pool change
+    rate over ADAPTIVE_TTL_FIELDS, and the soft TTL becomes the
+    `POOL_CACHE_TTL_PERCENTILE`-th (default 10th) lowest per-pool TTL, so it
+    follows the busiest pools rather than the quiet majority. It stays
+    between `POOL_CACHE_SOFT_TTL` and `POOL_CACHE_MAX_TTL`; the max defaults
+    to the soft TTL, so the TTL only lengthens when an operator raises it.
     """
 
     _instance = None
@@ -31,10 +183,84 @@ class PoolDataCache:
 
     def _initialize(self):
         """Initialize cache state"""
-        self.pools_data = None
+        self.snapshot = None  # Columnar pool data, rebuilt per refresh
         self.last_fetch = None
-        self.cache_duration_seconds = 60  # 1 minute
-        self.fetch_lock = threading.Lock()
+        self.generation = 0  # Incremented for every accepted snapshot
+        self._validators = None  # ETag/Last-Modified of the current snapshot
+
+        # Delta history: relative change below epsilon is not reported
+        self.delta_epsilon = float(os.getenv('POOL_CACHE_DELTA_EPSILON', 0.001))
+        self.deltas = DeltaLog(max_deltas=int(os.getenv('POOL_CACHE_DELTA_HISTORY', 60)))
+        self._listeners = []  # Called with each newly accepted snapshot
+
+        # Recent snapshots by generation (current one included) for cursors
+        self.snapshot_history_size = max(int(os.getenv('POOL_CACHE_SNAPSHOT_HISTORY', 3)), 1)
+        self._recent_snapshots = OrderedDict()
+
+        # Per-pool metric ring buffers, one point per accepted snapshot (0 disables)
+        history_depth = int(os.getenv('POOL_HISTORY_DEPTH', 30))
+        self.history = PoolHistory(depth=history_depth) if history_depth > 0 else None
+        if self.history is not None:
+            self.add_snapshot_listener(lambda snapshot: self.history.append(snapshot, timestamp=self.last_fetch))
+
+        # One /pair/all download at a time, at most one per interval (even forced)
+        self.refresh_coordinator = RefreshCoordinator(
+            min_interval_seconds=float(os.getenv('POOL_CACHE_MIN_FETCH_INTERVAL', 10))
+        )
+
+        # Freshness configuration (see class docstring)
+        self.soft_ttl_seconds = int(os.getenv('POOL_CACHE_SOFT_TTL', 60))  # 1 minute
+        self.hard_ttl_seconds = int(os.getenv('POOL_CACHE_HARD_TTL', 600))  # 10 minutes
+        self.refresh_ahead_seconds = int(os.getenv('POOL_CACHE_REFRESH_AHEAD', 10))
+        self.refresh_retry_seconds = 15  # Back-off after a failed background refresh
+        self.background_refresh = os.getenv('POOL_CACHE_BACKGROUND_REFRESH', 'true').lower() == 'true'
+
+        # Adaptive soft TTL: POOL_CACHE_SOFT_TTL is the floor, quiet markets
+        # stretch it up to POOL_CACHE_MAX_TTL (never more /pair/all downloads
+        # than with the fixed TTL). The max defaults to the floor - opt in by
+        # raising POOL_CACHE_MAX_TTL
+        self.change_tracker = None
+        if os.getenv('POOL_CACHE_ADAPTIVE_TTL', 'true').lower() == 'true':
+            self.change_tracker = PoolChangeTracker(
+                AdaptiveTTL(
+                    min_seconds=self.soft_ttl_seconds,
+                    max_seconds=min(int(os.getenv('POOL_CACHE_MAX_TTL', self.soft_ttl_seconds)), self.hard_ttl_seconds),
+                    tolerance=float(os.getenv('POOL_CACHE_TTL_TOLERANCE', 0.05))
+                ),
+                percentile=float(os.getenv('POOL_CACHE_TTL_PERCENTILE', 10)),
+                min_liquidity=FEE_RATE_MIN_TVL,
+                fields=ADAPTIVE_TTL_FIELDS
+            )
+
+        # Background refresher state (thread is started lazily per process,
+        # so it also comes up in gunicorn workers forked after --preload)
+        self._refresher_thread = None
+        self._refresher_pid = None
+        self._refresh_event = threading.Event()
+
+        # On-disk snapshot for warm starts ('' disables persistence). The temp
+        # dir only survives worker restarts, not redeploys; on Railway the
+        # default follows an attached volume (RAILWAY_VOLUME_MOUNT_PATH)
+        self.snapshot_path = os.getenv(
+            'POOL_CACHE_SNAPSHOT_PATH',
+            os.path.join(
+                os.getenv('RAILWAY_VOLUME_MOUNT_PATH') or tempfile.gettempdir(),
+                'meteora_pool_snapshot.bin'
+            )
+        )
+        self.snapshot_max_age_seconds = int(os.getenv('POOL_CACHE_SNAPSHOT_MAX_AGE', 86400))  # 1 day
+        self.warm_started = False  # Serving the on-disk snapshot until the first fetch
+
+        # Cross-process sharing ('' disables): one process refreshes and
+        # publishes, the others follow (see class docstring)
+        self.shared_dir = os.getenv('POOL_CACHE_SHARED_DIR', '')
+        self.shared_poll_seconds = float(os.getenv('POOL_CACHE_SHARED_POLL', 1))
+        self.shared_wait_seconds = 30  # Max wait for the owner's first publish / forced refresh
+        self.shared = SharedSnapshotChannel(self.shared_dir) if self.shared_dir else None
+        self._shared_lock = threading.Lock()
+        if self.shared is not None and not self.background_refresh:
+            logger.warning("POOL_CACHE_SHARED_DIR requires the background refresher - enabling it")
+            self.background_refresh = True
 
         # Filtering configuration
         self.min_tvl = 100  # Minimum TVL in USD to include pool (filters trash pools)
@@ -44,16 +270,45 @@ class PoolDataCache:
         self.stats = {
             'cache_hits': 0,
             'cache_misses': 0,
+            'stale_hits': 0,
+            'background_refreshes': 0,
+            'background_refresh_failures': 0,
             'total_pools_raw': 0,  # Before filtering
             'total_pools_filtered': 0,  # After filtering
             'pools_filtered_out': 0,
             'hidden_filtered': 0,
             'blacklisted_filtered': 0,
             'low_tvl_filtered': 0,
-            'last_fetch_duration': 0
+            'last_fetch_duration': 0,
+            'last_transfer_duration': 0,  # Waiting on / decompressing the body
+            'last_parse_duration': 0,  # Decoding + filtering (overlaps the transfer)
+            'last_bytes_received': 0,  # On the wire (compressed)
+            'last_content_encoding': None,
+            'not_modified_responses': 0,
+            'last_snapshot_build_duration': 0,
+            'last_snapshot_write_duration': 0,
+            'snapshot_write_failures': 0,
+            'warm_start_pools': 0,
+            'shared_publishes': 0,
+            'shared_remaps': 0,
+            'shared_refresh_requests': 0,
+            'last_delta_added': 0,
+            'last_delta_changed': 0,
+            'last_delta_removed': 0,
+            'last_delta_duration': 0
         }
-        logger.info("PoolDataCache initialized (min_tvl=$%.2f, filter_hidden=%s, filter_blacklisted=%s)",
-                   self.min_tvl, self.filter_hidden, self.filter_blacklisted)
+        logger.info("PoolDataCache initialized (min_tvl=$%.2f, filter_hidden=%s, filter_blacklisted=%s, "
+                   "soft_ttl=%ss, hard_ttl=%ss, background_refresh=%s)",
+                   self.min_tvl, self.filter_hidden, self.filter_blacklisted,
+                   self.soft_ttl_seconds, self.hard_ttl_seconds, self.background_refresh)
+
+        if self.snapshot_path:
+            self._load_persisted_snapshot()
+
+    @property
+    def pools_data(self):
+        """Cached PoolRecord list (None if nothing is cached)"""
+        return self.snapshot.pools if self.snapshot is not None else None
 
     def get_pools(self, force_refresh=False):
         """
@@ -63,27 +318,345 @@ class PoolDataCache:
             force_refresh: Force a fresh fetch even if cache is valid
 
         Returns:
-            list: Pool data from Meteora API
+            list: PoolRecord list built from Meteora API data
+        """
+        return self._get_snapshot(force_refresh=force_refresh).pools
+
+    def get_snapshot(self, force_refresh=False):
         """
+        Get the columnar snapshot of the cached pools
+
+        Same freshness rules as get_pools(); the snapshot is built once per
+        refresh, so this is as cheap as a cache hit.
+
+        Returns:
+            PoolSnapshot: Columnar pool data
+        """
+        return self._get_snapshot(force_refresh=force_refresh)
+
+    def _get_snapshot(self, force_refresh=False):
+        """Return the current snapshot, fetching if missing or past hard TTL"""
         now = datetime.utcnow()
 
+        if self.background_refresh:
+            self._ensure_refresher()
+
+        # Another process owns the refresh - serve what it published
+        if self.shared is not None and not self.shared.is_owner:
+            return self._get_shared_snapshot(now, force_refresh=force_refresh)
+
         # Check if cache is fresh (unless forced refresh)
         if not force_refresh and self._is_cache_fresh(now):
             self.stats['cache_hits'] += 1
             cache_age = (now - self.last_fetch).seconds
-            logger.info(f"Cache HIT - Returning {len(self.pools_data)} cached pools (age: {cache_age}s)")
-            return self.pools_data
+            logger.info(f"Cache HIT - Returning {len(self.snapshot)} cached pools (age: {cache_age}s)")
+            return self.snapshot
+
+        # Stale but still usable - serve it and let the refresher renew it
+        if not force_refresh and self.background_refresh and self._is_cache_usable(now):
+            self.stats['stale_hits'] += 1
+            cache_age = (now - self.last_fetch).seconds
+            logger.info(f"Cache STALE HIT - Returning {len(self.snapshot)} cached pools (age: {cache_age}s), refresh scheduled")
+            self._refresh_event.set()
+            return self.snapshot
 
         # Need to fetch fresh data
-        return self._fetch_fresh_data(now)
+        return self._fetch_fresh_data(force=force_refresh)
+
+    def _get_shared_snapshot(self, now, force_refresh=False):
+        """
+        Serve the snapshot published by the owner process
+
+        Followers serve the published snapshot whatever its age - keeping it
+        fresh is the owner's job. A forced refresh is forwarded to the owner
+        and waited for (bounded by shared_wait_seconds).
+        """
+        previous_fetch = self.last_fetch
+        if force_refresh:
+            self.stats['shared_refresh_requests'] += 1
+            self.shared.request_refresh()
+        else:
+            self._sync_shared()
+
+        if force_refresh or self.snapshot is None:
+            deadline = time.monotonic() + self.shared_wait_seconds
+            while self.last_fetch == previous_fetch and time.monotonic() < deadline:
+                time.sleep(0.1)
+                self._sync_shared()
+
+        if self.snapshot is None:
+            # Owner has not published anything - fetch locally rather than fail
+            logger.warning("No shared pool snapshot published yet - fetching locally")
+            return self._fetch_fresh_data()
+
+        if self._is_cache_fresh(datetime.utcnow()):
+            self.stats['cache_hits'] += 1
+        else:
+            self.stats['stale_hits'] += 1
+        return self.snapshot
+
+    def _sync_shared(self):
+        """Adopt the snapshot published by the owner process if it changed"""
+        with self._shared_lock:
+            try:
+                published = self.shared.poll()
+                if published is None:
+                    return
+                snapshot, metadata = published
+                fetched_at = datetime.fromisoformat(metadata['fetched_at'])
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Failed to map shared pool snapshot: {e}")
+                return
+
+            if self.snapshot is not None and metadata.get('generation') == self.generation:
+                # Same data renewed by the owner (304) - keep the current mapping
+                self.last_fetch = fetched_at
+                self._observe_change(self.snapshot)
+                return
+
+            snapshot.generation = metadata.get('generation', self.generation + 1)
+            snapshot.build_indexes()
+            self._record_delta(snapshot)
+            self._remember_snapshot(snapshot)
+            self.snapshot = snapshot
+            self.last_fetch = fetched_at
+            self.generation = snapshot.generation
+            self._validators = metadata.get('validators')
+            self.warm_started = False
+            self._observe_change(snapshot)
+            self.stats['shared_remaps'] += 1
+            logger.info(f"Mapped shared pool snapshot generation {self.generation} ({len(snapshot)} pools)")
+
+        self._notify_listeners(snapshot)
+
+    def _cache_age_seconds(self, now):
+        """Age of the current snapshot in seconds (None if there is none)"""
+        if self.snapshot is None or self.last_fetch is None:
+            return None
+        return (now - self.last_fetch).total_seconds()
 
     def _is_cache_fresh(self, now):
-        """Check if cached data is still fresh"""
-        if self.pools_data is None or self.last_fetch is None:
-            return False
+        """Check if cached data is within the soft TTL"""
+        age_seconds = self._cache_age_seconds(now)
+        return age_seconds is not None and age_seconds < self.soft_ttl_seconds
+
+    def seconds_until_stale(self):
+        """Whole seconds before the current snapshot passes the soft TTL (0 if stale or missing)"""
+        age_seconds = self._cache_age_seconds(datetime.utcnow())
+        if age_seconds is None:
+            return 0
+        return max(int(self.soft_ttl_seconds - age_seconds), 0)
+
+    def _is_cache_usable(self, now):
+        """Check if cached data is within the hard TTL (may be served stale)"""
+        if self.warm_started and self.snapshot is not None:
+            # Snapshot loaded from disk - usable until the first real refresh
+            return True
+        age_seconds = self._cache_age_seconds(now)
+        return age_seconds is not None and age_seconds < self.hard_ttl_seconds
+
+    def _load_persisted_snapshot(self):
+        """Load the last snapshot written to disk (warm start)"""
+        if not os.path.exists(self.snapshot_path):
+            return
+
+        try:
+            load_start = datetime.utcnow()
+            snapshot, metadata = read_snapshot(self.snapshot_path)
+            fetched_at = datetime.fromisoformat(metadata['fetched_at'])
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable pool snapshot {self.snapshot_path}: {e}")
+            return
+
+        age_seconds = (datetime.utcnow() - fetched_at).total_seconds()
+        if age_seconds > self.snapshot_max_age_seconds:
+            logger.info(f"Ignoring pool snapshot {self.snapshot_path} ({age_seconds:.0f}s old)")
+            return
+
+        snapshot.generation = metadata.get('generation', 0)
+        snapshot.build_indexes()
+        self._remember_snapshot(snapshot)
+        self.snapshot = snapshot
+        self.last_fetch = fetched_at
+        self.generation = snapshot.generation
+        self._validators = metadata.get('validators')
+        self.warm_started = True
+        self._observe_change(snapshot)
+        self.stats['warm_start_pools'] = len(snapshot)
+        if self.history is not None:
+            self.history.append(snapshot, timestamp=fetched_at)
+        logger.info(
+            f"Warm start: loaded {len(snapshot)} pools from {self.snapshot_path} "
+            f"(age: {age_seconds:.0f}s, took {(datetime.utcnow() - load_start).total_seconds() * 1000:.1f}ms)"
+        )
+
+    def _record_delta(self, snapshot):
+        """
+        Diff a newly accepted snapshot against the current one
 
-        age_seconds = (now - self.last_fetch).total_seconds()
-        return age_seconds < self.cache_duration_seconds
+        Must run before the new snapshot is swapped in, so a reader never
+        sees a generation the delta log doesn't know about yet.
+        """
+        if self.snapshot is None:
+            self.deltas.clear()
+            return
+
+        delta_start = datetime.utcnow()
+        delta = compute_delta(self.snapshot, snapshot, epsilon=self.delta_epsilon)
+        self.deltas.append(delta)
+        self.stats['last_delta_added'] = len(delta.added)
+        self.stats['last_delta_changed'] = len(delta.changed)
+        self.stats['last_delta_removed'] = len(delta.removed)
+        self.stats['last_delta_duration'] = (datetime.utcnow() - delta_start).total_seconds()
+        logger.info(f"Snapshot delta {delta.previous_generation} → {delta.generation}: "
+                    f"+{len(delta.added)} added, {len(delta.changed)} changed, -{len(delta.removed)} removed")
+
+    def _observe_change(self, snapshot):
+        """Feed the snapshot current as of `last_fetch` to the change tracker and adapt the soft TTL"""
+        if self.change_tracker is None:
+            return
+
+        self.change_tracker.observe(snapshot, self.last_fetch)
+        ttl = self.change_tracker.snapshot_ttl()
+        if ttl is not None and ttl != self.soft_ttl_seconds:
+            logger.info(f"Adaptive soft TTL: {self.soft_ttl_seconds}s → {ttl}s")
+            self.soft_ttl_seconds = ttl
+
+    def _remember_snapshot(self, snapshot):
+        """Keep a newly accepted snapshot reachable by generation (oldest dropped)"""
+        self._recent_snapshots[snapshot.generation] = snapshot
+        while len(self._recent_snapshots) > self.snapshot_history_size:
+            self._recent_snapshots.popitem(last=False)
+
+    def get_snapshot_at(self, generation):
+        """
+        Snapshot of a specific generation, if it is still retained
+
+        Returns:
+            PoolSnapshot or None (generation too old, or never seen by this process)
+        """
+        return self._recent_snapshots.get(generation)
+
+    def add_snapshot_listener(self, callback):
+        """
+        Register a callback for new snapshots
+
+        Args:
+            callback: Called as callback(snapshot) after each new generation
+                is swapped in (not for 304 renewals). Runs on the refreshing
+                thread, so it must be quick.
+        """
+        self._listeners.append(callback)
+
+    def _notify_listeners(self, snapshot):
+        """Run snapshot listeners (failures are logged, never raised)"""
+        for callback in list(self._listeners):
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.error(f"Snapshot listener {callback!r} failed: {e}")
+
+    def _snapshot_metadata(self):
+        """Header metadata stored with persisted/published snapshots"""
+        return {
+            'fetched_at': self.last_fetch.isoformat(),
+            'generation': self.generation,
+            'validators': self._validators
+        }
+
+    def _persist_snapshot(self, snapshot):
+        """Write the accepted snapshot to disk for the next warm start"""
+        try:
+            write_start = datetime.utcnow()
+            write_snapshot(self.snapshot_path, snapshot, metadata=self._snapshot_metadata())
+            self.stats['last_snapshot_write_duration'] = (datetime.utcnow() - write_start).total_seconds()
+        except OSError as e:
+            self.stats['snapshot_write_failures'] += 1
+            logger.warning(f"Failed to persist pool snapshot to {self.snapshot_path}: {e}")
+
+    def _publish_shared(self, snapshot):
+        """Publish the accepted snapshot to the other processes"""
+        try:
+            self.shared.publish(snapshot, self._snapshot_metadata())
+            self.stats['shared_publishes'] += 1
+        except OSError as e:
+            self.stats['snapshot_write_failures'] += 1
+            logger.warning(f"Failed to publish shared pool snapshot to {self.shared_dir}: {e}")
+
+    def _ensure_refresher(self):
+        """Start the background refresher thread for this process if needed"""
+        pid = os.getpid()
+        if self._refresher_pid == pid and self._refresher_thread and self._refresher_thread.is_alive():
+            return
+
+        with self._lock:
+            if self._refresher_pid == pid and self._refresher_thread and self._refresher_thread.is_alive():
+                return
+
+            if self.shared is not None:
+                # Decide the role up front so requests don't race the thread
+                self.shared.try_acquire_ownership()
+
+            self._refresher_thread = threading.Thread(
+                target=self._refresh_loop,
+                name='pool-cache-refresher',
+                daemon=True
+            )
+            self._refresher_pid = pid
+            self._refresher_thread.start()
+            logger.info(f"Background pool refresher started (pid {pid})")
+
+    def _seconds_until_refresh(self, now):
+        """Seconds until the refresher should renew the snapshot"""
+        age_seconds = self._cache_age_seconds(now)
+        if age_seconds is None:
+            return 0
+        refresh_at = max(self.soft_ttl_seconds - self.refresh_ahead_seconds, 1)
+        return max(refresh_at - age_seconds, 0)
+
+    def _refresh_loop(self):
+        """
+        Keep the snapshot renewed ahead of its soft TTL
+
+        In shared mode, non-owners only follow the owner's publishes and
+        retry the refresh lock, taking over if the owner process exits.
+        """
+        while True:
+            if self.shared is not None and not self.shared.try_acquire_ownership():
+                self._sync_shared()
+                time.sleep(self.shared_poll_seconds)
+                continue
+
+            wait_seconds = self._seconds_until_refresh(datetime.utcnow())
+            if self.shared is not None:
+                # Wake up regularly to pick up refresh requests from followers
+                wait_seconds = min(wait_seconds, self.shared_poll_seconds)
+            if wait_seconds > 0:
+                self._refresh_event.wait(timeout=wait_seconds)
+            self._refresh_event.clear()
+
+            now = datetime.utcnow()
+            requested = self.shared is not None and self.shared.refresh_requested_since(self.last_fetch)
+            if not requested and self._seconds_until_refresh(now) > 0 and self._is_cache_fresh(now):
+                continue
+
+            delay = self.refresh_coordinator.seconds_until_allowed(PAIR_ALL_KEY)
+            if delay > 0:
+                # Fetched under the minimum interval ago (e.g. by a request
+                # thread) - look again once it has passed
+                self._refresh_event.wait(timeout=delay)
+                continue
+
+            last_fetch = self.last_fetch
+            try:
+                self._fetch_fresh_data(refresh_ahead=True, force=requested)
+            except Exception as e:
+                logger.error(f"Background pool refresh failed: {e}")
+
+            if self.last_fetch == last_fetch:
+                # Fetch failed (stale data kept) - back off before retrying
+                self.stats['background_refresh_failures'] += 1
+                time.sleep(self.refresh_retry_seconds)
 
     def _filter_pools(self, pools_data):
         """
@@ -95,26 +668,27 @@ class PoolDataCache:
         - Remove pools with TVL below minimum threshold
 
         Args:
-            pools_data: Raw pool data from API
+            pools_data: Raw pool data from API (list or any iterable, e.g. the
+                streaming decoder - pools are filtered as they are parsed)
 
         Returns:
-            tuple: (filtered_pools, filter_stats)
+            tuple: (filtered_pools as PoolRecord list, filter_stats)
         """
-        if not pools_data:
-            return pools_data, {}
-
-        original_count = len(pools_data)
+        original_count = 0
         filtered_pools = []
 
         # Track filtering statistics
         filter_stats = {
+            'raw_count': 0,
             'hidden_count': 0,
             'blacklisted_count': 0,
             'low_tvl_count': 0,
             'total_filtered': 0
         }
 
-        for pool in pools_data:
+        for pool in pools_data or []:
+            original_count += 1
+
             # Check hide flag
             if self.filter_hidden and pool.get('hide', False):
                 filter_stats['hidden_count'] += 1
@@ -136,9 +710,10 @@ class PoolDataCache:
                 filter_stats['low_tvl_count'] += 1
                 continue
 
-            # Pool passed all filters
-            filtered_pools.append(pool)
+            # Pool passed all filters - keep only the compact record
+            filtered_pools.append(PoolRecord.from_api(pool))
 
+        filter_stats['raw_count'] = original_count
         filter_stats['total_filtered'] = original_count - len(filtered_pools)
 
         logger.info(
@@ -151,69 +726,180 @@ class PoolDataCache:
 
         return filtered_pools, filter_stats
 
-    def _fetch_fresh_data(self, now):
-        """Fetch fresh pool data from Meteora API"""
-        # Use lock to prevent multiple simultaneous fetches
-        with self.fetch_lock:
-            # Double-check - another thread might have just fetched
-            if self._is_cache_fresh(now):
-                self.stats['cache_hits'] += 1
-                return self.pools_data
+    def _fetch_fresh_data(self, refresh_ahead=False, force=False):
+        """
+        Fetch fresh pool data from Meteora API
+
+        Goes through the refresh coordinator: concurrent callers share one
+        in-flight download, and within the minimum fetch interval of the
+        previous download the current snapshot is served instead (forced or
+        not).
 
+        Args:
+            refresh_ahead: Background renewal (not counted as a cache miss)
+            force: Caller asked for a forced refresh
+        """
+        if not refresh_ahead:
             self.stats['cache_misses'] += 1
 
+        return self.refresh_coordinator.run(
+            PAIR_ALL_KEY,
+            lambda: self._download(refresh_ahead),
+            force=force,
+            cached=(lambda: self.snapshot) if self.snapshot is not None else None
+        )
+
+    def _download(self, refresh_ahead):
+        """Download, filter and swap in /pair/all (run by the refresh coordinator)"""
+        try:
+            logger.info("Cache MISS - Fetching fresh pool data from Meteora API...")
+            fetch_start = datetime.utcnow()
+
+            # Stream the body and filter while parsing, so the raw payload
+            # and the full decoded list are never in memory at once.
+            # Validators are only sent when there is a snapshot to keep.
+            validators = self._validators if self.snapshot is not None else None
+            response = get_session().get(
+                f'{METEORA_API_BASE}/pair/all',
+                headers=conditional_headers(validators),
+                timeout=30,
+                stream=True
+            )
+            timings = {'transfer': 0.0}
             try:
-                logger.info("Cache MISS - Fetching fresh pool data from Meteora API...")
-                fetch_start = datetime.utcnow()
+                if response.status_code == 304 and validators:
+                    return self._renew_not_modified(fetch_start, refresh_ahead)
 
-                response = requests.get(
-                    'https://dlmm-api.meteora.ag/pair/all',
-                    timeout=30
-                )
                 response.raise_for_status()
 
-                raw_pools = response.json()
-                self.stats['total_pools_raw'] = len(raw_pools)
-
                 # Apply filtering to remove trash/unwanted pools
-                filtered_pools, filter_stats = self._filter_pools(raw_pools)
-
-                self.pools_data = filtered_pools
-                self.last_fetch = now
-                self.stats['total_pools_filtered'] = len(filtered_pools)
-                self.stats['pools_filtered_out'] = filter_stats['total_filtered']
-                self.stats['hidden_filtered'] = filter_stats['hidden_count']
-                self.stats['blacklisted_filtered'] = filter_stats['blacklisted_count']
-                self.stats['low_tvl_filtered'] = filter_stats['low_tvl_count']
-                self.stats['last_fetch_duration'] = (datetime.utcnow() - fetch_start).total_seconds()
-
-                logger.info(
-                    f"✅ Fetched and filtered pools from Meteora: "
-                    f"{self.stats['total_pools_raw']} → {len(filtered_pools)} pools "
-                    f"(took {self.stats['last_fetch_duration']:.2f}s)"
-                )
-
-                return self.pools_data
-
-            except requests.RequestException as e:
-                logger.error(f"Failed to fetch pool data from Meteora: {e}")
+                stream_start = time.perf_counter()
+                filtered_pools, filter_stats = self._filter_pools(iter_json_array(
+                    _timed_chunks(response.iter_content(chunk_size=STREAM_CHUNK_SIZE), timings)
+                ))
+                stream_duration = time.perf_counter() - stream_start
+                self.stats['last_bytes_received'] = response.raw.tell()
+                self.stats['last_content_encoding'] = response.headers.get('Content-Encoding', 'identity')
+            finally:
+                response.close()
+
+            self.stats['total_pools_raw'] = filter_stats['raw_count']
+            self.stats['last_transfer_duration'] = timings['transfer']
+            self.stats['last_parse_duration'] = stream_duration - timings['transfer']
+
+            # Build the columnar snapshot before publishing
+            build_start = datetime.utcnow()
+            snapshot = PoolSnapshot.from_pools(filtered_pools)
+            snapshot.build_indexes()
+            self.stats['last_snapshot_build_duration'] = (datetime.utcnow() - build_start).total_seconds()
+
+            snapshot.generation = self.generation + 1
+            self._record_delta(snapshot)
+            self._remember_snapshot(snapshot)
+            self.snapshot = snapshot
+            self.last_fetch = datetime.utcnow()
+            self.generation = snapshot.generation
+            self._validators = response_validators(response)
+            self.warm_started = False
+            self._observe_change(snapshot)
+            self.stats['total_pools_filtered'] = len(filtered_pools)
+            self.stats['pools_filtered_out'] = filter_stats['total_filtered']
+            self.stats['hidden_filtered'] = filter_stats['hidden_count']
+            self.stats['blacklisted_filtered'] = filter_stats['blacklisted_count']
+            self.stats['low_tvl_filtered'] = filter_stats['low_tvl_count']
+            self.stats['last_fetch_duration'] = (datetime.utcnow() - fetch_start).total_seconds()
+            if refresh_ahead:
+                self.stats['background_refreshes'] += 1
+
+            logger.info(
+                f"✅ Fetched and filtered pools from Meteora: "
+                f"{self.stats['total_pools_raw']} → {len(filtered_pools)} pools "
+                f"(took {self.stats['last_fetch_duration']:.2f}s)"
+            )
+
+            if self.snapshot_path:
+                self._persist_snapshot(snapshot)
+            if self.shared is not None and self.shared.is_owner:
+                self._publish_shared(snapshot)
+            self._notify_listeners(snapshot)
+
+            return self.snapshot
+
+        except (requests.RequestException, ValueError) as e:
+            logger.error(f"Failed to fetch pool data from Meteora: {e}")
+
+            # Return stale cache if available (better than nothing)
+            if self.snapshot is not None and len(self.snapshot):
+                logger.warning("Returning stale cache data due to fetch failure")
+                return self.snapshot
+
+            raise
+
+    def _renew_not_modified(self, fetch_start, refresh_ahead):
+        """Upstream answered 304 - keep the snapshot and restart its TTL"""
+        self.last_fetch = datetime.utcnow()
+        self.warm_started = False
+        self._observe_change(self.snapshot)
+        self.stats['not_modified_responses'] += 1
+        self.stats['last_fetch_duration'] = (datetime.utcnow() - fetch_start).total_seconds()
+        self.stats['last_transfer_duration'] = self.stats['last_fetch_duration']
+        self.stats['last_parse_duration'] = 0
+        self.stats['last_bytes_received'] = 0
+        if refresh_ahead:
+            self.stats['background_refreshes'] += 1
+
+        logger.info(f"Pool data not modified (304) - renewed {len(self.snapshot)} cached pools "
+                    f"(took {self.stats['last_fetch_duration']:.2f}s)")
+
+        if self.shared is not None and self.shared.is_owner:
+            # Republish so followers see the renewed fetch time
+            self._publish_shared(self.snapshot)
+
+        return self.snapshot
+
+    def get_changes(self, since):
+        """
+        Pools added/changed and removed since a snapshot generation
 
-                # Return stale cache if available (better than nothing)
-                if self.pools_data:
-                    logger.warning("Returning stale cache data due to fetch failure")
-                    return self.pools_data
+        Args:
+            since: Generation the client last saw
 
-                raise
+        Returns:
+            tuple: (snapshot, upserted addresses, removed addresses) -
+                both address sets are None if the delta history does not
+                reach back to `since` and the client must reload the full list
+        """
+        snapshot = self.get_snapshot()
+        changes = self.deltas.since(since, snapshot.generation)
+        if changes is None:
+            return snapshot, None, None
+        upserted, removed = changes
+        return snapshot, upserted, removed
 
     def get_stats(self):
         """Get cache statistics"""
-        total_requests = self.stats['cache_hits'] + self.stats['cache_misses']
-        hit_rate = (self.stats['cache_hits'] / total_requests * 100) if total_requests > 0 else 0
+        served_from_cache = self.stats['cache_hits'] + self.stats['stale_hits']
+        total_requests = served_from_cache + self.stats['cache_misses']
+        hit_rate = (served_from_cache / total_requests * 100) if total_requests > 0 else 0
 
         return {
             **self.stats,
+            **self.refresh_coordinator.get_stats(),
             'total_requests': total_requests,
             'hit_rate_percent': round(hit_rate, 2),
+            'soft_ttl_seconds': self.soft_ttl_seconds,
+            'hard_ttl_seconds': self.hard_ttl_seconds,
+            'adaptive_ttl': self.change_tracker.get_stats() if self.change_tracker is not None else None,
+            'background_refresh': self.background_refresh,
+            'refresher_alive': bool(self._refresher_thread and self._refresher_thread.is_alive()),
+            'warm_started': self.warm_started,
+            'generation': self.generation,
+            'delta_history': len(self.deltas),
+            'retained_generations': list(self._recent_snapshots),
+            'oldest_delta_generation': self.deltas.oldest_generation,
+            'history': self.history.get_stats() if self.history is not None else None,
+            'shared_mode': self.shared is not None,
+            'shared_owner': self.shared.is_owner if self.shared is not None else None,
             'cache_fresh': self._is_cache_fresh(datetime.utcnow()),
             'cache_age_seconds': (datetime.utcnow() - self.last_fetch).total_seconds() if self.last_fetch else None
         }
@@ -221,8 +907,10 @@ class PoolDataCache:
     def invalidate(self):
         """Manually invalidate the cache"""
         logger.info("Cache invalidated")
-        self.pools_data = None
+        self.snapshot = None
         self.last_fetch = None
+        self.warm_started = False
+        self._recent_snapshots.clear()
 
 
 # Global singleton instance
@@ -238,6 +926,19 @@ def get_cached_pools(force_refresh=False):
         force_refresh: Force a fresh fetch
 
     Returns:
-        list: Pool data
+        list: PoolRecord list
     """
     return pool_cache.get_pools(force_refresh=force_refresh)
+
+
+def get_cached_snapshot(force_refresh=False):
+    """
+    Get the columnar pool snapshot from shared cache
+
+    Args:
+        force_refresh: Force a fresh fetch
+
+    Returns:
+        PoolSnapshot: Columnar pool data
+    """
+    return pool_cache.get_snapshot(force_refresh=force_refresh)
@@ -0,0 +1,186 @@
+"""
+Per-Pool Metric History
+Keeps the last few snapshots' price, liquidity, fee and volume values for
+every pool in fixed-size NumPy ring buffers, so trend data comes from data
+we already download instead of another upstream API
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+from pool_record import WINDOWS
+
+logger = logging.getLogger(__name__)
+
+# Snapshot columns recorded per pool
+HISTORY_FIELDS = (
+    ('current_price', 'liquidity')
+    + tuple(f'fees_{window}' for window in WINDOWS)
+    + tuple(f'volume_{window}' for window in WINDOWS)
+)
+
+# Fields kept in float64: dollar amounts that exceed float32's ~7
+# significant digits on large pools (> ~$16.7M would come back rounded).
+# Price and fee values stay float32.
+FLOAT64_FIELDS = ('liquidity',) + tuple(f'volume_{window}' for window in WINDOWS)
+
+
+def _field_dtype(field: str):
+    return np.float64 if field in FLOAT64_FIELDS else np.float32
+
+
+class PoolHistory:
+    """
+    Ring buffer of the last `depth` snapshots, one row per pool
+
+    - `_values[field]` is a (slots x depth) array - float64 for
+      FLOAT64_FIELDS, float32 otherwise; every append writes one column (the
+      same position for all pools) and pools missing from that snapshot get
+      NaN there
+    - pool address -> slot is assigned on first sight; a slot unseen for
+      `depth` appends holds only NaN and is reclaimed for new pools
+
+    Memory is bounded by (pools seen in the last `depth` snapshots) x depth
+    x (4 bytes per float32 field + 8 bytes per float64 field).
+    """
+
+    def __init__(self, depth: int):
+        self.depth = depth
+        self._lock = threading.Lock()
+        self._slots = {}  # address -> slot
+        self._addresses = []  # slot -> address (None = free)
+        self._free = []
+        self._values = {field: np.empty((0, depth), dtype=_field_dtype(field)) for field in HISTORY_FIELDS}
+        self._last_written = np.empty(0, dtype=np.int64)  # append number that last wrote each slot
+        self._timestamps = [None] * depth
+        self._generations = np.zeros(depth, dtype=np.int64)
+        self._appends = 0
+
+        self.stats = {
+            'appends': 0,
+            'slots_reclaimed': 0,
+            'last_append_duration': 0
+        }
+
+    def append(self, snapshot, timestamp: Optional[datetime] = None):
+        """Record every pool of a snapshot (usable directly as a snapshot listener)"""
+        start = time.perf_counter()
+        with self._lock:
+            position = self._appends % self.depth
+            slots = self._assign_slots(snapshot.strings['address'])
+
+            for field, values in self._values.items():
+                values[:, position] = np.nan
+                values[slots, position] = snapshot.columns[field]
+
+            self._last_written[slots] = self._appends
+            self._timestamps[position] = timestamp or datetime.utcnow()
+            self._generations[position] = snapshot.generation
+            self._appends += 1
+            self._reclaim_slots()
+
+        self.stats['appends'] += 1
+        self.stats['last_append_duration'] = time.perf_counter() - start
+
+    def _assign_slots(self, addresses) -> np.ndarray:
+        """
+        Slot per address (new addresses take free or new slots); an address
+        repeated within the snapshot shares one slot
+        """
+        slots = np.empty(len(addresses), dtype=np.int64)
+        new_rows = []
+        for i, address in enumerate(addresses):
+            slot = self._slots.get(address)
+            if slot is None:
+                new_rows.append(i)
+            else:
+                slots[i] = slot
+
+        if new_rows:
+            new_addresses = dict.fromkeys(addresses[i] for i in new_rows)
+            self._grow(len(new_addresses) - len(self._free))
+            for address in new_addresses:
+                slot = self._free.pop()
+                self._slots[address] = slot
+                self._addresses[slot] = address
+            for i in new_rows:
+                slots[i] = self._slots[addresses[i]]
+        return slots
+
+    def _grow(self, needed: int):
+        """Add at least `needed` free slots (capacity doubles)"""
+        if needed <= 0:
+            return
+        capacity = len(self._addresses)
+        extra = max(needed, capacity)
+        for field, values in self._values.items():
+            grown = np.full((capacity + extra, self.depth), np.nan, dtype=values.dtype)
+            grown[:capacity] = values
+            self._values[field] = grown
+        self._last_written = np.concatenate([self._last_written, np.full(extra, -1, dtype=np.int64)])
+        self._addresses.extend([None] * extra)
+        # Lowest slots are handed out first
+        self._free.extend(range(capacity + extra - 1, capacity - 1, -1))
+
+    def _reclaim_slots(self):
+        """Free slots whose pool has not been seen for a whole ring"""
+        expired = np.flatnonzero(
+            (self._last_written >= 0) & (self._appends - self._last_written >= self.depth)
+        )
+        for slot in expired.tolist():
+            del self._slots[self._addresses[slot]]
+            self._addresses[slot] = None
+            self._last_written[slot] = -1
+            self._free.append(slot)
+        self.stats['slots_reclaimed'] += len(expired)
+
+    def get(self, address: str, limit: Optional[int] = None) -> Optional[dict]:
+        """
+        Recorded values of one pool, oldest first
+
+        Args:
+            address: Pool address
+            limit: Only the most recent `limit` points
+
+        Returns:
+            dict: {'timestamps', 'generations', <field>: [...] per
+                HISTORY_FIELDS} - only snapshots that contained the pool;
+                None if the pool is not tracked
+        """
+        with self._lock:
+            slot = self._slots.get(address)
+            if slot is None:
+                return None
+
+            count = min(self._appends, self.depth)
+            positions = np.arange(self._appends - count, self._appends) % self.depth
+            present = ~np.isnan(self._values['liquidity'][slot, positions])
+            positions = positions[present]
+            if limit is not None:
+                positions = positions[-limit:] if limit > 0 else positions[:0]
+
+            history = {
+                'timestamps': [self._timestamps[p].isoformat() for p in positions.tolist()],
+                'generations': self._generations[positions].tolist()
+            }
+            for field, values in self._values.items():
+                # Shortest repr of the stored type, so a float32 0.1 is sent
+                # as 0.1 and not 0.10000000149011612
+                history[field] = [float(str(value)) for value in values[slot, positions]]
+            return history
+
+    def get_stats(self) -> dict:
+        """Get history statistics"""
+        return {
+            **self.stats,
+            'depth': self.depth,
+            'points': min(self._appends, self.depth),
+            'pools_tracked': len(self._slots),
+            'slot_capacity': len(self._addresses),
+            'bytes': sum(values.nbytes for values in self._values.values())
+        }
@@ -0,0 +1,100 @@
+"""
+Derived Pool Metrics
+Fee-rate, fee/volume and fee/TVL columns plus the quote-token class,
+computed once per snapshot so the pair list, opportunity analysis, wallet
+positions and the degen monitor all read the same numbers
+"""
+
+import logging
+
+import numpy as np
+
+from pool_record import WINDOWS
+
+logger = logging.getLogger(__name__)
+
+# Quote tokens recognized by the classification below
+QUOTE_TOKENS = {
+    'SOL': 'So11111111111111111111111111111111111111112',
+    'USDC': 'EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v'
+}
+
+# quote_class codes -> label (SOL wins over USDC for SOL-USDC pools)
+QUOTE_CLASSES = ('other', 'SOL', 'USDC')
+QUOTE_OTHER, QUOTE_SOL, QUOTE_USDC = range(len(QUOTE_CLASSES))
+
+# Minimum TVL for the ranked 30-minute fee rate (avoids unrealistic rates)
+FEE_RATE_MIN_TVL = 1000
+
+# Columns produced by compute_derived_metrics()
+DERIVED_COLUMNS = (
+    ('fee_rate_30min', 'fee_rate_30min_ranked', 'quote_class')
+    + tuple(f'fee_tvl_{window}' for window in WINDOWS)
+    + tuple(f'fee_volume_{window}' for window in WINDOWS)
+)
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray, valid: np.ndarray, scale: float = 1) -> np.ndarray:
+    """numerator / denominator * scale where valid, 0 elsewhere"""
+    result = np.zeros(len(numerator), dtype=np.float64)
+    np.divide(numerator, denominator, out=result, where=valid)
+    if scale != 1:
+        result *= scale
+    return result
+
+
+def classify_quotes(mint_x, mint_y) -> np.ndarray:
+    """
+    quote_class code per pool
+
+    SOL if either mint is SOL, otherwise USDC if either mint is USDC,
+    otherwise QUOTE_OTHER.
+    """
+    sol = QUOTE_TOKENS['SOL']
+    usdc = QUOTE_TOKENS['USDC']
+    classes = np.full(len(mint_x), QUOTE_OTHER, dtype=np.int8)
+    for i, mints in enumerate(zip(mint_x, mint_y)):
+        if sol in mints:
+            classes[i] = QUOTE_SOL
+        elif usdc in mints:
+            classes[i] = QUOTE_USDC
+    return classes
+
+
+def compute_derived_metrics(columns: dict, strings: dict) -> dict:
+    """
+    Derived columns for one snapshot
+
+    - fee_tvl_<window>: fees / liquidity in percent (0 for zero liquidity)
+    - fee_volume_<window>: fees / volume (0 for zero volume)
+    - fee_rate_30min: fee_tvl_min_30
+    - fee_rate_30min_ranked: fee_rate_30min, but 0 below FEE_RATE_MIN_TVL
+      (the /api/pairs sort key)
+    - quote_class: index into QUOTE_CLASSES
+
+    Args:
+        columns: Snapshot numeric columns (NUMERIC_FIELDS)
+        strings: Snapshot string columns (needs mint_x and mint_y)
+
+    Returns:
+        dict: Column name -> array, row-aligned with the snapshot
+    """
+    liquidity = columns['liquidity']
+    has_liquidity = liquidity > 0
+
+    derived = {}
+    for window in WINDOWS:
+        fees = columns[f'fees_{window}']
+        volume = columns[f'volume_{window}']
+        derived[f'fee_tvl_{window}'] = _ratio(fees, liquidity, has_liquidity, scale=100)
+        derived[f'fee_volume_{window}'] = _ratio(fees, volume, volume > 0)
+
+    derived['fee_rate_30min'] = derived['fee_tvl_min_30']
+    derived['fee_rate_30min_ranked'] = _ratio(
+        columns['fees_min_30'],
+        liquidity,
+        has_liquidity & (liquidity >= FEE_RATE_MIN_TVL),
+        scale=100
+    )
+    derived['quote_class'] = classify_quotes(strings['mint_x'], strings['mint_y'])
+    return derived
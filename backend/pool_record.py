@@ -0,0 +1,115 @@
+"""
+Compact Pool Record
+Slotted replacement for the raw Meteora pool dict - keeps only the fields
+the backend reads, already parsed to numbers
+"""
+
+import sys
+
+# Fee/volume windows reported by the Meteora /pair/all API
+WINDOWS = ('min_30', 'hour_1', 'hour_2', 'hour_4', 'hour_12', 'hour_24')
+
+# Numeric field name -> path into the upstream pool dict
+NUMERIC_FIELDS = {
+    'liquidity': ('liquidity',),
+    'current_price': ('current_price',),
+    'fees_24h': ('fees_24h',),
+    'apr': ('apr',),
+    'bin_step': ('bin_step',),
+    'base_fee_percentage': ('base_fee_percentage',),
+    **{f'fees_{window}': ('fees', window) for window in WINDOWS},
+    **{f'volume_{window}': ('volume', window) for window in WINDOWS},
+}
+
+# String fields copied as-is from the upstream pool dict
+STRING_FIELDS = ('address', 'name', 'mint_x', 'mint_y')
+
+# Boolean fields copied from the upstream pool dict
+FLAG_FIELDS = ('hide', 'is_blacklisted')
+
+
+def safe_float(value, default=0.0):
+    """Safely convert value to float, handling empty strings and None"""
+    if value is None or value == '':
+        return default
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def _lookup(pool: dict, path: tuple):
+    """Follow a key path into a (possibly nested) pool dict"""
+    value = pool
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+class PoolRecord:
+    """
+    One Meteora DLMM pool
+
+    Numeric fields are parsed once at ingest (invalid/missing -> 0.0), and
+    fee/volume windows are flattened to `fees_<window>` / `volume_<window>`
+    attributes, matching the PoolSnapshot column names.
+    """
+
+    __slots__ = STRING_FIELDS + tuple(NUMERIC_FIELDS) + FLAG_FIELDS
+
+    def __init__(self, **values):
+        for name in STRING_FIELDS:
+            setattr(self, name, values.get(name) or '')
+        for name in NUMERIC_FIELDS:
+            setattr(self, name, float(values.get(name) or 0.0))
+        for name in FLAG_FIELDS:
+            setattr(self, name, bool(values.get(name, False)))
+        self.bin_step = int(self.bin_step)
+
+    @classmethod
+    def from_api(cls, pool: dict) -> 'PoolRecord':
+        """Build a record from an upstream /pair/all pool dict"""
+        record = cls.__new__(cls)
+        for name in STRING_FIELDS:
+            setattr(record, name, pool.get(name) or '')
+        for name, path in NUMERIC_FIELDS.items():
+            setattr(record, name, safe_float(_lookup(pool, path)))
+        for name in FLAG_FIELDS:
+            setattr(record, name, bool(pool.get(name, False)))
+        record.bin_step = int(record.bin_step)
+        return record
+
+    def to_dict(self) -> dict:
+        """
+        Upstream-shaped dict (nested `fees` / `volume` windows)
+
+        Built on demand, e.g. for /api/pool/<address>; nothing is retained.
+        """
+        return {
+            'address': self.address,
+            'name': self.name,
+            'mint_x': self.mint_x,
+            'mint_y': self.mint_y,
+            'current_price': self.current_price,
+            'liquidity': self.liquidity,
+            'fees_24h': self.fees_24h,
+            'apr': self.apr,
+            'bin_step': self.bin_step,
+            'base_fee_percentage': self.base_fee_percentage,
+            'fees': {window: getattr(self, f'fees_{window}') for window in WINDOWS},
+            'volume': {window: getattr(self, f'volume_{window}') for window in WINDOWS},
+            'hide': self.hide,
+            'is_blacklisted': self.is_blacklisted,
+        }
+
+    def __repr__(self):
+        return f"PoolRecord(address={self.address!r}, name={self.name!r})"
+
+    def nbytes(self) -> int:
+        """Approximate memory held by this record (object plus its field values)"""
+        return sys.getsizeof(self) + sum(
+            sys.getsizeof(getattr(self, name))
+            for name in STRING_FIELDS + tuple(NUMERIC_FIELDS)
+        )
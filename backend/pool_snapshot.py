@@ -0,0 +1,479 @@
+"""
+Columnar Pool Snapshot
+Converts the cached pool records into NumPy columns once per refresh,
+so request handlers and monitors filter with array operations instead of
+re-parsing every pool dict on every call
+"""
+
+import logging
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from pool_metrics import DERIVED_COLUMNS, compute_derived_metrics
+from pool_record import FLAG_FIELDS, NUMERIC_FIELDS, STRING_FIELDS, PoolRecord
+from search_index import NameSearchIndex
+
+logger = logging.getLogger(__name__)
+
+# Supported /api/pairs sort keys (first one is the default)
+SORT_KEYS = ('fee_rate_30min', 'fees_24h', 'liquidity', 'name')
+
+# Columns kept pre-sorted (ascending) for O(log n) threshold counts
+COUNTABLE_COLUMNS = {
+    'min_liquidity': 'liquidity',
+    'min_volume_24h': 'volume_hour_24',
+}
+
+
+class PoolSnapshot:
+    """
+    Immutable columnar view of one pool list
+
+    - `columns[name]` is a float64 array for every field in NUMERIC_FIELDS
+    - `strings[name]` is an object array for address, name, mint_x, mint_y
+    - `flags[name]` is a bool array for hide / is_blacklisted
+    - `derived[name]` holds the per-pool metrics from pool_metrics
+      (fee rates, fee/TVL and fee/volume per window, quote class)
+    - `pools` builds the PoolRecord list from the columns on first access
+      and keeps it (snapshots never change); `record(i)` builds one row.
+      Snapshots served only through the arrays never hold records
+    - `sort_orders[key]` holds row indices in descending order for each
+      key in SORT_KEYS
+    - `generation` is assigned by the cache that accepted the snapshot
+    - `row_index` maps pool address -> row and `mint_index` maps token mint
+      -> rows containing it (as mint_x or mint_y); `search_index` answers
+      pair name searches; all are built once per snapshot (see
+      build_indexes())
+
+    All arrays are row-aligned, so an index array from any helper below can
+    be used against every column.
+    """
+
+    def __init__(self, columns: dict, strings: dict, flags: dict,
+                 sort_orders: Optional[dict] = None,
+                 sorted_values: Optional[dict] = None,
+                 derived: Optional[dict] = None):
+        self.columns = columns
+        self.strings = strings
+        self.flags = flags
+        self.size = len(strings['address'])
+        self.generation = 0
+        self._pools = None
+        self._row_index = None
+        self._mint_index = None
+        self._search_index = None
+        self._sort_ranks = {}
+
+        # Derived columns and indexes are rebuilt unless supplied (e.g. loaded
+        # from disk); files written before a derived column existed lack it
+        if derived is None or set(derived) != set(DERIVED_COLUMNS):
+            derived = compute_derived_metrics(columns, strings)
+        self.derived = derived
+        self.sort_orders = sort_orders if sort_orders is not None else self._build_sort_orders()
+        self._sorted_values = sorted_values if sorted_values is not None else {
+            column: np.sort(self.columns[column])
+            for column in COUNTABLE_COLUMNS.values()
+        }
+
+    @classmethod
+    def from_pools(cls, pools: Optional[List[PoolRecord]]) -> 'PoolSnapshot':
+        """
+        Build a snapshot from a list of pool records
+
+        The records are copied into columns and not kept.
+        """
+        pools = list(pools or [])
+        size = len(pools)
+        columns = {
+            name: np.fromiter(
+                (getattr(pool, name) for pool in pools),
+                dtype=np.float64,
+                count=size
+            )
+            for name in NUMERIC_FIELDS
+        }
+        strings = {
+            name: np.array([getattr(pool, name) for pool in pools], dtype=object)
+            for name in STRING_FIELDS
+        }
+        flags = {
+            name: np.fromiter(
+                (getattr(pool, name) for pool in pools),
+                dtype=bool,
+                count=size
+            )
+            for name in FLAG_FIELDS
+        }
+        return cls(columns, strings, flags)
+
+    @classmethod
+    def from_arrays(cls, arrays: dict, strings: dict) -> 'PoolSnapshot':
+        """Rebuild a snapshot from export_arrays() output"""
+        def section(prefix):
+            return {
+                name[len(prefix):]: array
+                for name, array in arrays.items()
+                if name.startswith(prefix)
+            }
+
+        return cls(
+            columns=section('columns/'),
+            strings={name: np.array(values, dtype=object) for name, values in strings.items()},
+            flags={name: array.astype(bool, copy=False) for name, array in section('flags/').items()},
+            sort_orders=section('orders/'),
+            sorted_values=section('sorted/'),
+            derived=section('derived/')
+        )
+
+    def export_arrays(self):
+        """
+        Flat view of the snapshot for persistence
+
+        Returns:
+            tuple: ({name: ndarray}, {string_column: list of str})
+        """
+        arrays = {}
+        arrays.update({f'columns/{name}': array for name, array in self.columns.items()})
+        arrays.update({f'flags/{name}': array.astype(np.uint8) for name, array in self.flags.items()})
+        arrays.update({f'orders/{name}': array for name, array in self.sort_orders.items()})
+        arrays.update({f'sorted/{name}': array for name, array in self._sorted_values.items()})
+        arrays.update({f'derived/{name}': array for name, array in self.derived.items()})
+        strings = {name: list(values) for name, values in self.strings.items()}
+        return arrays, strings
+
+    @property
+    def pools(self) -> List[PoolRecord]:
+        """PoolRecord per row (built on first use)"""
+        if self._pools is None:
+            names = STRING_FIELDS + tuple(NUMERIC_FIELDS) + FLAG_FIELDS
+            values = (
+                [list(self.strings[name]) for name in STRING_FIELDS]
+                + [self.columns[name].tolist() for name in NUMERIC_FIELDS]
+                + [self.flags[name].tolist() for name in FLAG_FIELDS]
+            )
+            self._pools = [PoolRecord(**dict(zip(names, row))) for row in zip(*values)]
+        return self._pools
+
+    def record(self, index: int) -> PoolRecord:
+        """PoolRecord for one row"""
+        return PoolRecord(**{
+            name: self.value(name, index)
+            for name in STRING_FIELDS + tuple(NUMERIC_FIELDS) + FLAG_FIELDS
+        })
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def row_index(self) -> dict:
+        """Pool address -> row (built on first use)"""
+        if self._row_index is None:
+            self._row_index = {address: i for i, address in enumerate(self.strings['address'])}
+        return self._row_index
+
+    @property
+    def mint_index(self) -> dict:
+        """Token mint -> ascending row array of pools containing it (built on first use)"""
+        if self._mint_index is None:
+            rows_by_mint = {}
+            for i, (mint_x, mint_y) in enumerate(zip(self.strings['mint_x'], self.strings['mint_y'])):
+                rows_by_mint.setdefault(mint_x, []).append(i)
+                if mint_y != mint_x:
+                    rows_by_mint.setdefault(mint_y, []).append(i)
+            self._mint_index = {
+                mint: np.array(rows, dtype=np.int64)
+                for mint, rows in rows_by_mint.items()
+            }
+        return self._mint_index
+
+    @property
+    def search_index(self) -> NameSearchIndex:
+        """N-gram index over pair names (built on first use)"""
+        if self._search_index is None:
+            self._search_index = NameSearchIndex(self.strings['name'])
+        return self._search_index
+
+    def build_indexes(self):
+        """Build the lookup indexes now (keeps the cost off the request path)"""
+        self.row_index
+        self.mint_index
+        self.search_index
+
+    def find(self, address: str) -> Optional[int]:
+        """Row of a pool address (None if not in the snapshot)"""
+        return self.row_index.get(address)
+
+    def rows_for_mints(self, mints: Iterable[str], both: bool = False) -> np.ndarray:
+        """
+        Ascending rows of pools containing the given mints
+
+        Costs O(pools per mint) through mint_index instead of a full scan.
+
+        Args:
+            mints: Mint addresses to match
+            both: Require both mint_x and mint_y to be in `mints`
+                (default: either one)
+        """
+        mints = set(mints)
+        index = self.mint_index
+        parts = [index[mint] for mint in mints if mint in index]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+
+        rows = np.unique(np.concatenate(parts))
+        if both:
+            mint_x = self.strings['mint_x']
+            mint_y = self.strings['mint_y']
+            rows = rows[np.fromiter(
+                (mint_x[i] in mints and mint_y[i] in mints for i in rows),
+                dtype=bool,
+                count=len(rows)
+            )]
+        return rows
+
+    def column(self, name: str) -> np.ndarray:
+        """Get a numeric, derived or string column by name"""
+        if name in self.columns:
+            return self.columns[name]
+        if name in self.derived:
+            return self.derived[name]
+        return self.strings[name]
+
+    def _build_sort_orders(self) -> dict:
+        """
+        Descending row order per sort key
+
+        Stable, so pools with equal keys keep their upstream order (same as
+        sorted(..., reverse=True) over the pool list).
+        """
+        orders = {}
+        for key in SORT_KEYS:
+            if key == 'name':
+                names = self.strings['name']
+                orders[key] = np.array(
+                    sorted(range(self.size), key=lambda i: str(names[i]), reverse=True),
+                    dtype=np.int64
+                )
+                continue
+
+            if key == 'fee_rate_30min':
+                values = self.derived['fee_rate_30min_ranked']
+            else:
+                values = self.columns[key]
+            orders[key] = np.argsort(-values, kind='stable')
+        return orders
+
+    def sort_order(self, sort_by: str) -> np.ndarray:
+        """Precomputed descending order (defaults to fee_rate_30min)"""
+        return self.sort_orders.get(sort_by, self.sort_orders[SORT_KEYS[0]])
+
+    def sort_rank(self, sort_by: str) -> np.ndarray:
+        """Position of each row in sort_order(sort_by) (inverse permutation)"""
+        key = sort_by if sort_by in self.sort_orders else SORT_KEYS[0]
+        rank = self._sort_ranks.get(key)
+        if rank is None:
+            order = self.sort_orders[key]
+            rank = np.empty(self.size, dtype=np.int64)
+            rank[order] = np.arange(self.size, dtype=np.int64)
+            self._sort_ranks[key] = rank
+        return rank
+
+    def search_rows(self, search_term: str) -> np.ndarray:
+        """Ascending rows whose pair name contains search_term (case-insensitive)"""
+        return self.search_index.search(search_term)
+
+    def search_mask(self, search_term: str) -> np.ndarray:
+        """Case-insensitive substring match on pair name"""
+        result = np.zeros(self.size, dtype=bool)
+        result[self.search_rows(search_term)] = True
+        return result
+
+    def mint_mask(self, mints: Iterable[str], both: bool = False) -> np.ndarray:
+        """
+        Match pools by token mint
+
+        Args:
+            mints: Mint addresses to match
+            both: Require both mint_x and mint_y to be in `mints`
+                (default: either one)
+        """
+        result = np.zeros(self.size, dtype=bool)
+        result[self.rows_for_mints(mints, both=both)] = True
+        return result
+
+    def mask(self, search_term: str = None, min_liquidity: float = 0,
+             min_volume_24h: float = 0, min_volume_30min: float = 0,
+             min_fees_30min: float = 0) -> np.ndarray:
+        """Combined boolean mask for the common numeric/search filters"""
+        result = np.ones(self.size, dtype=bool)
+
+        if min_liquidity > 0:
+            result &= self.columns['liquidity'] >= min_liquidity
+        if min_volume_24h > 0:
+            result &= self.columns['volume_hour_24'] >= min_volume_24h
+        if min_volume_30min > 0:
+            result &= self.columns['volume_min_30'] >= min_volume_30min
+        if min_fees_30min > 0:
+            result &= self.columns['fees_min_30'] >= min_fees_30min
+        if search_term:
+            result &= self.search_mask(search_term)
+
+        return result
+
+    def filter_rows(self, idx: np.ndarray, search_term: str = None, min_liquidity: float = 0,
+                    min_volume_24h: float = 0, min_volume_30min: float = 0,
+                    min_fees_30min: float = 0) -> np.ndarray:
+        """Same filters as mask(), applied to a subset of rows (order kept)"""
+        selected = np.ones(len(idx), dtype=bool)
+        if min_liquidity > 0:
+            selected &= self.columns['liquidity'][idx] >= min_liquidity
+        if min_volume_24h > 0:
+            selected &= self.columns['volume_hour_24'][idx] >= min_volume_24h
+        if min_volume_30min > 0:
+            selected &= self.columns['volume_min_30'][idx] >= min_volume_30min
+        if min_fees_30min > 0:
+            selected &= self.columns['fees_min_30'][idx] >= min_fees_30min
+        if search_term:
+            term = search_term.upper()
+            names = self.search_index.names
+            selected &= np.fromiter(
+                (term in names[i] for i in idx),
+                dtype=bool,
+                count=len(idx)
+            )
+        return idx[selected]
+
+    def _search_matches(self, search_term, min_liquidity=0, min_volume_24h=0) -> np.ndarray:
+        """Ascending rows matching a search plus the numeric /api/pairs filters"""
+        return self.filter_rows(
+            self.search_rows(search_term),
+            min_liquidity=min_liquidity,
+            min_volume_24h=min_volume_24h
+        )
+
+    def count(self, search_term=None, min_liquidity=0, min_volume_24h=0) -> int:
+        """
+        Number of rows matching the /api/pairs filters
+
+        Searches only look at the search index candidates. A single numeric
+        threshold is answered with a binary search on the pre-sorted column;
+        combinations fall back to a vectorized mask.
+        """
+        if search_term:
+            return len(self._search_matches(search_term, min_liquidity, min_volume_24h))
+
+        thresholds = {
+            name: value
+            for name, value in (('min_liquidity', min_liquidity), ('min_volume_24h', min_volume_24h))
+            if value > 0
+        }
+
+        if not search_term and not thresholds:
+            return self.size
+
+        if not search_term and len(thresholds) == 1:
+            name, value = next(iter(thresholds.items()))
+            sorted_values = self._sorted_values[COUNTABLE_COLUMNS[name]]
+            return int(self.size - np.searchsorted(sorted_values, value, side='left'))
+
+        return int(np.count_nonzero(self.mask(
+            search_term=search_term,
+            min_liquidity=min_liquidity,
+            min_volume_24h=min_volume_24h
+        )))
+
+    def page_indices(self, sort_by: str, page: int, limit: int, search_term=None,
+                     min_liquidity=0, min_volume_24h=0):
+        """
+        Row indices for one page of /api/pairs
+
+        With a search term, the search index candidates are filtered and
+        ordered by their rank in the sort order - cost depends on the number
+        of matches, not on the snapshot size.
+
+        Otherwise walks the precomputed sort order and applies filters
+        lazily, in growing chunks, until the page is full - page 1 costs
+        roughly O(limit) instead of filtering and sorting the whole snapshot.
+
+        Returns:
+            tuple: (page_indices, total_matching)
+        """
+        order = self.sort_order(sort_by)
+        start = max(page - 1, 0) * limit
+        end = start + limit
+
+        if search_term:
+            matches = self._search_matches(search_term, min_liquidity, min_volume_24h)
+            ranked = matches[np.argsort(self.sort_rank(sort_by)[matches])]
+            return ranked[start:end], len(matches)
+
+        total = self.count(min_liquidity=min_liquidity, min_volume_24h=min_volume_24h)
+
+        if min_liquidity <= 0 and min_volume_24h <= 0:
+            return order[start:end], total
+
+        return self._walk_order(order, 0, end, min_liquidity, min_volume_24h)[start:end], total
+
+    def page_after(self, sort_by: str, position: int, limit: int, search_term=None,
+                   min_liquidity=0, min_volume_24h=0) -> np.ndarray:
+        """
+        Keyset page: the next `limit` matching rows after a sort position
+
+        `position` is the sort_rank() of the last row already returned (-1
+        for the first page), so a deep page starts right where the previous
+        one ended instead of re-walking everything before it.
+
+        Returns:
+            np.ndarray: Row indices in sort order
+        """
+        order = self.sort_order(sort_by)
+        start = max(position + 1, 0)
+
+        if search_term:
+            matches = self._search_matches(search_term, min_liquidity, min_volume_24h)
+            ranks = np.sort(self.sort_rank(sort_by)[matches])
+            ranks = ranks[np.searchsorted(ranks, start):][:limit]
+            return order[ranks]
+
+        if min_liquidity <= 0 and min_volume_24h <= 0:
+            return order[start:start + limit]
+
+        return self._walk_order(order, start, limit, min_liquidity, min_volume_24h)[:limit]
+
+    def _walk_order(self, order, position, needed, min_liquidity, min_volume_24h) -> np.ndarray:
+        """
+        Filtered rows of order[position:] in growing chunks, until at least
+        `needed` rows match (or the order runs out)
+        """
+        matches = []
+        found = 0
+        chunk = max(needed * 2, 256)
+        while found < needed and position < self.size:
+            selected = self.filter_rows(
+                order[position:position + chunk],
+                min_liquidity=min_liquidity,
+                min_volume_24h=min_volume_24h
+            )
+            matches.append(selected)
+            found += len(selected)
+            position += chunk
+            chunk *= 2
+
+        if not matches:
+            return order[:0]
+        return np.concatenate(matches)
+
+    def indices(self, mask: np.ndarray) -> np.ndarray:
+        """Row indices where mask is True"""
+        return np.flatnonzero(mask)
+
+    def value(self, name: str, index: int):
+        """Single value as a plain Python type (JSON-safe)"""
+        if name in self.columns:
+            return float(self.columns[name][index])
+        if name in self.derived:
+            return self.derived[name][index].item()
+        if name in self.flags:
+            return bool(self.flags[name][index])
+        return self.strings[name][index]
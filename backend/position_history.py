@@ -0,0 +1,114 @@
+"""
+Position History Fetcher
+Deposit/withdraw history for DLMM positions, fetched concurrently on a
+bounded worker pool under one deadline per API request, so a wallet with
+many positions costs about one upstream round trip instead of two per
+position
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+
+from meteora_http import METEORA_API_BASE, get_session
+
+logger = logging.getLogger(__name__)
+
+HISTORY_KINDS = ('deposits', 'withdraws')
+
+# Concurrent upstream requests per process (shared by all API requests)
+POSITION_HISTORY_WORKERS = max(int(os.getenv('POSITION_HISTORY_WORKERS', 8)), 1)
+# Timeout of a single upstream request
+POSITION_HISTORY_TIMEOUT = float(os.getenv('POSITION_HISTORY_TIMEOUT', 5))
+# Budget for all history requests of one API request
+POSITION_HISTORY_DEADLINE = float(os.getenv('POSITION_HISTORY_DEADLINE', 8))
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Process-wide worker pool (recreated after fork - threads do not survive it)"""
+    global _executor, _executor_pid
+
+    pid = os.getpid()
+    if _executor is not None and _executor_pid == pid:
+        return _executor
+
+    with _executor_lock:
+        if _executor is None or _executor_pid != pid:
+            _executor = ThreadPoolExecutor(max_workers=POSITION_HISTORY_WORKERS, thread_name_prefix='position-history')
+            _executor_pid = pid
+    return _executor
+
+
+def _fetch_history(position_address: str, kind: str, deadline: float) -> list:
+    """One history list; the timeout never reaches past the deadline"""
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError('deadline passed before the request started')
+
+    response = get_session().get(
+        f'{METEORA_API_BASE}/position/{position_address}/{kind}',
+        timeout=min(POSITION_HISTORY_TIMEOUT, remaining)
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def fetch_position_histories(position_addresses: List[str],
+                             deadline_seconds: Optional[float] = None) -> Dict[str, dict]:
+    """
+    Fetch deposits and withdraws of every position concurrently
+
+    Args:
+        position_addresses: Position account addresses
+        deadline_seconds: Budget for all requests (default POSITION_HISTORY_DEADLINE)
+
+    Returns:
+        dict: position address -> {'deposits': list or None,
+                                   'withdraws': list or None,
+                                   'complete': bool}
+        A list is None when its request failed or missed the deadline;
+        'complete' is True only if both lists were fetched.
+    """
+    if deadline_seconds is None:
+        deadline_seconds = POSITION_HISTORY_DEADLINE
+
+    start = time.monotonic()
+    deadline = start + deadline_seconds
+    executor = _get_executor()
+
+    futures = {
+        (address, kind): executor.submit(_fetch_history, address, kind, deadline)
+        for address in dict.fromkeys(position_addresses)
+        for kind in HISTORY_KINDS
+    }
+    _, not_done = wait(futures.values(), timeout=deadline_seconds)
+    for future in not_done:
+        future.cancel()
+
+    histories = {}
+    failures = 0
+    for (address, kind), future in futures.items():
+        history = histories.setdefault(address, {'complete': True})
+        history[kind] = None
+        if future in not_done:
+            logger.warning(f"  {kind} of position {address} missed the {deadline_seconds}s deadline")
+        elif future.exception() is not None:
+            logger.error(f"  Error fetching {kind} of position {address}: {future.exception()}")
+        else:
+            history[kind] = future.result()
+            continue
+        history['complete'] = False
+        failures += 1
+
+    logger.info(
+        f"Fetched history of {len(histories)} positions ({len(futures)} requests, "
+        f"{failures} failed or timed out) in {time.monotonic() - start:.2f}s"
+    )
+    return histories
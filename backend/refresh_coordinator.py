@@ -0,0 +1,130 @@
+"""
+Upstream Refresh Coordinator
+Single-flight fetches with a minimum interval per upstream resource, shared
+by PoolDataCache and GroupedPoolCache so concurrent (or forced) refreshes
+never turn into back-to-back downloads of the same data
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """One in-progress fetch and its outcome"""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class RefreshCoordinator:
+    """
+    Collapses concurrent refreshes of the same key into one upstream fetch
+
+    - The first caller for a key runs the fetch; callers arriving while it
+      is in flight wait for it and get the same result (or exception).
+    - A new fetch for a key is only started `min_interval_seconds` after
+      the previous one finished - forced or not. Within the interval the
+      caller's `cached` value is served instead (if there is one).
+    """
+
+    def __init__(self, min_interval_seconds: float):
+        self.min_interval_seconds = min_interval_seconds
+        self._lock = threading.Lock()
+        self._flights = {}
+        self._finished_at = {}  # key -> time.monotonic() of the last completed fetch
+
+        self.stats = {
+            'upstream_fetches': 0,
+            'upstream_fetch_failures': 0,
+            'coalesced_waiters': 0,  # Callers that joined an in-flight fetch
+            'suppressed_forces': 0,  # Forced refreshes answered from cache (min interval)
+            'suppressed_refreshes': 0  # Regular refreshes answered from cache (min interval)
+        }
+
+    def run(self, key: Hashable, fetch: Callable, force: bool = False, cached: Optional[Callable] = None):
+        """
+        Fetch `key` once for all concurrent callers
+
+        Args:
+            key: Upstream resource identifier
+            fetch: Does the upstream fetch; its return value goes to every
+                caller coalesced onto it
+            force: Caller asked for a forced refresh (only affects stats)
+            cached: Returns the currently cached value; served when the
+                minimum interval has not elapsed. None = nothing cached,
+                always fetch.
+
+        Returns:
+            Result of `fetch` (or of `cached` when suppressed)
+        """
+        leader = False
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.stats['coalesced_waiters'] += 1
+            elif cached is not None and self._seconds_until_allowed(key) > 0:
+                self.stats['suppressed_forces' if force else 'suppressed_refreshes'] += 1
+            else:
+                flight = _Flight()
+                self._flights[key] = flight
+                leader = True
+
+        if flight is None:
+            logger.info(f"Refresh of {key} suppressed - last upstream fetch under {self.min_interval_seconds}s ago")
+            return cached()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fetch()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                self.stats['upstream_fetch_failures'] += 1
+            raise
+        finally:
+            with self._lock:
+                self.stats['upstream_fetches'] += 1
+                self._finished_at[key] = time.monotonic()
+                del self._flights[key]
+            flight.done.set()
+
+    def _seconds_until_allowed(self, key: Hashable) -> float:
+        finished_at = self._finished_at.get(key)
+        if finished_at is None:
+            return 0
+        return max(self.min_interval_seconds - (time.monotonic() - finished_at), 0)
+
+    def seconds_until_allowed(self, key: Hashable) -> float:
+        """Seconds before a new upstream fetch of `key` may start (0 = now)"""
+        with self._lock:
+            return self._seconds_until_allowed(key)
+
+    def forget(self, key: Hashable):
+        """
+        Drop the bookkeeping kept for `key` (e.g. when its cached data is
+        evicted); an in-flight fetch is left alone and cleans up after itself
+        """
+        with self._lock:
+            self._finished_at.pop(key, None)
+
+    def get_stats(self) -> dict:
+        """Get coordinator statistics"""
+        return {
+            **self.stats,
+            'fetches_in_flight': len(self._flights),
+            'min_fetch_interval_seconds': self.min_interval_seconds
+        }
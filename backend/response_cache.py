@@ -0,0 +1,86 @@
+"""
+Serialized Response Cache
+Keeps encoded JSON bodies for repeated API queries, so a repeat request is
+a straight bytes write instead of filter + row building + jsonify
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    LRU of encoded response bodies within a byte budget
+
+    Keys must include the pool snapshot generation, so an entry can never
+    outlive the data it was built from; flush() drops everything once a new
+    snapshot is published.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Hashable, bytes]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'flushes': 0,
+            'oversized': 0  # Bodies larger than the whole budget (not cached)
+        }
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Cached body for key (None on miss)"""
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return body
+
+    def put(self, key: Hashable, body: bytes):
+        """Store a body, evicting least recently used entries over budget"""
+        if len(body) > self.max_bytes:
+            self.stats['oversized'] += 1
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+
+            self._entries[key] = body
+            self._bytes += len(body)
+
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.stats['evictions'] += 1
+
+    def flush(self, *_):
+        """Drop all entries (usable directly as a snapshot listener)"""
+        with self._lock:
+            if self._entries:
+                logger.debug(f"Response cache flushed ({len(self._entries)} entries, {self._bytes} bytes)")
+            self._entries.clear()
+            self._bytes = 0
+            self.stats['flushes'] += 1
+
+    def get_stats(self) -> dict:
+        """Get cache statistics"""
+        total = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'hit_rate_percent': round(self.stats['hits'] / total * 100, 2) if total else 0
+        }
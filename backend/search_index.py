@@ -0,0 +1,87 @@
+"""
+Pair Name Search Index
+N-gram inverted index over normalized pair names, built once per snapshot,
+so substring search costs O(candidates) instead of a scan over every pool
+"""
+
+import logging
+from typing import List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Longest n-gram indexed; longer terms are answered from their rarest n-gram
+MAX_GRAM = 3
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+
+def normalize(text: str) -> str:
+    """Normalization shared by indexing and querying (case-insensitive)"""
+    return text.upper()
+
+
+class NameSearchIndex:
+    """
+    Case-insensitive substring search over pair names
+
+    Every 1..MAX_GRAM-character substring of each normalized name maps to the
+    ascending rows containing it. Terms up to MAX_GRAM characters are answered
+    directly from their posting list; longer terms take the rarest of their
+    MAX_GRAM-grams as candidates and verify the full substring on those only.
+    Pair names embed the token symbols (e.g. "JUP-SOL"), so symbol searches
+    are covered too.
+    """
+
+    def __init__(self, names: List[str]):
+        self.names = [normalize(name) for name in names]
+
+        postings = {}
+        for i, name in enumerate(self.names):
+            grams = {
+                name[start:start + size]
+                for size in range(1, MAX_GRAM + 1)
+                for start in range(len(name) - size + 1)
+            }
+            for gram in grams:
+                postings.setdefault(gram, []).append(i)
+
+        self._postings = {
+            gram: np.array(rows, dtype=np.int64)
+            for gram, rows in postings.items()
+        }
+
+    def __len__(self):
+        return len(self.names)
+
+    def search(self, term: str) -> np.ndarray:
+        """
+        Rows whose name contains `term`
+
+        Returns:
+            np.ndarray: Ascending row indices
+        """
+        term = normalize(term)
+        if not term:
+            return np.arange(len(self.names), dtype=np.int64)
+
+        if len(term) <= MAX_GRAM:
+            return self._postings.get(term, _EMPTY)
+
+        candidates = min(
+            (
+                self._postings.get(term[start:start + MAX_GRAM], _EMPTY)
+                for start in range(len(term) - MAX_GRAM + 1)
+            ),
+            key=len
+        )
+        if not len(candidates):
+            return _EMPTY
+
+        names = self.names
+        return candidates[np.fromiter(
+            (term in names[i] for i in candidates),
+            dtype=bool,
+            count=len(candidates)
+        )]
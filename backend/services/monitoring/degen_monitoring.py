@@ -15,19 +15,11 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from models import get_db, User, DegenConfig
 from telegram_bot import telegram_bot_handler
-from pool_cache import get_cached_pools
+from pool_cache import get_cached_snapshot
 
 logger = logging.getLogger(__name__)
 
 
-def safe_float(value, default=0.0):
-    """Safely convert value to float, returning default if conversion fails"""
-    try:
-        return float(value) if value is not None else default
-    except (ValueError, TypeError):
-        return default
-
-
 def get_token_prices(mints):
     """
     Fetch token prices from Jupiter API
@@ -312,46 +304,41 @@ class DegenMonitoringService:
                 logger.warning(f"No Telegram linked for {wallet_address}")
                 return
 
-            # Fetch all pools from cache
-            pools = get_cached_pools()
-            if not pools:
+            # Fetch columnar pool snapshot from cache
+            snapshot = get_cached_snapshot()
+            if snapshot is None or not len(snapshot):
                 logger.error("Failed to fetch pools from cache")
                 return
 
             # Filter pools by fee rate threshold
             threshold = float(config.min_fee_rate_threshold)
-            high_fee_pools = []
 
-            for pool in pools:
-                # Extract pool data
-                fees_obj = pool.get('fees', {})
-                volume_obj = pool.get('volume', {})
-                tvl = safe_float(pool.get('liquidity', 0))
-                fees_30min = safe_float(fees_obj.get('min_30', 0))
-                volume_24h = safe_float(volume_obj.get('hour_24', 0))
-
-                # Match Analytics table default filters:
-                # - TVL >= $10,000
-                # - Volume 24h >= $25,000
-                # - Fees 30min >= $100
-                if tvl >= 10000 and volume_24h >= 25000 and fees_30min >= 100:
-                    # Calculate 30-minute fee rate (same as Analytics table)
-                    fee_rate = (fees_30min / tvl) * 100
-
-                    if fee_rate >= threshold:
-                        high_fee_pools.append({
-                            'address': pool['address'],
-                            'name': pool['name'],
-                            'mint_x': pool.get('mint_x'),
-                            'mint_y': pool.get('mint_y'),
-                            'current_price': safe_float(pool.get('current_price', 0)),
-                            'tvl': tvl,
-                            'fees_30min': fees_30min,
-                            'volume_24h': volume_24h,
-                            'fee_rate': round(fee_rate, 2),
-                            'bin_step': pool.get('bin_step', 0),
-                            'base_fee': safe_float(pool.get('base_fee_percentage', 0))
-                        })
+            # Match Analytics table default filters:
+            # - TVL >= $10,000
+            # - Volume 24h >= $25,000
+            # - Fees 30min >= $100
+            mask = snapshot.mask(min_liquidity=10000, min_volume_24h=25000, min_fees_30min=100)
+
+            # 30-minute fee rate precomputed with the snapshot (same as Analytics table)
+            fee_rates = snapshot.derived['fee_rate_30min']
+            mask &= fee_rates >= threshold
+
+            cols = snapshot.columns
+            high_fee_pools = []
+            for i in snapshot.indices(mask):
+                high_fee_pools.append({
+                    'address': snapshot.strings['address'][i],
+                    'name': snapshot.strings['name'][i],
+                    'mint_x': snapshot.strings['mint_x'][i],
+                    'mint_y': snapshot.strings['mint_y'][i],
+                    'current_price': float(cols['current_price'][i]),
+                    'tvl': float(cols['liquidity'][i]),
+                    'fees_30min': float(cols['fees_min_30'][i]),
+                    'volume_24h': float(cols['volume_hour_24'][i]),
+                    'fee_rate': round(float(fee_rates[i]), 2),
+                    'bin_step': int(cols['bin_step'][i]),
+                    'base_fee': float(cols['base_fee_percentage'][i])
+                })
 
             # Sort by fee rate (highest first)
             high_fee_pools.sort(key=lambda x: x['fee_rate'], reverse=True)
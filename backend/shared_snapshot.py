@@ -0,0 +1,117 @@
+"""
+Shared Pool Snapshot Channel
+Lets several processes (e.g. gunicorn workers) share one pool snapshot:
+one process owns the upstream refresh and publishes each snapshot into a
+shared directory, every other process maps the published file read-only
+
+Files in the shared directory:
+- snapshot.bin: latest published snapshot (see snapshot_store.py)
+- refresh.lock: flock held by the owner process for its lifetime
+- refresh.request: touched by non-owners to ask for a forced refresh
+
+Use a tmpfs path such as /dev/shm/meteora-pools so the mapped numeric
+columns live in shared memory pages instead of being copied per worker.
+"""
+
+import fcntl
+import logging
+import os
+from datetime import datetime
+from typing import Optional, Tuple
+
+from pool_snapshot import PoolSnapshot
+from snapshot_store import read_snapshot, write_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+class SharedSnapshotChannel:
+    """Publish/subscribe for PoolSnapshot across processes via mmap'd files"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.snapshot_file = os.path.join(directory, 'snapshot.bin')
+        self.lock_file = os.path.join(directory, 'refresh.lock')
+        self.request_file = os.path.join(directory, 'refresh.request')
+
+        self._lock_fd = None
+        self._lock_pid = None
+        self._owner_pid = None
+        self._seen_key = None  # (inode, mtime_ns) of the last file we read or wrote
+
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def is_owner(self) -> bool:
+        """True if this process holds the refresh lock"""
+        return self._owner_pid == os.getpid()
+
+    def try_acquire_ownership(self) -> bool:
+        """
+        Try to become the refreshing process (non-blocking)
+
+        The lock is released by the kernel when the owner exits, so another
+        process takes over on its next attempt.
+        """
+        pid = os.getpid()
+        if self._owner_pid == pid:
+            return True
+
+        if self._lock_pid != pid:
+            # Never reuse a descriptor inherited across fork - flock is tied
+            # to the open file description, which the parent still shares
+            self._lock_fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+            self._lock_pid = pid
+
+        try:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+
+        self._owner_pid = pid
+        logger.info(f"Process {pid} now owns the shared pool refresh ({self.directory})")
+        return True
+
+    def _file_key(self) -> Optional[Tuple[int, int]]:
+        """Identity of the currently published file (None if missing)"""
+        try:
+            stat = os.stat(self.snapshot_file)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns
+
+    def publish(self, snapshot: PoolSnapshot, metadata: dict) -> int:
+        """Atomically replace the published snapshot (owner only)"""
+        written = write_snapshot(self.snapshot_file, snapshot, metadata=metadata)
+        self._seen_key = self._file_key()
+        return written
+
+    def poll(self) -> Optional[Tuple[PoolSnapshot, dict]]:
+        """
+        Map the published snapshot if it changed since the last poll
+
+        Costs one stat() when nothing changed.
+
+        Returns:
+            tuple: (PoolSnapshot, metadata) or None if unchanged/missing
+        """
+        key = self._file_key()
+        if key is None or key == self._seen_key:
+            return None
+
+        snapshot, metadata = read_snapshot(self.snapshot_file)
+        self._seen_key = key
+        return snapshot, metadata
+
+    def request_refresh(self):
+        """Ask the owner process for a forced refresh"""
+        with open(self.request_file, 'a'):
+            os.utime(self.request_file, None)
+
+    def refresh_requested_since(self, since: Optional[datetime]) -> bool:
+        """Check whether a refresh was requested after `since` (UTC)"""
+        try:
+            requested_at = datetime.utcfromtimestamp(os.stat(self.request_file).st_mtime)
+        except FileNotFoundError:
+            return False
+        return since is None or requested_at > since
@@ -0,0 +1,84 @@
+"""
+Snapshot Broadcaster
+Wakes long-lived stream connections (/api/pairs/stream) when the pool cache
+accepts a new snapshot generation, so idle clients block on a condition
+instead of polling
+"""
+
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class SnapshotBroadcaster:
+    """
+    Generation counter plus condition variable shared by stream subscribers
+
+    Register publish() as a PoolDataCache snapshot listener. Each subscriber
+    calls wait() with the last generation it sent and is woken as soon as a
+    newer one is published (or on timeout, to send a keep-alive).
+
+    Every open stream pins one server thread, so at most `max_subscribers`
+    streams are admitted; the rest are refused and should fall back to
+    polling /api/pairs/changes.
+    """
+
+    def __init__(self, max_subscribers: int):
+        self.max_subscribers = max_subscribers
+        self._condition = threading.Condition()
+        self._generation = 0
+        self._subscribers = 0
+
+        self.stats = {
+            'publishes': 0,
+            'subscriptions': 0,
+            'rejected_subscriptions': 0,
+            'messages_sent': 0
+        }
+
+    def publish(self, snapshot):
+        """Announce a new snapshot generation (snapshot listener callback)"""
+        with self._condition:
+            self._generation = max(self._generation, snapshot.generation)
+            self.stats['publishes'] += 1
+            self._condition.notify_all()
+
+    def subscribe(self) -> bool:
+        """Take a subscriber slot (False if all are in use)"""
+        with self._condition:
+            if self._subscribers >= self.max_subscribers:
+                self.stats['rejected_subscriptions'] += 1
+                return False
+            self._subscribers += 1
+            self.stats['subscriptions'] += 1
+            return True
+
+    def unsubscribe(self):
+        """Release a slot taken by subscribe()"""
+        with self._condition:
+            self._subscribers = max(self._subscribers - 1, 0)
+
+    def wait(self, generation: int, timeout: float) -> bool:
+        """
+        Block until a generation newer than `generation` is published
+
+        Returns:
+            bool: True if one was published, False on timeout
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._generation > generation, timeout=timeout)
+
+    def message_sent(self):
+        """Count one message delivered to a subscriber"""
+        with self._condition:
+            self.stats['messages_sent'] += 1
+
+    def get_stats(self) -> dict:
+        """Get broadcaster statistics"""
+        return {
+            **self.stats,
+            'subscribers': self._subscribers,
+            'max_subscribers': self.max_subscribers,
+            'generation': self._generation
+        }
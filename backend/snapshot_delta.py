@@ -0,0 +1,142 @@
+"""
+Pool Snapshot Deltas
+Diffs consecutive PoolSnapshots so clients and monitors can ask for what
+moved since a generation instead of re-reading the whole pool list
+"""
+
+import logging
+from collections import deque
+from typing import List, Optional, Set, Tuple
+
+import numpy as np
+
+from pool_record import WINDOWS
+from pool_snapshot import PoolSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Columns compared between snapshots
+DELTA_FIELDS = (
+    ('current_price', 'liquidity')
+    + tuple(f'fees_{window}' for window in WINDOWS)
+    + tuple(f'volume_{window}' for window in WINDOWS)
+)
+
+
+class SnapshotDelta:
+    """Pools added, changed and removed between two snapshot generations"""
+
+    __slots__ = ('generation', 'previous_generation', 'added', 'changed', 'removed')
+
+    def __init__(self, generation: int, previous_generation: int,
+                 added: List[str], changed: List[str], removed: List[str]):
+        self.generation = generation
+        self.previous_generation = previous_generation
+        self.added = added
+        self.changed = changed
+        self.removed = removed
+
+    def __repr__(self):
+        return (f"SnapshotDelta({self.previous_generation}->{self.generation}: "
+                f"+{len(self.added)} ~{len(self.changed)} -{len(self.removed)})")
+
+
+def compute_delta(previous: PoolSnapshot, current: PoolSnapshot, epsilon: float = 0.0) -> SnapshotDelta:
+    """
+    Diff two snapshots by pool address
+
+    A pool counts as changed when any DELTA_FIELDS value moved by more than
+    `epsilon` relative to the larger magnitude of old/new (0 = any change).
+
+    Args:
+        previous: Older snapshot
+        current: Newer snapshot
+        epsilon: Relative change threshold
+
+    Returns:
+        SnapshotDelta: Address lists (added, changed, removed)
+    """
+    previous_rows = previous.row_index
+    current_addresses = current.strings['address']
+
+    matches = np.fromiter(
+        (previous_rows.get(address, -1) for address in current_addresses),
+        dtype=np.int64,
+        count=current.size
+    )
+    common = matches >= 0
+    current_idx = np.flatnonzero(common)
+    previous_idx = matches[common]
+
+    moved = np.zeros(len(current_idx), dtype=bool)
+    for name in DELTA_FIELDS:
+        old = previous.columns[name][previous_idx]
+        new = current.columns[name][current_idx]
+        moved |= np.abs(new - old) > epsilon * np.maximum(np.abs(old), np.abs(new))
+
+    current_rows = current.row_index
+    return SnapshotDelta(
+        generation=current.generation,
+        previous_generation=previous.generation,
+        added=current_addresses[~common].tolist(),
+        changed=current_addresses[current_idx[moved]].tolist(),
+        removed=[address for address in previous.strings['address'] if address not in current_rows]
+    )
+
+
+class DeltaLog:
+    """Bounded history of consecutive snapshot deltas"""
+
+    def __init__(self, max_deltas: int):
+        self._deltas = deque(maxlen=max_deltas)
+
+    def __len__(self):
+        return len(self._deltas)
+
+    @property
+    def oldest_generation(self) -> Optional[int]:
+        """Oldest generation a client can still catch up from"""
+        deltas = list(self._deltas)
+        return deltas[0].previous_generation if deltas else None
+
+    def append(self, delta: SnapshotDelta):
+        """Record a delta (history restarts if generations don't chain)"""
+        if self._deltas and delta.previous_generation != self._deltas[-1].generation:
+            self._deltas.clear()
+        self._deltas.append(delta)
+
+    def clear(self):
+        self._deltas.clear()
+
+    def since(self, generation: int, current_generation: int) -> Optional[Tuple[Set[str], Set[str]]]:
+        """
+        Merge the deltas between `generation` and `current_generation`
+
+        Returns:
+            tuple: (upserted addresses, removed addresses), or None if the
+                history does not reach back to `generation` (client must
+                reload the full list)
+        """
+        upserted = set()
+        removed = set()
+        if generation == current_generation:
+            return upserted, removed
+
+        deltas = [delta for delta in list(self._deltas) if delta.generation <= current_generation]
+        if (generation > current_generation or not deltas
+                or deltas[0].previous_generation > generation
+                or deltas[-1].generation != current_generation):
+            return None
+
+        for delta in deltas:
+            if delta.generation <= generation:
+                continue
+            for address in delta.removed:
+                upserted.discard(address)
+                removed.add(address)
+            for addresses in (delta.added, delta.changed):
+                for address in addresses:
+                    removed.discard(address)
+                    upserted.add(address)
+
+        return upserted, removed
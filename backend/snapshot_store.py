@@ -0,0 +1,151 @@
+"""
+Pool Snapshot Store
+Persists PoolSnapshot arrays to a compact binary file on local disk, so a
+fresh process can serve the last known pools before its first upstream fetch
+
+File layout (little-endian):
+    8 bytes   magic b'MTPSNAP1'
+    8 bytes   header length (uint64)
+    N bytes   JSON header (metadata + section table)
+    padding   to an 8-byte boundary
+    ...       raw array sections, each 8-byte aligned
+
+Numeric sections are read straight out of an mmap with np.frombuffer (no
+copy); string columns are stored as one NUL-separated UTF-8 blob each.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+from typing import Optional
+
+import numpy as np
+
+from pool_snapshot import PoolSnapshot
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'MTPSNAP1'
+FORMAT_VERSION = 1
+ALIGNMENT = 8
+STRING_SEPARATOR = '\x00'
+
+
+def _aligned(offset: int) -> int:
+    """Round offset up to the section alignment"""
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_snapshot(path: str, snapshot: PoolSnapshot, metadata: Optional[dict] = None) -> int:
+    """
+    Atomically write a snapshot to disk
+
+    The file is written to a temporary name in the same directory, fsynced
+    and then renamed over `path`, so readers never see a partial file.
+
+    Args:
+        path: Destination file
+        snapshot: Snapshot to persist
+        metadata: JSON-serializable extras stored in the header
+            (e.g. fetch time)
+
+    Returns:
+        int: Bytes written
+    """
+    arrays, strings = snapshot.export_arrays()
+
+    payloads = []
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        payloads.append(({'name': name, 'kind': 'array', 'dtype': array.dtype.str}, array.tobytes()))
+    for name, values in strings.items():
+        blob = STRING_SEPARATOR.join(value.replace(STRING_SEPARATOR, '') for value in values)
+        payloads.append(({'name': name, 'kind': 'strings', 'count': len(values)}, blob.encode('utf-8')))
+
+    sections = []
+    offset = 0
+    for section, data in payloads:
+        offset = _aligned(offset)
+        sections.append({**section, 'offset': offset, 'nbytes': len(data)})
+        offset += len(data)
+
+    header = json.dumps({
+        'version': FORMAT_VERSION,
+        'size': snapshot.size,
+        'metadata': metadata or {},
+        'sections': sections
+    }).encode('utf-8')
+    data_start = _aligned(len(MAGIC) + 8 + len(header))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.pool_snapshot.', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<Q', len(header)))
+            f.write(header)
+            for section, (_, data) in zip(sections, payloads):
+                f.seek(data_start + section['offset'])
+                f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    return data_start + offset
+
+
+def read_snapshot(path: str):
+    """
+    Load a snapshot written by write_snapshot()
+
+    Args:
+        path: Snapshot file
+
+    Returns:
+        tuple: (PoolSnapshot, metadata dict)
+
+    Raises:
+        OSError: File missing/unreadable
+        ValueError: Not a snapshot file or unsupported version
+    """
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if buffer[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a pool snapshot file")
+
+    (header_length,) = struct.unpack_from('<Q', buffer, len(MAGIC))
+    header_start = len(MAGIC) + 8
+    header = json.loads(bytes(buffer[header_start:header_start + header_length]))
+    if header.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported pool snapshot version {header.get('version')}")
+
+    data_start = _aligned(header_start + header_length)
+    arrays = {}
+    strings = {}
+    for section in header['sections']:
+        start = data_start + section['offset']
+        if section['kind'] == 'array':
+            dtype = np.dtype(section['dtype'])
+            if not section['nbytes']:
+                arrays[section['name']] = np.empty(0, dtype=dtype)
+                continue
+            arrays[section['name']] = np.frombuffer(
+                buffer,
+                dtype=dtype,
+                count=section['nbytes'] // dtype.itemsize,
+                offset=start
+            )
+        else:
+            blob = bytes(buffer[start:start + section['nbytes']]).decode('utf-8')
+            strings[section['name']] = blob.split(STRING_SEPARATOR) if section['count'] else []
+
+    return PoolSnapshot.from_arrays(arrays, strings), header['metadata']